@@ -0,0 +1,411 @@
+import os
+import sys
+import time
+import random
+import argparse
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta, timezone
+from email.message import EmailMessage
+from email.utils import format_datetime
+
+from core.call_log import normalize_phone, phone_key
+from core.database import Database
+from core.georgia_counties import GEORGIA_COUNTIES
+
+
+@dataclass(frozen=True)
+class FirmProfile:
+    people: int
+    matters: int
+    billing_entries: int
+    payments: int
+    years: int = 6
+    call_log_files: int = 12
+    calls_per_file: int = 2_000
+    emails: int = 2_000
+    stored_calls: int = 0
+
+
+PROFILES = {
+    "small": FirmProfile(people=1_000, matters=200, billing_entries=20_000, payments=2_000,
+                         call_log_files=2, calls_per_file=500, emails=200),
+    "medium": FirmProfile(people=10_000, matters=2_000, billing_entries=200_000, payments=20_000),
+    "large": FirmProfile(people=50_000, matters=10_000, billing_entries=2_000_000, payments=200_000),
+}
+
+FIRST_NAMES = [
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "William", "Elizabeth",
+    "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen",
+    "Christopher", "Lisa", "Daniel", "Nancy", "Matthew", "Betty", "Anthony", "Margaret", "Mark", "Sandra",
+    "Donald", "Ashley", "Steven", "Kimberly", "Paul", "Emily", "Andrew", "Donna", "Joshua", "Michelle",
+    "Kenneth", "Carol", "Kevin", "Amanda", "Brian", "Dorothy", "George", "Melissa", "Timothy", "Deborah",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+    "Lee", "Perez", "Thompson", "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson",
+    "Walker", "Young", "Allen", "King", "Wright", "Scott", "Torres", "Nguyen", "Hill", "Flores",
+    "Green", "Adams", "Nelson", "Baker", "Hall", "Rivera", "Campbell", "Mitchell", "Carter", "Roberts",
+]
+FIRM_WORDS = ["Peachtree", "Piedmont", "Oconee", "Savannah", "Chattahoochee", "Altamaha", "Ogeechee", "Etowah"]
+STREETS = ["Main St", "Peachtree St", "Oak Ave", "Pine Rd", "Magnolia Dr", "Church St", "Broad St", "Mill Rd"]
+AREA_CODES = ["404", "470", "678", "770", "706", "762", "912", "229", "478"]
+
+METRO_COUNTIES = ["Fulton", "Gwinnett", "Cobb", "DeKalb", "Clayton", "Chatham", "Cherokee", "Forsyth",
+                  "Henry", "Richmond", "Bibb", "Muscogee", "Hall", "Paulding", "Houston", "Columbia"]
+COURT_TYPES = {"Superior Court": 45, "State Court": 25, "Magistrate Court": 20, "Juvenile Court": 10}
+PAYMENT_METHODS = {"Check": 45, "ACH": 25, "Credit Card": 20, "Wire": 7, "Cash": 3}
+FEE_TASKS = [
+    "Telephone conference with client", "Draft correspondence to opposing counsel", "Review discovery responses",
+    "Prepare for hearing", "Attend hearing", "Legal research", "Draft motion", "Review and revise agreement",
+    "Conference with client re: strategy", "Review court order", "Prepare deposition outline", "Attend mediation",
+]
+EXPENSE_TASKS = ["Filing fee", "Service of process", "Court reporter", "Copies", "Postage", "Mileage",
+                 "Records request", "Mediator fee"]
+
+ENTRY_BATCH_SIZE = 50_000
+EASTERN = timezone(timedelta(hours=-5))
+
+
+def county_weights() -> tuple:
+    counties = list(GEORGIA_COUNTIES)
+    weights = [30.0 / (METRO_COUNTIES.index(c) + 1) if c in METRO_COUNTIES else 0.15 for c in counties]
+    return counties, weights
+
+
+def make_phone(rng: random.Random) -> str:
+    area, exchange, line = rng.choice(AREA_CODES), rng.randint(200, 999), rng.randint(0, 9999)
+    style = rng.random()
+    if style < 0.6:
+        return f"({area}) {exchange}-{line:04d}"
+    if style < 0.9:
+        return f"{area}-{exchange}-{line:04d}"
+    return f"+1 {area} {exchange} {line:04d}"
+
+
+class DatasetGenerator:
+    def __init__(self, profile: FirmProfile, seed: int = 0, end_date: date = None):
+        self.profile = profile
+        self.seed = seed
+        self.end_date = end_date or date(2026, 6, 30)
+        self.start_date = date(self.end_date.year - profile.years, 1, 1)
+        self.rng = random.Random(seed)
+        self.people = []
+        self.clients = []
+        self.counsel = []
+        self.staff = []
+        self.judges = {}
+        self.matters = []
+        self.case_people = []
+
+    def random_date(self, start: date, end: date) -> date:
+        span = (end - start).days
+        return start + timedelta(days=self.rng.randint(0, max(span, 0)))
+
+    def build_people(self):
+        rng = self.rng
+        counties, weights = county_weights()
+        counsel_count = max(1, self.profile.people // 20)
+        staff_count = max(1, self.profile.people // 40)
+        judge_count = max(1, self.profile.people // 200)
+        for person_id in range(1, self.profile.people + 1):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            if person_id <= counsel_count:
+                kind, firm, title = "counsel", f"{rng.choice(FIRM_WORDS)} {rng.choice(LAST_NAMES)} LLP", "Attorney"
+            elif person_id <= counsel_count + staff_count:
+                kind, firm, title = "staff", f"{rng.choice(FIRM_WORDS)} {rng.choice(LAST_NAMES)} LLP", "Paralegal"
+            elif person_id <= counsel_count + staff_count + judge_count:
+                kind, firm, title = "judge", None, "Judge"
+            else:
+                kind, firm, title = "party", None, None
+            email_domain = (firm.split()[0].lower() + "law.com") if firm else rng.choice(["gmail.com", "yahoo.com", "outlook.com"])
+            created = self.random_date(self.start_date, self.end_date)
+            self.people.append((
+                person_id, first, last, rng.choice(FIRST_NAMES) if rng.random() < 0.3 else None,
+                make_phone(rng) if rng.random() < 0.9 else None,
+                f"{first.lower()}.{last.lower()}{person_id}@{email_domain}" if rng.random() < 0.8 else None,
+                f"{rng.randint(1, 9999)} {rng.choice(STREETS)}" if kind == "party" else None,
+                30000, firm, title, f"{created.isoformat()} 09:00:00"
+            ))
+            if kind == "counsel":
+                self.counsel.append(person_id)
+            elif kind == "staff":
+                self.staff.append(person_id)
+            elif kind == "judge":
+                county = rng.choices(counties, weights)[0]
+                self.judges.setdefault(county, []).append(person_id)
+            else:
+                self.clients.append(person_id)
+
+    def build_matters(self):
+        rng = self.rng
+        counties, weights = county_weights()
+        court_types, court_weights = list(COURT_TYPES), list(COURT_TYPES.values())
+        parties = self.clients
+        client_pool = parties[:max(1, int(len(parties) * 0.6))]
+        opposing_pool = parties[len(client_pool):] or parties
+        matter_numbers = {}
+        case_person_id = 0
+
+        seen = set()
+
+        def add(case_id, person_id, role, designation=None, represents=None):
+            nonlocal case_person_id
+            if (case_id, person_id, role) in seen:
+                return
+            seen.add((case_id, person_id, role))
+            case_person_id += 1
+            self.case_people.append((case_person_id, case_id, person_id, role, designation, represents, 0,
+                                     self.matters[case_id - 1][8]))
+
+        for case_id in range(1, self.profile.matters + 1):
+            client_id = rng.choice(client_pool)
+            client_last = self.people[client_id - 1][2]
+            matter_numbers[client_last] = matter_numbers.get(client_last, 0) + 1
+            opened = self.random_date(self.start_date, self.end_date - timedelta(days=30))
+            is_closed = opened < self.end_date - timedelta(days=540) and rng.random() < 0.7
+            closed = self.random_date(opened + timedelta(days=60), self.end_date) if is_closed else self.end_date
+            is_litigation = rng.random() < 0.6
+            court_type = county = case_number = None
+            if is_litigation:
+                court_type = rng.choices(court_types, court_weights)[0]
+                county = rng.choices(counties, weights)[0]
+                case_number = f"{opened.year % 100:02d}{'CV' if court_type != 'Juvenile Court' else 'JV'}{rng.randint(1, 99999):05d}"
+            self.matters.append((
+                case_id, case_number, f"{client_last}-{matter_numbers[client_last]:03d}", int(is_litigation),
+                court_type, county, "Closed" if is_closed else "Open", rng.choice([25000, 30000, 35000, 40000]),
+                f"{opened.isoformat()} 10:00:00", opened, closed, rng.lognormvariate(0, 1)
+            ))
+
+            if not is_litigation:
+                add(case_id, client_id, "client")
+                if rng.random() < 0.1:
+                    add(case_id, rng.choice(self.counsel), "co_counsel")
+                continue
+            designation = rng.choice(["plaintiff", "defendant"])
+            opposite = "defendant" if designation == "plaintiff" else "plaintiff"
+            add(case_id, client_id, "client", designation)
+            for opposing_id in {rng.choice(opposing_pool) for _ in range(rng.choice([1, 1, 1, 2]))} - {client_id}:
+                add(case_id, opposing_id, "opposing_party", opposite)
+                if rng.random() < 0.85:
+                    counsel_id = rng.choice(self.counsel)
+                    add(case_id, counsel_id, "opposing_counsel", represents=opposing_id)
+                    if rng.random() < 0.3:
+                        add(case_id, rng.choice(self.staff), "opposing_staff", represents=opposing_id)
+            judges = self.judges.get(county) or [judge for pool in self.judges.values() for judge in pool]
+            if judges and rng.random() < 0.8:
+                add(case_id, rng.choice(judges), "judge")
+            if court_type == "Juvenile Court" and rng.random() < 0.6:
+                add(case_id, rng.choice(self.counsel), "guardian_ad_litem")
+
+    def iter_billing_entries(self):
+        rng = self.rng
+        matters = self.matters
+        cum_weights = []
+        total = 0.0
+        for matter in matters:
+            total += matter[11]
+            cum_weights.append(total)
+        entry_id = 0
+        remaining = self.profile.billing_entries
+        while remaining:
+            batch = min(remaining, ENTRY_BATCH_SIZE)
+            remaining -= batch
+            for matter in rng.choices(matters, cum_weights=cum_weights, k=batch):
+                entry_id += 1
+                span = (matter[10] - matter[9]).days
+                entry_date = matter[9] + timedelta(days=int(span * rng.random()))
+                if rng.random() < 0.15:
+                    yield (entry_id, matter[0], entry_date.isoformat(), None, 1,
+                           rng.randint(500, 50000), rng.choice(EXPENSE_TASKS), f"{entry_date.isoformat()} 17:00:00")
+                else:
+                    yield (entry_id, matter[0], entry_date.isoformat(), round(rng.randint(1, 40) / 10, 1), 0,
+                           None, rng.choice(FEE_TASKS), f"{entry_date.isoformat()} 17:00:00")
+
+    def iter_payments(self):
+        rng = self.rng
+        clients = {}
+        for _, case_id, person_id, role, *_ in self.case_people:
+            if role == "client":
+                clients[case_id] = person_id
+        methods, method_weights = list(PAYMENT_METHODS), list(PAYMENT_METHODS.values())
+        for payment_id in range(1, self.profile.payments + 1):
+            matter = rng.choice(self.matters)
+            span = (matter[10] - matter[9]).days
+            fee = rng.choice([0, rng.randint(50, 2000) * 500])
+            expense = rng.randint(0, 40) * 2500 if rng.random() < 0.4 or not fee else 0
+            method = rng.choices(methods, method_weights)[0]
+            paid = (matter[9] + timedelta(days=int(span * rng.random()))).isoformat()
+            yield (payment_id, clients[matter[0]], matter[0], paid, fee, expense, method,
+                   f"{method[:2].upper()}{rng.randint(1000, 999999)}" if method != "Cash" else None, None,
+                   f"{paid} 12:00:00")
+
+    def write_database(self, db_path: str):
+        db = Database(db_path)
+        connection = db.connection
+        try:
+            connection.execute("PRAGMA foreign_keys = OFF")
+            connection.execute("PRAGMA synchronous = OFF")
+            dropped = connection.execute("""
+                SELECT type, name FROM sqlite_master
+                WHERE type IN ('index', 'trigger') AND sql IS NOT NULL
+            """).fetchall()
+            for kind, name in dropped:
+                connection.execute(f"DROP {kind.upper()} {name}")
+
+            connection.executemany("""
+                INSERT INTO people (id, first_name, last_name, middle_name, phone, email, address,
+                                    billing_rate_cents, firm_name, job_title, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, self.people)
+            connection.executemany("""
+                INSERT INTO cases (id, case_number, case_name, is_litigation, court_type, county, status,
+                                   billing_rate_cents, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (matter[:9] for matter in self.matters))
+            connection.executemany("""
+                INSERT INTO case_people (id, case_id, person_id, role, party_designation,
+                                         represents_person_id, is_pro_se, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, self.case_people)
+            connection.executemany("""
+                INSERT INTO billing_entries (id, case_id, entry_date, hours, is_expense, amount_cents, description,
+                                             created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, self.iter_billing_entries())
+            connection.executemany("""
+                INSERT INTO payments (id, person_id, case_id, payment_date, amount_cents, expense_amount_cents,
+                                      payment_method, reference_number, notes, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, self.iter_payments())
+            connection.executemany("""
+                INSERT INTO call_log (call_datetime, phone_number, phone_digits, phone_key, duration_minutes,
+                                      imported_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, self.iter_stored_calls())
+            connection.execute("UPDATE db_meta SET value = value + 1 WHERE key IN ('data_version', 'contacts_version')")
+            connection.commit()
+            db.create_tables()
+            connection.execute("ANALYZE")
+        finally:
+            db.close()
+
+    def iter_calls(self, count: int):
+        rng = self.rng
+        phones = [person[4] for person in self.people if person[4]]
+        for _ in range(count):
+            called = datetime.combine(self.random_date(self.start_date, self.end_date), datetime.min.time())
+            called += timedelta(minutes=rng.randint(8 * 60, 18 * 60))
+            number = rng.choice(phones) if rng.random() < 0.8 else make_phone(rng)
+            yield called, number, rng.choice(['Incoming', 'Outgoing']), rng.randint(1, 45)
+
+    def iter_stored_calls(self):
+        seen = set()
+        for called, number, _, minutes in self.iter_calls(self.profile.stored_calls):
+            call_datetime, digits = called.strftime("%Y-%m-%d %H:%M:%S"), normalize_phone(number)
+            if (call_datetime, digits, minutes) not in seen:
+                seen.add((call_datetime, digits, minutes))
+                yield call_datetime, number, digits, phone_key(digits), minutes, f"{self.end_date} 12:00:00"
+
+    def write_call_logs(self, output_dir: str) -> list:
+        os.makedirs(output_dir, exist_ok=True)
+        paths = []
+        for file_index in range(self.profile.call_log_files):
+            path = os.path.join(output_dir, f"call_log_{file_index + 1:03d}.csv")
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                f.write("Call Detail Report\nAccount,Law Office\n\n")
+                f.write("Date (Pacific),Number,Type,Duration\n")
+                for called, number, direction, minutes in self.iter_calls(self.profile.calls_per_file):
+                    f.write(f"{called.strftime('%m/%d/%Y %I:%M %p')},\"{number}\",{direction},{minutes} Min\n")
+            paths.append(path)
+        return paths
+
+    def write_emails(self, output_dir: str) -> list:
+        rng = self.rng
+        os.makedirs(output_dir, exist_ok=True)
+        addresses = [person[5] for person in self.people if person[5]]
+        paths = []
+        for index in range(self.profile.emails):
+            matter = rng.choice(self.matters)
+            sent = datetime.combine(self.random_date(matter[9], matter[10]), datetime.min.time())
+            sent += timedelta(minutes=rng.randint(7 * 60, 20 * 60))
+            message = EmailMessage()
+            message["From"] = rng.choice(addresses + ["attorney@lawoffice.com"])
+            message["To"] = ", ".join(rng.sample(addresses, k=min(len(addresses), rng.randint(1, 3))))
+            if rng.random() < 0.3:
+                message["Cc"] = rng.choice(addresses)
+            message["Subject"] = f"RE: {matter[2]} - {rng.choice(FEE_TASKS)}"
+            message["Date"] = format_datetime(sent.replace(tzinfo=EASTERN))
+            message.set_content(f"Regarding {matter[2]}.\n\nPlease see below.\n")
+            if rng.random() < 0.2:
+                message.add_attachment(b"%PDF-1.4\n%%EOF\n", maintype="application", subtype="pdf",
+                                       filename=f"{matter[2]}_{index + 1}.pdf")
+            path = os.path.join(output_dir, f"message_{index + 1:06d}.eml")
+            with open(path, "wb") as f:
+                f.write(bytes(message))
+            paths.append(path)
+        return paths
+
+    def generate(self, db_path: str, calls_dir: str = None, emails_dir: str = None) -> dict:
+        timings = {}
+        started = time.perf_counter()
+        self.build_people()
+        self.build_matters()
+        timings["graph"] = time.perf_counter() - started
+        started = time.perf_counter()
+        self.write_database(db_path)
+        timings["database"] = time.perf_counter() - started
+        if calls_dir:
+            started = time.perf_counter()
+            self.write_call_logs(calls_dir)
+            timings["call_logs"] = time.perf_counter() - started
+        if emails_dir:
+            started = time.perf_counter()
+            self.write_emails(emails_dir)
+            timings["emails"] = time.perf_counter() - started
+        return timings
+
+
+def generate_dataset(db_path: str, profile: FirmProfile, seed: int = 0,
+                     calls_dir: str = None, emails_dir: str = None) -> dict:
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    return DatasetGenerator(profile, seed).generate(db_path, calls_dir, emails_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic firm database.")
+    parser.add_argument("output", help="database file to create")
+    parser.add_argument("--profile", choices=list(PROFILES), default="medium")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--people", type=int, help="override the profile's people count")
+    parser.add_argument("--matters", type=int)
+    parser.add_argument("--billing-entries", type=int)
+    parser.add_argument("--payments", type=int)
+    parser.add_argument("--years", type=int)
+    parser.add_argument("--stored-calls", type=int, help="calls already imported into the call_log table")
+    parser.add_argument("--calls-dir", help="also write call-log CSV exports to this folder")
+    parser.add_argument("--emails-dir", help="also write an EML corpus to this folder")
+    parser.add_argument("--force", action="store_true", help="overwrite an existing database")
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.output) and not args.force:
+        print(f"{args.output} already exists; use --force to overwrite", file=sys.stderr)
+        return 1
+
+    overrides = {name: getattr(args, name) for name in ("people", "matters", "billing_entries", "payments", "years",
+                                                       "stored_calls")
+                 if getattr(args, name) is not None}
+    profile = replace(PROFILES[args.profile], **overrides)
+    print(f"Generating {profile.people} people, {profile.matters} matters, "
+          f"{profile.billing_entries} billing entries, {profile.payments} payments (seed {args.seed})")
+    timings = generate_dataset(args.output, profile, args.seed, args.calls_dir, args.emails_dir)
+    for step, seconds in timings.items():
+        print(f"{step:<10} {seconds:8.2f} s")
+    print(f"total      {sum(timings.values()):8.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
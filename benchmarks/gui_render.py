@@ -0,0 +1,282 @@
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import platform
+import statistics
+import tempfile
+from dataclasses import replace
+from datetime import datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication
+
+from benchmarks.dataset import DatasetGenerator
+from benchmarks.query_suite import (
+    SCALES, DEFAULT_DATA_DIR, DEFAULT_THRESHOLD, DEFAULT_NOISE_FLOOR_MS,
+    Fixture, compare, dataset_path, git_commit, profile_for_scale, report
+)
+from core.backup import backup_database
+from core.call_log import import_call_logs
+from core.database import Database
+from core.queries import QuerySet
+from gui.query_runner import QueryRunner
+from gui.widgets.call_log_widget import CallLogWidget
+from gui.widgets.case_widget import CaseWidget
+from gui.widgets.matter_billing_widget import MatterBillingWidget
+from gui.widgets.people_widget import PeopleWidget
+from gui.widgets.reports_widget import ReportsWidget
+
+
+WINDOW_SIZE = (1280, 800)
+CALL_LOG_FILES = 4
+DEFAULT_CALL_LOG_ROWS = 500
+
+
+def settle(app: QApplication, widget):
+    app.processEvents()
+    widget.repaint()
+
+
+def show(app: QApplication, widget):
+    widget.resize(*WINDOW_SIZE)
+    widget.show()
+    settle(app, widget)
+    return widget
+
+
+def cycle(values: list):
+    state = {"index": -1}
+
+    def next_value():
+        state["index"] = (state["index"] + 1) % len(values)
+        return values[state["index"]]
+    return next_value
+
+
+def select_rows(table, count: int):
+    rows = cycle(list(range(min(count, table.model().rowCount()))) or [0])
+    return lambda: table.selectRow(rows())
+
+
+def sort_columns(table, columns: list):
+    orders = cycle([(column, order) for column in columns for order in (Qt.AscendingOrder, Qt.DescendingOrder)])
+    return lambda: table.sortByColumn(*orders())
+
+
+def reset_combo(combo, index: int = 0):
+    def setup():
+        combo.blockSignals(True)
+        combo.setCurrentIndex(index)
+        combo.blockSignals(False)
+    return setup
+
+
+def case_actions(app, queries: QuerySet, runner: QueryRunner, fx: Fixture) -> tuple:
+    widget = show(app, CaseWidget(queries.cases, queries.people, queries.case_people, queries.recent_counties,
+                                  query_runner=runner))
+    widget.show_closed_checkbox.setChecked(True)
+    settle(app, widget)
+    toggle = widget.show_closed_checkbox
+    return widget, [
+        ("cases.refresh", None, widget.refresh),
+        ("cases.filter_closed", None, lambda: toggle.setChecked(not toggle.isChecked())),
+        ("cases.sort", None, sort_columns(widget.table, [1, 2, 3])),
+        ("cases.select", None, select_rows(widget.table, 25)),
+    ]
+
+
+def people_actions(app, queries: QuerySet, runner: QueryRunner, fx: Fixture) -> tuple:
+    widget = show(app, PeopleWidget(queries.people, queries.cases, queries.case_people, query_runner=runner))
+    return widget, [
+        ("people.refresh", None, widget.refresh),
+        ("people.sort", None, sort_columns(widget.table, [1, 2])),
+        ("people.select", None, select_rows(widget.table, 25)),
+    ]
+
+
+def billing_actions(app, queries: QuerySet, runner: QueryRunner, fx: Fixture) -> tuple:
+    widget = show(app, MatterBillingWidget(queries.billing, queries.payments, queries.cases, queries.people,
+                                           queries.case_people, get_show_closed_callback=lambda: True,
+                                           query_runner=runner))
+    combo = widget.matter_combo
+    busy_index = next(i for i in range(combo.count())
+                      if combo.itemData(i) and combo.itemData(i)["id"] == fx.busy_case_id)
+    combo.setCurrentIndex(busy_index)
+    settle(app, widget)
+    return widget, [
+        ("billing.refresh", None, widget.refresh),
+        ("billing.select_matter", reset_combo(combo), lambda: combo.setCurrentIndex(busy_index)),
+        ("billing.sort", None, sort_columns(widget.billing_table, [1, 4])),
+        ("billing.select_entry", None, select_rows(widget.billing_table, 25)),
+    ]
+
+
+def reports_actions(app, queries: QuerySet, runner: QueryRunner, fx: Fixture) -> tuple:
+    widget = show(app, ReportsWidget(queries.reports, query_runner=runner))
+
+    def choose(report_type: str):
+        def setup():
+            widget.report_type_combo.setCurrentIndex(widget.report_type_combo.findData(report_type))
+            if widget.year_combo.findData(fx.year) < 0:
+                widget.year_combo.addItem(str(fx.year), fx.year)
+            widget.year_combo.setCurrentIndex(widget.year_combo.findData(fx.year))
+            widget.month_combo.setCurrentIndex(fx.month - 1)
+        return setup
+
+    choose("all_time")()
+    widget.generate_report()
+    settle(app, widget)
+    return widget, [
+        ("reports.monthly", choose("monthly"), widget.generate_report),
+        ("reports.all_time", choose("all_time"), widget.generate_report),
+        ("reports.sort", None, sort_columns(widget.table, [1, 10])),
+    ]
+
+
+def call_log_actions(app, queries: QuerySet, runner: QueryRunner, fx: Fixture, calls_dir: str) -> tuple:
+    paths = [os.path.join(calls_dir, name) for name in sorted(os.listdir(calls_dir))]
+    records, _, _ = import_call_logs(paths, set())
+    queries.call_logs.import_records(records)
+    widget = show(app, CallLogWidget(queries.people, queries.cases, queries.billing, queries.call_logs,
+                                     query_runner=runner))
+    settle(app, widget)
+
+    def clear_phone():
+        widget.phone_filter.blockSignals(True)
+        widget.phone_filter.clear()
+        widget.phone_filter.blockSignals(False)
+
+    return widget, [
+        ("call_log.refresh", None, widget.refresh_table),
+        ("call_log.filter_phone", clear_phone, lambda: widget.phone_filter.setText("404")),
+        ("call_log.sort", reset_combo(widget.sort_combo), lambda: widget.sort_combo.setCurrentIndex(3)),
+        ("call_log.select", None, select_rows(widget.table, 25)),
+    ]
+
+
+WIDGETS = {
+    "cases": case_actions,
+    "people": people_actions,
+    "billing": billing_actions,
+    "reports": reports_actions,
+    "call_log": call_log_actions,
+}
+
+
+def time_action(app, widget, setup, action, min_time: float, min_repeats: int, max_repeats: int) -> dict:
+    timings = []
+    while len(timings) < max_repeats and (len(timings) < min_repeats or sum(timings) < min_time):
+        if setup:
+            setup()
+            settle(app, widget)
+        start = time.perf_counter()
+        action()
+        settle(app, widget)
+        timings.append(time.perf_counter() - start)
+    return {
+        "median_ms": round(statistics.median(timings) * 1000.0, 4),
+        "min_ms": round(min(timings) * 1000.0, 4),
+        "max_ms": round(max(timings) * 1000.0, 4),
+        "repeats": len(timings),
+    }
+
+
+def write_call_logs(scale: str, seed: int, output_dir: str, call_rows: int):
+    profile = replace(profile_for_scale(SCALES[scale]), call_log_files=CALL_LOG_FILES,
+                      calls_per_file=max(1, min(SCALES[scale], call_rows) // CALL_LOG_FILES))
+    generator = DatasetGenerator(profile, seed)
+    generator.build_people()
+    generator.write_call_logs(output_dir)
+
+
+def run_scale(app, scale: str, data_dir: str, seed: int, widgets: list, call_rows: int,
+              min_time: float, min_repeats: int, max_repeats: int) -> dict:
+    source = dataset_path(data_dir, scale, seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench.db")
+        backup_database(source, db_path)
+        calls_dir = os.path.join(tmp_dir, "calls")
+        if "call_log" in widgets:
+            write_call_logs(scale, seed, calls_dir, call_rows)
+        db = Database(db_path)
+        try:
+            queries = QuerySet(db)
+            runner = QueryRunner(queries=queries)
+            fx = Fixture(db)
+            for name in widgets:
+                extra = (calls_dir,) if name == "call_log" else ()
+                started = time.perf_counter()
+                widget, actions = WIDGETS[name](app, queries, runner, fx, *extra)
+                results[f"{name}.open"] = {"median_ms": round((time.perf_counter() - started) * 1000.0, 4),
+                                           "repeats": 1}
+                print(f"  {scale:<6}{name + '.open':<32}{results[name + '.open']['median_ms']:>12.3f} ms")
+                for action_name, setup, action in actions:
+                    results[action_name] = time_action(app, widget, setup, action,
+                                                       min_time, min_repeats, max_repeats)
+                    print(f"  {scale:<6}{action_name:<32}{results[action_name]['median_ms']:>12.3f} ms")
+                widget.close()
+                widget.deleteLater()
+                app.processEvents()
+        finally:
+            db.close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time widget refresh, filter, sort and selection offscreen.")
+    parser.add_argument("--scale", action="append", choices=list(SCALES),
+                        help="billing-entry scale to run; repeat for several (defaults to 1k and 100k)")
+    parser.add_argument("--widget", action="append", choices=list(WIDGETS),
+                        help="widget to benchmark; repeat for several (defaults to all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="folder caching the generated datasets")
+    parser.add_argument("--call-rows", type=int, default=DEFAULT_CALL_LOG_ROWS,
+                        help="call records loaded into the call log widget")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds spent timing each action")
+    parser.add_argument("--min-repeats", type=int, default=3)
+    parser.add_argument("--max-repeats", type=int, default=50)
+    parser.add_argument("--json", help="write results to a JSON file")
+    parser.add_argument("--baseline", help="JSON results from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="fail when an action's median slows down by more than this fraction")
+    parser.add_argument("--noise-floor-ms", type=float, default=DEFAULT_NOISE_FLOOR_MS,
+                        help="ignore slowdowns smaller than this many milliseconds")
+    args = parser.parse_args(argv)
+
+    widgets = args.widget or list(WIDGETS)
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    results = {}
+    for scale in args.scale or ["1k", "100k"]:
+        results[scale] = run_scale(app, scale, args.data_dir, args.seed, widgets, args.call_rows,
+                                   args.min_time, args.min_repeats, args.max_repeats)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "commit": git_commit(),
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "seed": args.seed,
+                "python": platform.python_version(),
+                "sqlite": sqlite3.sqlite_version,
+                "qpa_platform": app.platformName(),
+                "results": results,
+            }, f, indent=2)
+        print(f"Results written to: {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold, args.noise_floor_ms)
+        report(regressions, args.threshold)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
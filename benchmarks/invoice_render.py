@@ -0,0 +1,114 @@
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+import tempfile
+from datetime import date
+
+from core import invoices
+from core.invoices import (
+    HAS_DOCX, WD_ALIGN_PARAGRAPH, WD_CELL_VERTICAL_ALIGNMENT, build_invoice_job, render_invoice,
+    get_invoice_template, clear_invoice_template_cache, remove_paragraph_spacing_in_table, set_column_widths
+)
+
+
+def make_entries(count: int, year: int, month: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    entries = []
+    for i in range(count):
+        is_expense = rng.random() < 0.2
+        entries.append({
+            'id': i + 1,
+            'entry_date': date(year, month, rng.randint(1, 28)),
+            'description': f"Entry {i + 1}: review & draft correspondence <matter> re: filing\nfollow-up call",
+            'hours': None if is_expense else round(rng.uniform(0.1, 4.0), 1),
+            'amount_cents': rng.randint(500, 50000) if is_expense else None,
+            'is_expense': is_expense,
+        })
+    entries.sort(key=lambda e: (e['entry_date'], e['id']))
+    return entries
+
+
+def make_job(lines: int, output_path: str, image_path: str = None, seed: int = 0) -> dict:
+    year, month = 2026, 1
+    matter = {
+        'id': 1, 'case_name': 'Benchmark v. Example', 'case_number': 'CV-0001',
+        'first_name': 'Pat', 'last_name': 'Client', 'address': '1 Main St\nSpringfield',
+        'billing_rate_cents': 30000,
+    }
+    trust_data = {
+        'fee_balance': 2500.0, 'expense_balance': 400.0,
+        'total_fee_payments': 12500.0, 'total_expense_payments': 1400.0,
+        'total_fees_billed': 10000.0, 'total_expenses_billed': 1000.0,
+    }
+    return build_invoice_job(
+        matter, make_entries(lines, year, month, seed), trust_data, year, month,
+        5000.0, 1000.0, "none", image_path=image_path, output_path=output_path
+    )
+
+
+def append_rows_per_cell(table, rows: list, widths: list, centered: list):
+    # The python-docx path invoices used before rows were built as one XML fragment.
+    for values in rows:
+        row = table.add_row()
+        cells = row.cells
+        for col, text in enumerate(values):
+            cells[col].text = text
+            if centered[col]:
+                cells[col].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+                cells[col].vertical_alignment = WD_CELL_VERTICAL_ALIGNMENT.CENTER
+        set_column_widths(table, widths, [row])
+        remove_paragraph_spacing_in_table(table, [row])
+
+
+def run_per_cell(lines: int, iterations: int, image_path: str = None) -> list:
+    append_table_rows = invoices.append_table_rows
+    invoices.append_table_rows = append_rows_per_cell
+    try:
+        return run(lines, iterations, image_path)
+    finally:
+        invoices.append_table_rows = append_table_rows
+
+
+def run(lines: int, iterations: int, image_path: str = None, cold: bool = False) -> list:
+    timings = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for i in range(iterations):
+            job = make_job(lines, os.path.join(tmp_dir, f"invoice_{i}.docx"), image_path, seed=i)
+            if cold:
+                clear_invoice_template_cache()
+            start = time.perf_counter()
+            render_invoice(job)
+            timings.append((time.perf_counter() - start) * 1000.0)
+    return timings
+
+
+def report(label: str, timings: list):
+    print(f"{label:<10} mean {statistics.mean(timings):8.1f} ms   "
+          f"median {statistics.median(timings):8.1f} ms   "
+          f"min {min(timings):8.1f} ms   max {max(timings):8.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure per-invoice DOCX render time.")
+    parser.add_argument("--lines", type=int, default=500, help="billing lines per invoice")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--image", default=None, help="header image path (defaults to none)")
+    args = parser.parse_args(argv)
+
+    if not HAS_DOCX:
+        print("python-docx is required: pip install python-docx")
+        return 1
+
+    print(f"Rendering {args.iterations} invoices with {args.lines} lines each")
+    get_invoice_template(args.image)
+    report("cached", run(args.lines, args.iterations, args.image))
+    report("cold", run(args.lines, args.iterations, args.image, cold=True))
+    report("per-cell", run_per_cell(args.lines, args.iterations, args.image))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
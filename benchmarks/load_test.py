@@ -0,0 +1,301 @@
+import os
+import sys
+import json
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+import threading
+import concurrent.futures
+from datetime import date
+
+from core.backup import backup_database
+from core.database import Database, DEFAULT_BUSY_TIMEOUT
+from core.models import BillingEntry
+from core.queries import QuerySet, PAGE_SIZE
+
+
+CONFIGURATIONS = ("direct", "writer", "api")
+
+OPERATION_MIX = {
+    "create_billing_entry": 30,
+    "matter_lookup": 35,
+    "balance_check": 30,
+    "monthly_report": 5,
+}
+
+
+def create_billing_entry(queries, rng: random.Random, case_ids: list, periods: list):
+    is_expense = rng.random() < 0.2
+    queries.billing.create(BillingEntry(
+        case_id=rng.choice(case_ids),
+        entry_date=date.today(),
+        hours=None if is_expense else round(rng.uniform(0.1, 3.0), 1),
+        is_expense=is_expense,
+        amount_cents=rng.randint(500, 25000) if is_expense else None,
+        description="Load test entry"
+    ))
+
+
+def matter_lookup(queries, rng: random.Random, case_ids: list, periods: list):
+    case_id = rng.choice(case_ids)
+    queries.case_people.get_case_summary(case_id)
+    queries.billing.get_page_by_case(case_id, None, PAGE_SIZE)
+
+
+def balance_check(queries, rng: random.Random, case_ids: list, periods: list):
+    case_id = rng.choice(case_ids)
+    queries.billing.get_case_totals(case_id)
+    queries.payments.get_case_payment_totals(case_id)
+
+
+def monthly_report(queries, rng: random.Random, case_ids: list, periods: list):
+    year, month = rng.choice(periods)
+    queries.reports.get_monthly_billing_summary(year, month)
+    queries.reports.get_period_totals(year, month)
+
+
+OPERATIONS = {
+    "create_billing_entry": create_billing_entry,
+    "matter_lookup": matter_lookup,
+    "balance_check": balance_check,
+    "monthly_report": monthly_report,
+}
+
+
+def load_fixture(db_path: str) -> tuple:
+    db = Database(db_path)
+    try:
+        case_ids = [row[0] for row in db.fetchall("SELECT id FROM cases")]
+        periods = [
+            (int(row[0]), int(row[1])) for row in db.fetchall("""
+                SELECT DISTINCT strftime('%Y', entry_date), strftime('%m', entry_date)
+                FROM billing_entries WHERE strftime('%Y', entry_date) IS NOT NULL
+            """)
+        ]
+    finally:
+        db.close()
+    if not case_ids:
+        raise SystemExit(f"No matters in {db_path}; generate a dataset first")
+    return case_ids, periods or [(date.today().year, date.today().month)]
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: list) -> dict:
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "p50_ms": round(percentile(values, 0.50) * 1000.0, 2),
+        "p95_ms": round(percentile(values, 0.95) * 1000.0, 2),
+        "p99_ms": round(percentile(values, 0.99) * 1000.0, 2),
+        "max_ms": round(values[-1] * 1000.0, 2) if values else 0.0,
+    }
+
+
+def is_lock_error(error: Exception) -> bool:
+    return isinstance(error, sqlite3.OperationalError) and "locked" in str(error).lower()
+
+
+def simulate_user(queries, seed: int, case_ids: list, periods: list, rate: float,
+                  duration: float, results: dict, lock: threading.Lock):
+    rng = random.Random(seed)
+    names = list(OPERATION_MIX)
+    weights = [OPERATION_MIX[name] for name in names]
+    latencies = {name: [] for name in names}
+    errors = {}
+    interval = 1.0 / rate if rate > 0 else 0.0
+    started = time.perf_counter()
+    scheduled = started
+
+    while True:
+        now = time.perf_counter()
+        if now - started >= duration:
+            break
+        if interval:
+            if scheduled > now:
+                time.sleep(scheduled - now)
+            start = scheduled
+            scheduled += interval
+        else:
+            start = now
+        name = rng.choices(names, weights)[0]
+        try:
+            OPERATIONS[name](queries, rng, case_ids, periods)
+        except Exception as e:
+            key = "lock_timeouts" if is_lock_error(e) else type(e).__name__
+            errors[key] = errors.get(key, 0) + 1
+            continue
+        latencies[name].append(time.perf_counter() - start)
+
+    with lock:
+        for name, values in latencies.items():
+            results["latencies"].setdefault(name, []).extend(values)
+        for key, count in errors.items():
+            results["errors"][key] = results["errors"].get(key, 0) + count
+
+
+def open_queries(config: str, db_path: str, busy_timeout: float):
+    if config == "api":
+        from core.api_server import ApiServer
+        from core.api_client import ApiClient, RemoteQuerySet
+        server = ApiServer(db_path, port=0)
+        url = server.start_background()
+        return RemoteQuerySet(ApiClient(url)), server
+    db = Database(db_path, busy_timeout=busy_timeout)
+    if config == "writer":
+        db.start_writer()
+    return QuerySet(db), None
+
+
+def run_process(config: str, db_path: str, users: int, rate: float, duration: float, seed: int,
+                busy_timeout: float = DEFAULT_BUSY_TIMEOUT, url: str = None) -> dict:
+    case_ids, periods = load_fixture(db_path)
+    if url:
+        from core.api_client import ApiClient, RemoteQuerySet
+        queries, server = RemoteQuerySet(ApiClient(url)), None
+    else:
+        queries, server = open_queries(config, db_path, busy_timeout)
+    results = {"latencies": {}, "errors": {}}
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(target=simulate_user, args=(
+            queries, seed * 1000 + i, case_ids, periods, rate, duration, results, lock
+        ))
+        for i in range(users)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if server is not None:
+        results["lock_stats"] = server.db.lock_stats.as_dict()
+        server.stop()
+    elif not url:
+        results["lock_stats"] = queries.db.lock_stats.as_dict()
+        queries.db.close()
+    return results
+
+
+def merge_results(parts: list) -> dict:
+    merged = {"latencies": {}, "errors": {}, "lock_stats": {}}
+    for part in parts:
+        for name, values in part["latencies"].items():
+            merged["latencies"].setdefault(name, []).extend(values)
+        for key, count in part["errors"].items():
+            merged["errors"][key] = merged["errors"].get(key, 0) + count
+        for key, value in part.get("lock_stats", {}).items():
+            if key == "max_wait_seconds":
+                merged["lock_stats"][key] = max(merged["lock_stats"].get(key, 0.0), value)
+            else:
+                merged["lock_stats"][key] = merged["lock_stats"].get(key, 0) + value
+    return merged
+
+
+def run_configuration(config: str, db_path: str, users: int, processes: int, rate: float,
+                      duration: float, seed: int, busy_timeout: float = DEFAULT_BUSY_TIMEOUT) -> dict:
+    started = time.perf_counter()
+    if processes <= 1:
+        results = merge_results([run_process(config, db_path, users, rate, duration, seed, busy_timeout)])
+    else:
+        server = url = None
+        parts = []
+        if config == "api":
+            from core.api_server import ApiServer
+            server = ApiServer(db_path, port=0)
+            url = server.start_background()
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+                futures = [
+                    executor.submit(run_process, config, db_path, users, rate, duration, seed + p,
+                                    busy_timeout, url)
+                    for p in range(processes)
+                ]
+                parts = [future.result() for future in futures]
+        finally:
+            if server is not None:
+                lock_stats = server.db.lock_stats.as_dict()
+                server.stop()
+                parts.append({"latencies": {}, "errors": {}, "lock_stats": lock_stats})
+        results = merge_results(parts)
+    elapsed = time.perf_counter() - started
+
+    all_latencies = [value for values in results["latencies"].values() for value in values]
+    return {
+        "config": config,
+        "users": users * max(1, processes),
+        "elapsed_s": round(elapsed, 2),
+        "throughput_ops": round(len(all_latencies) / elapsed, 1) if elapsed else 0.0,
+        "overall": summarize(all_latencies),
+        "operations": {name: summarize(values) for name, values in sorted(results["latencies"].items())},
+        "errors": results["errors"],
+        "lock_stats": results["lock_stats"],
+    }
+
+
+def report(result: dict):
+    print(f"{result['config']}: {result['users']} users, {result['throughput_ops']} ops/s "
+          f"over {result['elapsed_s']} s")
+    print(f"  {'operation':<22}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, stats in list(result["operations"].items()) + [("overall", result["overall"])]:
+        print(f"  {name:<22}{stats['count']:>8}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}"
+              f"{stats['p99_ms']:>10.2f}{stats['max_ms']:>10.2f}")
+    lock_stats = result["lock_stats"]
+    print(f"  lock waits: {lock_stats.get('retried_operations', 0)} operations, "
+          f"{lock_stats.get('busy_errors', 0)} busy errors, "
+          f"{lock_stats.get('failed_operations', 0)} failed, "
+          f"{lock_stats.get('total_wait_seconds', 0.0):.3f} s waited")
+    if result["errors"]:
+        print("  errors: " + ", ".join(f"{key}={count}" for key, count in sorted(result["errors"].items())))
+    print()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent timekeepers against the database layer.")
+    parser.add_argument("--db", required=True, help="database to load-test (copied unless --in-place)")
+    parser.add_argument("--config", action="append", choices=CONFIGURATIONS,
+                        help="database configuration to test; repeat for several (defaults to all)")
+    parser.add_argument("--users", type=int, default=8, help="simulated users per process")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes, each running --users threads")
+    parser.add_argument("--rate", type=float, default=2.0, help="operations per second per user (0 = unthrottled)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per configuration")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--busy-timeout", type=float, default=DEFAULT_BUSY_TIMEOUT,
+                        help="SQLite busy timeout in seconds for the direct and writer configurations")
+    parser.add_argument("--in-place", action="store_true", help="write to --db instead of a scratch copy")
+    parser.add_argument("--json", help="write results to a JSON file")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"Database not found: {args.db}", file=sys.stderr)
+        return 1
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for config in args.config or CONFIGURATIONS:
+            db_path = args.db
+            if not args.in_place:
+                db_path = os.path.join(tmp_dir, f"load_{config}.db")
+                backup_database(args.db, db_path)
+            result = run_configuration(config, db_path, args.users, args.processes,
+                                       args.rate, args.duration, args.seed, args.busy_timeout)
+            report(result)
+            results.append(result)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"users": args.users, "processes": args.processes, "rate": args.rate,
+                       "duration": args.duration, "results": results}, f, indent=2)
+        print(f"Results written to: {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
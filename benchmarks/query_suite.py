@@ -0,0 +1,367 @@
+import os
+import sys
+import json
+import time
+import inspect
+import itertools
+import sqlite3
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from datetime import date, datetime, timedelta
+
+from benchmarks.dataset import FirmProfile, generate_dataset
+from core.backup import backup_database
+from core.database import Database
+from core.models import Person, Case, CasePerson, BillingEntry, Payment
+from core.queries import QuerySet
+
+
+SCALES = {
+    "1k": 1_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_NOISE_FLOOR_MS = 0.5
+DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), "law_billing_benchmarks")
+
+
+def profile_for_scale(rows: int) -> FirmProfile:
+    return FirmProfile(
+        people=max(50, rows // 40),
+        matters=max(10, rows // 200),
+        billing_entries=rows,
+        payments=max(10, rows // 10),
+        call_log_files=0,
+        emails=0,
+        stored_calls=max(100, rows // 10),
+    )
+
+
+def dataset_path(data_dir: str, scale: str, seed: int) -> str:
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"queries_{scale}_seed{seed}.db")
+    if not os.path.exists(path):
+        print(f"Generating {scale} dataset: {path}")
+        generate_dataset(path, profile_for_scale(SCALES[scale]), seed)
+    return path
+
+
+class Fixture:
+    def __init__(self, db: Database):
+        row = db.fetchone("""
+            SELECT case_id, COUNT(*) AS entries FROM billing_entries
+            GROUP BY case_id ORDER BY entries DESC, case_id LIMIT 1
+        """)
+        self.busy_case_id = row["case_id"]
+        self.case_ids = [row["id"] for row in db.fetchall("SELECT id FROM cases ORDER BY id")]
+        self.case_id = self.case_ids[len(self.case_ids) // 2]
+        client = db.fetchone("""
+            SELECT p.id, p.first_name, p.last_name FROM case_people cp JOIN people p ON p.id = cp.person_id
+            WHERE cp.case_id = ? AND cp.role = 'client'
+        """, (self.busy_case_id,))
+        self.client_id, self.first_name, self.last_name = client["id"], client["first_name"], client["last_name"]
+        party = db.fetchone("""
+            SELECT person_id FROM case_people WHERE role = 'opposing_party' ORDER BY case_id LIMIT 1
+        """)
+        self.opposing = (db.fetchone("SELECT case_id FROM case_people WHERE person_id = ?",
+                                     (party["person_id"],))["case_id"], party["person_id"]) if party else (self.case_id, 0)
+        period = db.fetchone("""
+            SELECT substr(entry_date, 1, 7) AS period, COUNT(*) AS entries FROM billing_entries
+            GROUP BY period ORDER BY entries DESC LIMIT 1
+        """)["period"]
+        self.year, self.month = int(period[:4]), int(period[5:])
+        self.start_date, self.end_date = f"{period}-01", f"{period}-28"
+        self.county = db.fetchone("SELECT county FROM cases WHERE county IS NOT NULL LIMIT 1")["county"]
+
+        queries = QuerySet(db)
+        self.person = queries.people.get_by_id(self.client_id)
+        self.case = queries.cases.get_by_id(self.busy_case_id)
+        self.entry = queries.billing.get_by_id(
+            db.fetchone("SELECT MIN(id) FROM billing_entries WHERE case_id = ?", (self.busy_case_id,))[0])
+        self.payment = queries.payments.get_by_id(db.fetchone("SELECT MIN(id) FROM payments")[0])
+        self.billing_page = queries.billing.get_page_by_case(self.busy_case_id)
+        self.case_page = queries.cases.get_page_with_client()
+        self.people_page = queries.people.get_page()
+        self.call_page = queries.call_logs.get_page(sort="contact")
+        self.calls = itertools.count()
+
+
+def new_person(fx: Fixture) -> Person:
+    return Person(first_name="Bench", last_name=fx.last_name, phone="(404) 555-0100")
+
+
+def new_case(fx: Fixture) -> Case:
+    return Case(case_name=f"{fx.last_name}-999", status="Open", billing_rate_cents=30000)
+
+
+def new_entry(fx: Fixture) -> BillingEntry:
+    return BillingEntry(case_id=fx.busy_case_id, entry_date=date(fx.year, fx.month, 15), hours=1.5,
+                        description="Benchmark entry")
+
+
+def new_payment(fx: Fixture) -> Payment:
+    return Payment(person_id=fx.client_id, case_id=fx.busy_case_id, payment_date=date(fx.year, fx.month, 15),
+                   amount_cents=10000)
+
+
+def new_calls(fx: Fixture, count: int = 100) -> list:
+    started = datetime(2000, 1, 1)
+    calls = []
+    for _ in range(count):
+        call_time = started + timedelta(minutes=next(fx.calls))
+        calls.append({"call_datetime": call_time.strftime("%Y-%m-%d %H:%M:%S"), "phone_number": "(404) 555-0100",
+                      "phone_digits": "4045550100", "duration_minutes": 1})
+    return calls
+
+
+def reset_call_contacts(q: QuerySet) -> tuple:
+    q.db.execute("DELETE FROM db_meta WHERE key = 'call_log_contacts_version'")
+    return ()
+
+
+WRITE_METHODS = frozenset({
+    "people.create", "people.delete", "people.update",
+    "cases.create", "cases.create_with_client", "cases.delete", "cases.update",
+    "case_people.add_person_to_case", "case_people.clear_pro_se_for_party", "case_people.delete",
+    "case_people.remove_person_from_case", "case_people.update_client", "case_people.update_client_designation",
+    "billing.create", "billing.create_from_dict", "billing.delete", "billing.update",
+    "payments.create", "payments.delete", "payments.update",
+    "recent_counties.add_recent",
+    "call_logs.clear", "call_logs.import_records", "call_logs.refresh_contacts",
+})
+
+# Each benchmark builds the arguments for one timed call; any setup it does is not timed.
+BENCHMARKS = {
+    "people.count": lambda q, fx: (),
+    "people.create": lambda q, fx: (new_person(fx),),
+    "people.delete": lambda q, fx: (q.people.create(new_person(fx)),),
+    "people.find_duplicates": lambda q, fx: (fx.first_name, fx.last_name),
+    "people.get_all": lambda q, fx: (),
+    "people.get_all_clients": lambda q, fx: (),
+    "people.get_by_id": lambda q, fx: (fx.client_id,),
+    "people.get_page": lambda q, fx: (fx.people_page[-1],),
+    "people.get_phone_contacts": lambda q, fx: (),
+    "people.update": lambda q, fx: (fx.person,),
+
+    "cases.count": lambda q, fx: (),
+    "cases.create": lambda q, fx: (new_case(fx),),
+    "cases.create_with_client": lambda q, fx: (new_case(fx), fx.client_id, "plaintiff"),
+    "cases.delete": lambda q, fx: (q.cases.create(new_case(fx)),),
+    "cases.generate_matter_number": lambda q, fx: (fx.last_name,),
+    "cases.get_all": lambda q, fx: (),
+    "cases.get_all_with_client": lambda q, fx: (),
+    "cases.get_balance_totals": lambda q, fx: (),
+    "cases.get_by_client": lambda q, fx: (fx.client_id,),
+    "cases.get_by_id": lambda q, fx: (fx.busy_case_id,),
+    "cases.get_cases_for_person": lambda q, fx: (fx.client_id,),
+    "cases.get_matters_for_invoice": lambda q, fx: (),
+    "cases.get_page_with_client": lambda q, fx: (True, fx.case_page[-1]),
+    "cases.update": lambda q, fx: (fx.case,),
+
+    "case_people.add_person_to_case": lambda q, fx: (
+        CasePerson(case_id=q.cases.create(new_case(fx)), person_id=fx.client_id, role="client"),),
+    "case_people.clear_pro_se_for_party": lambda q, fx: fx.opposing,
+    "case_people.count": lambda q, fx: (),
+    "case_people.delete": lambda q, fx: (q.case_people.add_person_to_case(
+        CasePerson(case_id=q.cases.create(new_case(fx)), person_id=fx.client_id, role="client")),),
+    "case_people.get_all": lambda q, fx: (),
+    "case_people.get_by_id": lambda q, fx: (1,),
+    "case_people.get_by_role": lambda q, fx: (fx.busy_case_id, "client"),
+    "case_people.get_case_summary": lambda q, fx: (fx.busy_case_id,),
+    "case_people.get_people_for_case": lambda q, fx: (fx.busy_case_id,),
+    "case_people.remove_person_from_case": lambda q, fx: (q.case_people.add_person_to_case(
+        CasePerson(case_id=q.cases.create(new_case(fx)), person_id=fx.client_id, role="client")),),
+    "case_people.update_client": lambda q, fx: (fx.busy_case_id, fx.client_id, "plaintiff"),
+    "case_people.update_client_designation": lambda q, fx: (fx.busy_case_id, "plaintiff"),
+
+    "billing.count": lambda q, fx: (),
+    "billing.create": lambda q, fx: (new_entry(fx),),
+    "billing.create_from_dict": lambda q, fx: ({"case_id": fx.busy_case_id, "entry_date": fx.start_date,
+                                                "hours": 0.5, "description": "Benchmark entry"},),
+    "billing.delete": lambda q, fx: (q.billing.create(new_entry(fx)),),
+    "billing.get_all": lambda q, fx: (),
+    "billing.get_by_case": lambda q, fx: (fx.busy_case_id,),
+    "billing.get_by_id": lambda q, fx: (fx.entry.id,),
+    "billing.get_case_totals": lambda q, fx: (fx.busy_case_id,),
+    "billing.get_entries_for_period": lambda q, fx: (fx.busy_case_id, fx.year, fx.month),
+    "billing.get_entries_for_period_by_case": lambda q, fx: (fx.year, fx.month),
+    "billing.get_ledes_invoice_totals": lambda q, fx: (None, fx.start_date, fx.end_date),
+    "billing.get_page_by_case": lambda q, fx: (fx.busy_case_id, fx.billing_page[-1]),
+    "billing.iter_ledes_entries": lambda q, fx: (None, fx.start_date, fx.end_date),
+    "billing.update": lambda q, fx: (fx.entry,),
+
+    "payments.count": lambda q, fx: (),
+    "payments.create": lambda q, fx: (new_payment(fx),),
+    "payments.delete": lambda q, fx: (q.payments.create(new_payment(fx)),),
+    "payments.get_all": lambda q, fx: (),
+    "payments.get_by_case": lambda q, fx: (fx.busy_case_id,),
+    "payments.get_by_id": lambda q, fx: (fx.payment.id,),
+    "payments.get_case_payment_totals": lambda q, fx: (fx.busy_case_id,),
+    "payments.update": lambda q, fx: (fx.payment,),
+
+    "recent_counties.add_recent": lambda q, fx: (fx.county,),
+    "recent_counties.get_recent": lambda q, fx: (),
+
+    "call_logs.clear": lambda q, fx: (),
+    "call_logs.count": lambda q, fx: (fx.start_date, fx.end_date),
+    "call_logs.get_page": lambda q, fx: (None, None, None, "contact", fx.call_page[-1] if fx.call_page else None),
+    "call_logs.import_records": lambda q, fx: (new_calls(fx),),
+    "call_logs.refresh_contacts": lambda q, fx: reset_call_contacts(q),
+
+    "invoices.get_billing_rate": lambda q, fx: (fx.busy_case_id,),
+    "invoices.get_case_ids_with_activity": lambda q, fx: (fx.year, fx.month),
+    "invoices.get_trust_balances": lambda q, fx: (fx.busy_case_id, fx.year, fx.month),
+    "invoices.get_trust_balances_by_case": lambda q, fx: (fx.year, fx.month),
+
+    "reports.get_all_matters_summary": lambda q, fx: (),
+    "reports.get_monthly_billing_summary": lambda q, fx: (fx.year, fx.month),
+    "reports.get_period_totals": lambda q, fx: (fx.year, fx.month),
+}
+
+
+def query_methods(queries: QuerySet) -> list:
+    names = []
+    for service, target in vars(queries).items():
+        if service == "db":
+            continue
+        names.extend(
+            f"{service}.{name}" for name, _ in inspect.getmembers(type(target), inspect.isfunction)
+            if not name.startswith("_")
+        )
+    # Reads run first so rows added by the write benchmarks don't skew them.
+    return sorted(names, key=lambda name: (name in WRITE_METHODS, name))
+
+
+def consume(result):
+    if inspect.isgenerator(result):
+        for _ in result:
+            pass
+
+
+def time_method(queries: QuerySet, fx: Fixture, name: str, min_time: float,
+                min_repeats: int, max_repeats: int) -> dict:
+    service, method_name = name.split(".")
+    method = getattr(getattr(queries, service), method_name)
+    build_args = BENCHMARKS[name]
+    timings = []
+    consume(method(*build_args(queries, fx)))
+    while len(timings) < max_repeats and (len(timings) < min_repeats or sum(timings) < min_time):
+        args = build_args(queries, fx)
+        start = time.perf_counter()
+        consume(method(*args))
+        timings.append(time.perf_counter() - start)
+    return {
+        "median_ms": round(statistics.median(timings) * 1000.0, 4),
+        "min_ms": round(min(timings) * 1000.0, 4),
+        "max_ms": round(max(timings) * 1000.0, 4),
+        "repeats": len(timings),
+    }
+
+
+def run_scale(scale: str, data_dir: str, seed: int, names: list, min_time: float,
+              min_repeats: int, max_repeats: int) -> dict:
+    source = dataset_path(data_dir, scale, seed)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench.db")
+        backup_database(source, db_path)
+        db = Database(db_path)
+        try:
+            queries = QuerySet(db)
+            fx = Fixture(db)
+            results = {}
+            for name in names:
+                results[name] = time_method(queries, fx, name, min_time, min_repeats, max_repeats)
+                print(f"  {scale:<6}{name:<48}{results[name]['median_ms']:>12.3f} ms")
+        finally:
+            db.close()
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, threshold: float, noise_floor_ms: float) -> list:
+    regressions = []
+    for scale, methods in results.items():
+        for name, stats in methods.items():
+            previous = baseline.get("results", {}).get(scale, {}).get(name)
+            if not previous:
+                continue
+            before, after = previous["median_ms"], stats["median_ms"]
+            if after - before > noise_floor_ms and after > before * (1.0 + threshold):
+                regressions.append((scale, name, before, after))
+    return regressions
+
+
+def report(regressions: list, threshold: float):
+    if not regressions:
+        print(f"No regressions beyond {threshold:.0%}")
+        return
+    print(f"{len(regressions)} regression(s) beyond {threshold:.0%}:")
+    for scale, name, before, after in regressions:
+        print(f"  {scale:<6}{name:<48}{before:>10.3f} ms -> {after:>10.3f} ms ({after / before - 1.0:+.0%})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time every public query method against synthetic datasets.")
+    parser.add_argument("--scale", action="append", choices=list(SCALES),
+                        help="billing-entry scale to run; repeat for several (defaults to all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="folder caching the generated datasets")
+    parser.add_argument("--filter", help="only run methods whose name contains this text")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum seconds spent timing each method")
+    parser.add_argument("--min-repeats", type=int, default=3)
+    parser.add_argument("--max-repeats", type=int, default=200)
+    parser.add_argument("--json", help="write results to a JSON file")
+    parser.add_argument("--baseline", help="JSON results from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="fail when a method's median slows down by more than this fraction")
+    parser.add_argument("--noise-floor-ms", type=float, default=DEFAULT_NOISE_FLOOR_MS,
+                        help="ignore slowdowns smaller than this many milliseconds")
+    args = parser.parse_args(argv)
+
+    all_methods = query_methods(QuerySet(None))
+    missing = [name for name in all_methods if name not in BENCHMARKS]
+    if missing:
+        print("No benchmark for: " + ", ".join(missing), file=sys.stderr)
+        return 1
+    names = [name for name in all_methods if not args.filter or args.filter in name]
+
+    results = {}
+    for scale in args.scale or SCALES:
+        results[scale] = run_scale(scale, args.data_dir, args.seed, names, args.min_time,
+                                   args.min_repeats, args.max_repeats)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "commit": git_commit(),
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+                "seed": args.seed,
+                "python": platform.python_version(),
+                "sqlite": sqlite3.sqlite_version,
+                "results": results,
+            }, f, indent=2)
+        print(f"Results written to: {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold, args.noise_floor_ms)
+        report(regressions, args.threshold)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
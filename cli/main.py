@@ -0,0 +1,339 @@
+import os
+import sys
+import csv
+import argparse
+import concurrent.futures
+from datetime import date
+
+from core.database import JOURNAL_MODES, Database
+from core.queries import CaseQueries, PersonQueries, BillingQueries, InvoiceQueries, ReportQueries, CallLogQueries
+from core.utils import get_default_db_path, get_image_path
+
+
+def print_table(headers: list, rows: list, out=None):
+    out = out or sys.stdout
+    widths = [len(h) for h in headers]
+    for row in rows:
+        for i, value in enumerate(row):
+            widths[i] = max(widths[i], len(value))
+    line = "  ".join(h.ljust(widths[i]) for i, h in enumerate(headers))
+    out.write(line.rstrip() + "\n")
+    out.write("  ".join("-" * w for w in widths) + "\n")
+    for row in rows:
+        out.write("  ".join(value.ljust(widths[i]) for i, value in enumerate(row)).rstrip() + "\n")
+
+
+def write_csv(file_path: str, columns: list, records: list):
+    with open(file_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def open_database(args, read_only: bool = False) -> Database:
+    if not os.path.exists(args.db):
+        raise SystemExit(f"Database not found: {args.db}")
+    return Database(args.db, journal_mode=args.journal_mode, read_only=read_only)
+
+
+def cmd_report(args) -> int:
+    from core.reports import (
+        HAS_DOCX, REPORT_HEADERS, generate_report_data, report_row_values, report_title,
+        report_summary_text, calculate_report_totals, write_report_csv, build_report_document
+    )
+    report_type = "monthly" if args.type == "monthly" else "all_time"
+    db = open_database(args)
+    try:
+        data, totals = generate_report_data(
+            ReportQueries(db), report_type, args.year, args.month, not args.open_only
+        )
+        rows = [report_row_values(row) for row in data]
+        title = report_title(report_type, args.year, args.month)
+
+        if args.csv:
+            write_report_csv(args.csv, rows)
+            print(f"Report exported to: {args.csv}")
+        if args.docx:
+            if not HAS_DOCX:
+                print("python-docx is required for Word export.", file=sys.stderr)
+                return 1
+            build_report_document(title, rows, calculate_report_totals(data), get_image_path()).save(args.docx)
+            print(f"Report exported to: {args.docx}")
+        if not args.csv and not args.docx:
+            print(title)
+            print()
+            print_table(REPORT_HEADERS, rows)
+            print()
+            print(report_summary_text(calculate_report_totals(data)))
+        return 0
+    finally:
+        db.close()
+
+
+def cmd_invoices(args) -> int:
+    from core.invoices import HAS_DOCX, prepare_batch_jobs, existing_invoice_paths, BatchInvoiceRun
+    if not HAS_DOCX:
+        print("python-docx is required for invoice generation.", file=sys.stderr)
+        return 1
+    if not os.path.isdir(args.output_dir):
+        print(f"Output folder does not exist: {args.output_dir}", file=sys.stderr)
+        return 1
+
+    db = open_database(args)
+    try:
+        jobs = prepare_batch_jobs(
+            CaseQueries(db), BillingQueries(db), InvoiceQueries(db),
+            args.year, args.month, args.output_dir,
+            matter_filter=args.filter,
+            fee_target=args.fee_target,
+            expense_target=args.expense_target,
+            reconcile_mode=args.reconcile,
+            image_path=get_image_path()
+        )
+    finally:
+        db.close()
+    if not jobs:
+        print("No matters match the selected filter.")
+        return 0
+    existing = existing_invoice_paths(jobs)
+    if existing and not args.overwrite:
+        print(f"{len(existing)} of {len(jobs)} invoices already exist in {args.output_dir}; "
+              "pass --overwrite to replace them.", file=sys.stderr)
+        return 1
+
+    run = BatchInvoiceRun(jobs, max_workers=args.workers)
+    try:
+        for completed, _ in enumerate(concurrent.futures.as_completed(run.futures), start=1):
+            print(f"\r{completed} of {len(jobs)} complete", end="", flush=True)
+        print()
+    except KeyboardInterrupt:
+        run.cancel()
+        print("\nBatch cancelled.")
+    finally:
+        run.shutdown()
+
+    saved, failed = run.results()
+    print(f"Invoices saved: {len(saved)} of {len(jobs)}")
+    print(f"Folder: {args.output_dir}")
+    for message in failed:
+        print(f"Failed: {message}", file=sys.stderr)
+    return 1 if failed or run.cancelled else 0
+
+
+def cmd_ledes(args) -> int:
+    from core.ledes import export_ledes
+    db = open_database(args)
+    try:
+        count = export_ledes(
+            args.output, BillingQueries(db),
+            case_id=args.case_id,
+            start_date=args.start,
+            end_date=args.end,
+            law_firm_id=args.law_firm_id,
+            timekeeper_id=args.timekeeper_id,
+            timekeeper_name=args.timekeeper_name,
+            timekeeper_classification=args.timekeeper_classification
+        )
+        print(f"Exported {count} line items to: {args.output}")
+        return 0
+    finally:
+        db.close()
+
+
+def _print_import_summary(file_count: int, loaded: int, duplicates: int, failed_files: list):
+    print(f"Files processed: {file_count}")
+    print(f"Loaded: {loaded} new records")
+    print(f"Skipped: {duplicates} duplicates")
+    for message in failed_files:
+        print(f"Failed: {message}", file=sys.stderr)
+
+
+def cmd_import_calls(args) -> int:
+    from core.call_log import import_call_logs, build_phone_directory, lookup_contact_name, format_call_datetime
+    records, duplicates, failed_files = import_call_logs(args.files)
+
+    # Without --save the database is only read for contact names, so don't set it up or migrate it.
+    db = open_database(args, read_only=not args.save) if args.save or os.path.exists(args.db) else None
+    try:
+        phone_to_name = build_phone_directory(PersonQueries(db).get_phone_contacts()) if db else {}
+        for record in records:
+            record['contact_name'] = lookup_contact_name(phone_to_name, record['phone_number'])
+        records.sort(key=lambda r: r['call_datetime'], reverse=True)
+
+        columns = ['call_datetime', 'phone_number', 'contact_name', 'duration_minutes']
+        if args.output:
+            write_csv(args.output, columns, records)
+        else:
+            print_table(
+                ["Date/Time", "Phone Number", "Contact", "Duration (Min)"],
+                [[format_call_datetime(r['call_datetime']), r['phone_number'], r['contact_name'],
+                  str(r['duration_minutes'])] for r in records]
+            )
+        _print_import_summary(len(args.files), len(records), duplicates, failed_files)
+        if args.save:
+            saved = CallLogQueries(db).import_records(records)
+            print(f"Saved: {saved} new records to {args.db} ({len(records) - saved} already stored)")
+        return 1 if failed_files else 0
+    finally:
+        if db is not None:
+            db.close()
+
+
+def cmd_import_emails(args) -> int:
+    from core.email_log import EMAIL_LOG_COLUMNS, import_eml_files
+    records, duplicates, failed_files = import_eml_files(args.files)
+    records.sort(key=lambda r: r['email_datetime'], reverse=True)
+
+    if args.output:
+        write_csv(args.output, EMAIL_LOG_COLUMNS, records)
+    else:
+        print_table(
+            ["Date/Time", "From", "To", "Subject"],
+            [[r['email_datetime'], r['sender'], r['recipients'], r['subject']] for r in records]
+        )
+    _print_import_summary(len(args.files), len(records), duplicates, failed_files)
+    return 1 if failed_files else 0
+
+
+def cmd_backup(args) -> int:
+    from core.backup import auto_backup
+    backup_path = auto_backup(args.db, keep_count=args.keep, backup_dir=args.dest)
+    if not backup_path:
+        print(f"Database not found: {args.db}", file=sys.stderr)
+        return 1
+    print(f"Backup saved to: {backup_path}")
+    return 0
+
+
+def cmd_check(args) -> int:
+    from core.backup import check_integrity
+    if not os.path.exists(args.db):
+        print(f"Database not found: {args.db}", file=sys.stderr)
+        return 1
+    problems = check_integrity(args.db)
+    if problems:
+        for problem in problems:
+            print(problem)
+        return 1
+    print("ok")
+    return 0
+
+
+def cmd_profile_imports(args) -> int:
+    from core.import_profile import (
+        DEFAULT_PROFILE_MODULES, profile_import, format_import_report, format_deferred_report
+    )
+    status = 0
+    for module_name in args.modules or DEFAULT_PROFILE_MODULES:
+        try:
+            print(format_import_report(module_name, profile_import(module_name), args.limit))
+        except ImportError as e:
+            print(f"Failed to import {e}", file=sys.stderr)
+            status = 1
+        print()
+    if not args.modules:
+        print(format_deferred_report())
+    return status
+
+
+def cmd_serve(args) -> int:
+    import asyncio
+    from core.api_server import ApiServer
+    try:
+        server = ApiServer(args.db, host=args.host, port=args.port, workers=args.workers, token=args.token,
+                           journal_mode=args.journal_mode)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    try:
+        asyncio.run(server.serve_forever(lambda url: print(f"Serving {args.db} at {url}", flush=True)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def add_period_arguments(parser, required: bool):
+    today = date.today()
+    parser.add_argument("--year", type=int, required=required, default=None if required else today.year)
+    parser.add_argument("--month", type=int, choices=range(1, 13), metavar="1-12",
+                        required=required, default=None if required else today.month)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from core.ledes import TIMEKEEPER_CLASSIFICATIONS
+
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Law billing command-line tools.")
+    parser.add_argument("--db", default=get_default_db_path(), help="path to law_billing.db")
+    parser.add_argument("--journal-mode", choices=JOURNAL_MODES, type=str.upper,
+                        help="set the database journal mode (default: keep the current one; "
+                             "WAL needs the file on a local disk)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    report = subparsers.add_parser("report", help="monthly or all-time billing summary")
+    report.add_argument("type", choices=["monthly", "all-time"])
+    add_period_arguments(report, required=False)
+    report.add_argument("--open-only", action="store_true", help="exclude closed matters")
+    report.add_argument("--csv", help="write the report to a CSV file")
+    report.add_argument("--docx", help="write the report to a Word document")
+    report.set_defaults(func=cmd_report)
+
+    invoices = subparsers.add_parser("invoices", help="generate month-end invoices for many matters")
+    add_period_arguments(invoices, required=True)
+    invoices.add_argument("--output-dir", required=True)
+    invoices.add_argument("--filter", choices=["open", "activity", "open_activity"], default="open")
+    invoices.add_argument("--fee-target", type=float, default=0.0)
+    invoices.add_argument("--expense-target", type=float, default=0.0)
+    invoices.add_argument("--reconcile", choices=["none", "final", "transfer"], default="none")
+    invoices.add_argument("--workers", type=int, default=None)
+    invoices.add_argument("--overwrite", action="store_true", help="replace invoices already in the output folder")
+    invoices.set_defaults(func=cmd_invoices)
+
+    ledes = subparsers.add_parser("ledes", help="export billing entries as LEDES 1998B")
+    ledes.add_argument("output")
+    ledes.add_argument("--case-id", type=int)
+    ledes.add_argument("--start", help="first entry date (YYYY-MM-DD)")
+    ledes.add_argument("--end", help="last entry date (YYYY-MM-DD)")
+    ledes.add_argument("--law-firm-id", default="")
+    ledes.add_argument("--timekeeper-id", default="")
+    ledes.add_argument("--timekeeper-name", default="")
+    ledes.add_argument("--timekeeper-classification", choices=list(TIMEKEEPER_CLASSIFICATIONS), default="PT")
+    ledes.set_defaults(func=cmd_ledes)
+
+    calls = subparsers.add_parser("import-calls", help="parse call-log CSV exports")
+    calls.add_argument("files", nargs="+")
+    calls.add_argument("--output", help="write the merged call log to a CSV file")
+    calls.add_argument("--save", action="store_true", help="store the calls in the database's call log")
+    calls.set_defaults(func=cmd_import_calls)
+
+    emails = subparsers.add_parser("import-emails", help="parse EML files into an email log")
+    emails.add_argument("files", nargs="+")
+    emails.add_argument("--output", help="write the email log to a CSV file")
+    emails.set_defaults(func=cmd_import_emails)
+
+    backup = subparsers.add_parser("backup", help="back up the database")
+    backup.add_argument("--keep", type=int, default=5, help="number of backups to keep")
+    backup.add_argument("--dest", help="backup folder (defaults to backups/ next to the database)")
+    backup.set_defaults(func=cmd_backup)
+
+    check = subparsers.add_parser("check", help="run SQLite integrity and foreign key checks")
+    check.set_defaults(func=cmd_check)
+
+    profile = subparsers.add_parser("profile-imports", help="report per-module import cost")
+    profile.add_argument("modules", nargs="*", help="modules to profile (defaults to the GUI entry point)")
+    profile.add_argument("--limit", type=int, default=25, help="rows to show per section")
+    profile.set_defaults(func=cmd_profile_imports)
+
+    from core.api_protocol import API_TOKEN_ENV_VAR, DEFAULT_API_HOST, DEFAULT_API_PORT, DEFAULT_API_WORKERS
+    serve = subparsers.add_parser("serve", help="share the database with other users over a JSON HTTP API")
+    serve.add_argument("--host", default=DEFAULT_API_HOST, help="address to listen on; anything but loopback requires a token")
+    serve.add_argument("--token", help=f"shared secret clients must send (default: ${API_TOKEN_ENV_VAR})")
+    serve.add_argument("--port", type=int, default=DEFAULT_API_PORT)
+    serve.add_argument("--workers", type=int, default=DEFAULT_API_WORKERS, help="database worker threads")
+    serve.set_defaults(func=cmd_serve)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
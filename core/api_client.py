@@ -0,0 +1,111 @@
+import http.client
+import json
+import threading
+from urllib.parse import urlsplit
+
+from core.api_protocol import (
+    API_METHODS, API_SERVICES, API_TOKEN_HEADER, ApiError,
+    api_token_from_env, decode_error, decode_value, encode_call
+)
+
+
+DEFAULT_API_TIMEOUT = 30.0
+
+
+class ApiClient:
+    def __init__(self, url: str, timeout: float = DEFAULT_API_TIMEOUT, token: str = None):
+        parts = urlsplit(url if "://" in url else f"http://{url}")
+        if parts.scheme != "http" or not parts.hostname:
+            raise ValueError(f"Unsupported server URL: {url}")
+        self.url = url
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.token = token or api_token_from_env()
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection(
+                self.host, self.port, timeout=self.timeout
+            )
+        return connection
+
+    def request(self, method: str, path: str, payload: dict = None) -> dict:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        if self.token:
+            headers[API_TOKEN_HEADER] = self.token
+        for attempt in range(2):
+            connection = self._connection()
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                data = json.loads(response.read() or b"{}")
+                break
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                connection.close()
+                self._local.connection = None
+                if attempt:
+                    raise
+            except OSError as e:
+                connection.close()
+                self._local.connection = None
+                raise ApiError(f"Cannot reach server at {self.url}: {e}") from e
+        if "error" in data:
+            raise decode_error(data["error"])
+        return data
+
+    def call(self, service: str, method: str, *args, **kwargs):
+        return decode_value(self.request("POST", "/call", encode_call(service, method, args, kwargs))["result"])
+
+    def call_many(self, calls: list) -> list:
+        data = self.request("POST", "/batch", {"calls": [encode_call(*call) for call in calls]})
+        results = []
+        for item in data["results"]:
+            if "error" in item:
+                raise decode_error(item["error"])
+            results.append(decode_value(item["result"]))
+        return results
+
+    def health(self) -> dict:
+        return self.request("GET", "/health")
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class RemoteQueries:
+    def __init__(self, client: ApiClient, service: str):
+        self.client = client
+        self.service = service
+
+    def __getattr__(self, name: str):
+        if name not in API_METHODS[self.service]:
+            raise AttributeError(f"{self.service} has no remote method {name!r}")
+        return lambda *args, **kwargs: self.client.call(self.service, name, *args, **kwargs)
+
+
+class RemoteDatabase(RemoteQueries):
+    db_path = None
+
+    def __init__(self, client: ApiClient):
+        super().__init__(client, "db")
+
+    def close(self):
+        self.client.close()
+
+
+class RemoteQuerySet:
+    def __init__(self, client: ApiClient):
+        self.client = client
+        self.db = RemoteDatabase(client)
+        for service in API_SERVICES:
+            setattr(self, service, RemoteQueries(client, service))
+
+    def call_many(self, calls: list) -> list:
+        return self.client.call_many(calls)
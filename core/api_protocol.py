@@ -0,0 +1,117 @@
+import inspect
+import os
+import sqlite3
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime
+from types import GeneratorType
+
+from core.models import Person, Case, CasePerson, BillingEntry, Payment
+from core.queries import (
+    PersonQueries, CaseQueries, CasePersonQueries, BillingQueries,
+    PaymentQueries, RecentCountyQueries, InvoiceQueries, ReportQueries, CallLogQueries
+)
+
+
+DEFAULT_API_HOST = "127.0.0.1"
+DEFAULT_API_PORT = 8765
+DEFAULT_API_WORKERS = 4
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+API_TOKEN_ENV_VAR = "LAW_BILLING_API_TOKEN"
+API_TOKEN_HEADER = "X-Api-Token"
+LOOPBACK_HOSTS = frozenset({"127.0.0.1", "::1", "localhost"})
+
+API_SERVICES = {
+    "people": PersonQueries,
+    "cases": CaseQueries,
+    "case_people": CasePersonQueries,
+    "billing": BillingQueries,
+    "payments": PaymentQueries,
+    "recent_counties": RecentCountyQueries,
+    "invoices": InvoiceQueries,
+    "reports": ReportQueries,
+    "call_logs": CallLogQueries,
+}
+
+MODEL_CLASSES = {cls.__name__: cls for cls in (Person, Case, CasePerson, BillingEntry, Payment)}
+
+ERROR_TYPES = {
+    "IntegrityError": sqlite3.IntegrityError,
+    "OperationalError": sqlite3.OperationalError,
+    "ValueError": ValueError,
+    "KeyError": KeyError,
+    "TypeError": TypeError,
+}
+
+
+class ApiError(Exception):
+    pass
+
+
+def api_token_from_env():
+    return os.environ.get(API_TOKEN_ENV_VAR, "").strip() or None
+
+
+def public_methods(cls) -> frozenset:
+    return frozenset(
+        name for name, member in inspect.getmembers(cls, inspect.isfunction)
+        if not name.startswith("_")
+    )
+
+
+API_METHODS = {service: public_methods(cls) for service, cls in API_SERVICES.items()}
+API_METHODS["db"] = frozenset({"get_data_version"})
+
+
+def encode_value(value):
+    if is_dataclass(value) and not isinstance(value, type):
+        return {"__model__": type(value).__name__,
+                "fields": {f.name: encode_value(getattr(value, f.name)) for f in fields(value)}}
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, sqlite3.Row):
+        value = dict(value)
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value):
+            return {key: encode_value(item) for key, item in value.items()}
+        return {"__items__": [[encode_value(key), encode_value(item)] for key, item in value.items()]}
+    if isinstance(value, (set, frozenset)):
+        return {"__set__": [encode_value(item) for item in value]}
+    if isinstance(value, (list, tuple, GeneratorType)):
+        return [encode_value(item) for item in value]
+    return value
+
+
+def decode_value(value):
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if "__model__" in value:
+        model_class = MODEL_CLASSES.get(value["__model__"])
+        if model_class is None:
+            raise ApiError(f"Unknown model: {value['__model__']}")
+        return model_class(**{key: decode_value(item) for key, item in value["fields"].items()})
+    if "__items__" in value:
+        return {decode_value(key): decode_value(item) for key, item in value["__items__"]}
+    if "__set__" in value:
+        return {decode_value(item) for item in value["__set__"]}
+    return {key: decode_value(item) for key, item in value.items()}
+
+
+def encode_call(service: str, method: str, args=(), kwargs=None) -> dict:
+    return {
+        "service": service,
+        "method": method,
+        "args": encode_value(list(args)),
+        "kwargs": encode_value(kwargs or {}),
+    }
+
+
+def encode_error(error: Exception) -> dict:
+    return {"type": type(error).__name__, "message": str(error)}
+
+
+def decode_error(error: dict) -> Exception:
+    return ERROR_TYPES.get(error.get("type"), ApiError)(error.get("message", "Unknown error"))
@@ -0,0 +1,211 @@
+import asyncio
+import hmac
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from core.api_protocol import (
+    API_METHODS, API_TOKEN_ENV_VAR, API_TOKEN_HEADER, DEFAULT_API_HOST, DEFAULT_API_PORT, DEFAULT_API_WORKERS,
+    LOOPBACK_HOSTS, MAX_REQUEST_BYTES, ApiError, api_token_from_env, decode_value, encode_error, encode_value
+)
+from core.database import Database
+from core.queries import QuerySet
+
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found", 405: "Method Not Allowed",
+                413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class ApiServer:
+    def __init__(self, db_path, host: str = DEFAULT_API_HOST, port: int = DEFAULT_API_PORT,
+                 workers: int = DEFAULT_API_WORKERS, token: str = None, journal_mode: str = None):
+        token = token or api_token_from_env()
+        if host not in LOOPBACK_HOSTS and not token:
+            raise ValueError(f"Refusing to listen on {host} without an API token; "
+                             f"pass --token or set {API_TOKEN_ENV_VAR}")
+        self.db_path = db_path
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.token = token
+        self.journal_mode = journal_mode
+        self.db = None
+        self.queries = None
+        self.requests = 0
+        self._executor = None
+        self._server = None
+        self._loop = None
+        self._thread = None
+        self._connections = {}
+        self._started = threading.Event()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def open(self):
+        self.db = Database(self.db_path, journal_mode=self.journal_mode)
+        self.db.start_writer()
+        self.queries = QuerySet(self.db)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="api")
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    async def start(self):
+        self.open()
+        self._server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self, on_started=None):
+        await self.start()
+        if on_started:
+            on_started(self.url)
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.shutdown()
+            self.close()
+
+    async def shutdown(self):
+        self._server.close()
+        connections = list(self._connections.items())
+        for writer, _ in connections:
+            writer.close()
+        await asyncio.gather(*(task for _, task in connections), return_exceptions=True)
+        await self._server.wait_closed()
+
+    def start_background(self) -> str:
+        self._thread = threading.Thread(target=self._run_background, name="api-server", daemon=True)
+        self._thread.start()
+        self._started.wait()
+        return self.url
+
+    def _run_background(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self.start())
+            self._started.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.shutdown())
+        finally:
+            self._started.set()
+            self._loop.close()
+            self.close()
+
+    def stop(self):
+        if self._loop is not None and self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+
+    def call(self, request: dict):
+        service, method = request.get("service"), request.get("method")
+        if method not in API_METHODS.get(service, ()):
+            raise ApiError(f"Unknown method: {service}.{method}")
+        target = self.queries.db if service == "db" else getattr(self.queries, service)
+        args = decode_value(request.get("args") or [])
+        kwargs = decode_value(request.get("kwargs") or {})
+        return encode_value(getattr(target, method)(*args, **kwargs))
+
+    def is_authorized(self, headers: dict) -> bool:
+        if not self.token:
+            return True
+        return hmac.compare_digest(headers.get(API_TOKEN_HEADER.lower(), "").encode(), self.token.encode())
+
+    def call_many(self, requests: list) -> list:
+        results = []
+        for request in requests:
+            try:
+                results.append({"result": self.call(request)})
+            except Exception as e:
+                results.append({"error": encode_error(e)})
+        return results
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> tuple:
+        loop = asyncio.get_running_loop()
+        if path == "/health":
+            version = await loop.run_in_executor(self._executor, self.db.get_data_version)
+            return 200, {"status": "ok", "data_version": version}
+        if path not in ("/call", "/batch"):
+            return 404, {"error": {"type": "ApiError", "message": f"Unknown path: {path}"}}
+        if method != "POST":
+            return 405, {"error": {"type": "ApiError", "message": "Use POST"}}
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError as e:
+            return 400, {"error": encode_error(e)}
+        if not isinstance(request, dict):
+            return 400, {"error": {"type": "ApiError", "message": "Request body must be a JSON object"}}
+
+        if path == "/batch":
+            calls = request.get("calls")
+            if not isinstance(calls, list) or not all(isinstance(call, dict) for call in calls):
+                return 400, {"error": {"type": "ApiError", "message": "calls must be a list of objects"}}
+            results = await loop.run_in_executor(self._executor, self.call_many, calls)
+            return 200, {"results": results}
+        try:
+            result = await loop.run_in_executor(self._executor, self.call, request)
+        except ApiError as e:
+            return 404, {"error": encode_error(e)}
+        except Exception as e:
+            return 500, {"error": encode_error(e)}
+        return 200, {"result": result}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    method = path = version = None
+                    length = -1
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                if length < 0:
+                    status, payload = 400, {"error": {"type": "ApiError", "message": "Malformed request"}}
+                    keep_alive = False
+                elif length > MAX_REQUEST_BYTES:
+                    status, payload = 413, {"error": {"type": "ApiError", "message": "Request too large"}}
+                    keep_alive = False
+                elif not self.is_authorized(headers):
+                    if length:
+                        await reader.readexactly(length)
+                    status, payload = 401, {"error": {"type": "ApiError", "message": "Missing or invalid API token"}}
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    self.requests += 1
+                    status, payload = await self.dispatch(method, path, body)
+
+                data = json.dumps(payload).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
@@ -0,0 +1,53 @@
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+
+BACKUP_PREFIX = "law_billing_backup_"
+DEFAULT_KEEP_COUNT = 5
+
+
+def backup_database(db_path: str, backup_path: str):
+    source = sqlite3.connect(db_path)
+    try:
+        target = sqlite3.connect(backup_path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+    finally:
+        source.close()
+
+
+def auto_backup(db_path: str, keep_count: int = DEFAULT_KEEP_COUNT,
+                backup_dir: str = None) -> Optional[Path]:
+    if not os.path.exists(db_path):
+        return None
+
+    backup_dir = Path(backup_dir) if backup_dir else Path(db_path).parent / "backups"
+    backup_dir.mkdir(parents=True, exist_ok=True)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup_path = backup_dir / f"{BACKUP_PREFIX}{timestamp}.db"
+    backup_database(db_path, str(backup_path))
+
+    backups = sorted(backup_dir.glob(f"{BACKUP_PREFIX}*.db"), reverse=True)
+    for old_backup in backups[keep_count:]:
+        old_backup.unlink()
+    return backup_path
+
+
+def check_integrity(db_path: str) -> List[str]:
+    connection = sqlite3.connect(db_path)
+    try:
+        problems = [
+            row[0] for row in connection.execute("PRAGMA integrity_check").fetchall()
+            if row[0] != "ok"
+        ]
+        for table, rowid, parent, _ in connection.execute("PRAGMA foreign_key_check").fetchall():
+            problems.append(f"{table} row {rowid}: missing {parent} reference")
+        return problems
+    finally:
+        connection.close()
@@ -21,6 +21,10 @@ class BaseQueries(Generic[T]):
         )
         return self.model_class(**dict(row)) if row else None
 
+    def count(self) -> int:
+        row = self.db.fetchone(f"SELECT COUNT(*) FROM {self.table_name}")
+        return row[0] if row else 0
+
     def get_all(self) -> List[T]:
         rows = self.db.fetchall(
             f"SELECT {self.columns} FROM {self.table_name} ORDER BY {self.order_by}"
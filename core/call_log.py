@@ -0,0 +1,283 @@
+import os
+import re
+import csv
+import queue
+import threading
+import multiprocessing
+import concurrent.futures
+from datetime import datetime
+from typing import Optional
+from core.models import ROLE_DISPLAY_NAMES
+
+
+CALL_LOG_COLUMNS = ['call_datetime', 'call_date', 'phone_number', 'phone_digits', 'duration_minutes']
+
+CALL_LOG_HEADER_MARKER = "Date (Pacific)"
+CALL_LOG_CHUNK_SIZE = 5000
+CALL_LOG_IMPORT_POLL_SECONDS = 0.1
+# Parsed chunks waiting to be stored; workers block once this many are queued.
+CALL_LOG_IMPORT_QUEUE_CHUNKS = 8
+
+NON_DIGITS = re.compile(r'\D')
+PHONE_EXTENSION = re.compile(r'\s*(?:ext\.?|extension|x|#|,+)\s*\d+\s*$', re.IGNORECASE)
+
+
+def normalize_phone(phone) -> str:
+    if not phone:
+        return ""
+    return NON_DIGITS.sub('', str(phone))
+
+
+def phone_key(phone) -> str:
+    # Canonical number: extension dropped, then the last 10 digits so +1 and 1- prefixes match.
+    if not phone:
+        return ""
+    return normalize_phone(PHONE_EXTENSION.sub('', str(phone)))[-10:]
+
+
+def split_phones(phone) -> list:
+    if not phone:
+        return []
+    return [part.strip() for part in str(phone).split(';') if part.strip()]
+
+
+def call_record_key(record: dict) -> str:
+    return f"{record['call_datetime']}|{record['phone_number']}|{record['duration_minutes']}"
+
+
+def _is_call_row(row: list) -> bool:
+    return len(row) >= 4 and bool(row[0].strip()) and '/' in row[0]
+
+
+def _parse_unique(values, parse) -> dict:
+    parsed = {}
+    for value in set(values):
+        try:
+            parsed[value] = parse(value)
+        except ValueError:
+            parsed[value] = None
+    return parsed
+
+
+def normalize_call_rows(rows: list) -> list:
+    # Exports repeat the same days, times and numbers, so each distinct value is parsed once per batch.
+    stamps = [row[0].strip().split(None, 1) for row in rows]
+    days = _parse_unique((stamp[0] for stamp in stamps),
+                         lambda value: datetime.strptime(value, "%m/%d/%Y").strftime("%Y-%m-%d"))
+    times = _parse_unique((stamp[1] for stamp in stamps if len(stamp) == 2),
+                          lambda value: datetime.strptime(value, "%I:%M %p").strftime("%H:%M:%S"))
+    phones = {phone: normalize_phone(phone) for phone in {row[1].strip() for row in rows}}
+
+    records = []
+    for row, stamp in zip(rows, stamps):
+        if len(stamp) != 2:
+            continue
+        call_date, call_time = days[stamp[0]], times[stamp[1]]
+        if call_date is None or call_time is None:
+            continue
+        try:
+            duration = int(row[3].strip().replace(" Min", "").replace(" min", ""))
+        except ValueError:
+            continue
+        phone = row[1].strip()
+        records.append({
+            'call_datetime': f"{call_date} {call_time}",
+            'call_date': call_date,
+            'phone_number': phone,
+            'phone_digits': phones[phone],
+            'duration_minutes': duration
+        })
+    return records
+
+
+def _is_header_row(row: list) -> bool:
+    return bool(row) and row[0].strip() == CALL_LOG_HEADER_MARKER
+
+
+def iter_call_log_chunks(file_path: str, chunk_size: int = CALL_LOG_CHUNK_SIZE):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        # Rows above the header are only used when a file has no header at all, so look for one
+        # first; exports put it near the top, and headerless files are then chunked from row one.
+        has_header = any(_is_header_row(row) for row in csv.reader(f))
+        f.seek(0)
+        reader = csv.reader(f)
+        if has_header:
+            for row in reader:
+                if _is_header_row(row):
+                    break
+        rows = []
+        for row in reader:
+            if _is_call_row(row):
+                rows.append(row)
+                if len(rows) >= chunk_size:
+                    yield normalize_call_rows(rows)
+                    rows = []
+        if rows:
+            yield normalize_call_rows(rows)
+
+
+def parse_call_log_csv(file_path: str) -> list:
+    return [record for chunk in iter_call_log_chunks(file_path) for record in chunk]
+
+
+def stream_call_log_csv(file_path: str, index: int, chunks, cancelled) -> int:
+    # Runs in a worker process; the parent stores each chunk as it arrives instead of a whole file.
+    count = 0
+    for chunk in iter_call_log_chunks(file_path):
+        while True:
+            if cancelled.is_set():
+                return count
+            try:
+                chunks.put((index, chunk), timeout=CALL_LOG_IMPORT_POLL_SECONDS)
+                break
+            except queue.Full:
+                pass
+        count += len(chunk)
+    return count
+
+
+def import_call_logs(file_paths: list, existing_keys: set = None) -> tuple:
+    existing_keys = set() if existing_keys is None else existing_keys
+    new_records = []
+    duplicates = 0
+    failed_files = []
+    for file_path in file_paths:
+        try:
+            for chunk in iter_call_log_chunks(file_path):
+                for record in chunk:
+                    key = call_record_key(record)
+                    if key in existing_keys:
+                        duplicates += 1
+                    else:
+                        existing_keys.add(key)
+                        new_records.append(record)
+        except Exception as e:
+            failed_files.append(f"{os.path.basename(file_path)}: {str(e)}")
+    return new_records, duplicates, failed_files
+
+
+class CallLogImportRun:
+    def __init__(self, file_paths: list, call_log_queries, max_workers: Optional[int] = None):
+        self.file_paths = file_paths
+        self.call_log_queries = call_log_queries
+        self.manager = multiprocessing.Manager()
+        self.chunks = self.manager.Queue(CALL_LOG_IMPORT_QUEUE_CHUNKS)
+        self.cancel_event = self.manager.Event()
+        self.executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers or max(1, min(len(file_paths), os.cpu_count() or 1))
+        )
+        self.futures = [
+            self.executor.submit(stream_call_log_csv, path, index, self.chunks, self.cancel_event)
+            for index, path in enumerate(file_paths)
+        ]
+        self.cancelled = False
+        self.loaded = 0
+        self.duplicates = 0
+        self.stored = 0
+        self.failed_files = []
+        self._thread = threading.Thread(target=self.store, name="call-log-import", daemon=True)
+        self._thread.start()
+
+    def store(self):
+        try:
+            self._store()
+        finally:
+            # import_records opened a connection for this thread; RemoteDatabase has none to close.
+            close_thread_connection = getattr(self.call_log_queries.db, "close_thread_connection", None)
+            if close_thread_connection is not None:
+                close_thread_connection()
+
+    def _store(self):
+        pending = dict(enumerate(self.futures))
+        failed = set()
+        while pending and not self.cancelled:
+            try:
+                index, records = self.chunks.get(timeout=CALL_LOG_IMPORT_POLL_SECONDS)
+            except queue.Empty:
+                # A worker finishes only after queueing its last chunk, so a file that was done
+                # before the queue was seen empty has had every chunk stored.
+                done = [index for index, future in pending.items() if future.done()]
+                if self.chunks.empty():
+                    for index in done:
+                        self.finish_file(index, pending.pop(index), failed)
+                continue
+            if index in failed:
+                continue
+            try:
+                loaded = self.call_log_queries.import_records(records)
+            except Exception as e:
+                failed.add(index)
+                self.failed_files.append(f"{os.path.basename(self.file_paths[index])}: {str(e)}")
+            else:
+                self.loaded += loaded
+                self.duplicates += len(records) - loaded
+
+    def finish_file(self, index: int, future, failed: set):
+        if self.cancelled or future.cancelled():
+            return
+        if index not in failed:
+            try:
+                future.result()
+            except Exception as e:
+                self.failed_files.append(f"{os.path.basename(self.file_paths[index])}: {str(e)}")
+        self.stored += 1
+
+    def completed_count(self) -> int:
+        return self.stored
+
+    def is_done(self) -> bool:
+        return not self._thread.is_alive()
+
+    def cancel(self):
+        self.cancelled = True
+        self.cancel_event.set()
+        for future in self.futures:
+            future.cancel()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+    def close(self):
+        # Running workers stop at their next chunk once cancelled; they must be gone before the
+        # manager that owns their queue goes away.
+        self._thread.join()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.manager.shutdown()
+
+    def results(self) -> tuple:
+        self.close()
+        return self.loaded, self.duplicates, self.failed_files
+
+
+def build_phone_directory(contacts: list) -> dict:
+    phone_to_name = {}
+    for contact in contacts:
+        keys = [key for key in map(phone_key, split_phones(contact.get('phone'))) if key]
+        if not keys:
+            continue
+        first_name = contact.get('first_name') or ''
+        last_name = contact.get('last_name') or ''
+        full_name = f"{first_name} {last_name}".strip()
+
+        roles = contact.get('roles')
+        if roles:
+            role_list = roles.split(',')
+            role_display = ROLE_DISPLAY_NAMES.get(role_list[0].strip(), '')
+            if role_display:
+                full_name = f"{full_name} ({role_display})"
+
+        for key in keys:
+            phone_to_name[key] = full_name
+    return phone_to_name
+
+
+def lookup_contact_name(phone_to_name: dict, phone) -> str:
+    return phone_to_name.get(phone_key(phone), "") if phone else ""
+
+
+def format_call_datetime(call_datetime) -> str:
+    try:
+        dt = datetime.strptime(call_datetime, "%Y-%m-%d %H:%M:%S")
+        return dt.strftime("%m/%d/%Y %I:%M %p")
+    except (ValueError, TypeError):
+        return str(call_datetime)
@@ -1,21 +1,153 @@
+import random
 import sqlite3
+import threading
+import time
+from pathlib import Path
+from core.instrumentation import normalize_sql
+from core.tracing import tracer
+from core.writer import DatabaseWriter, WriteFuture, WriteResult
+
+
+VERSIONED_TABLES = ("people", "cases", "case_people", "billing_entries", "payments")
+# Changes that can alter a call-log contact name; everything else leaves contacts_version alone.
+CONTACT_TRIGGERS = {
+    "people": ("INSERT", "DELETE", "UPDATE OF phone, first_name, last_name"),
+    "case_people": ("INSERT", "DELETE", "UPDATE OF person_id, role"),
+}
+
+DEFAULT_BUSY_TIMEOUT = 5.0
+DEFAULT_BUSY_RETRIES = 5
+BUSY_BACKOFF_BASE = 0.05
+BUSY_BACKOFF_MAX = 2.0
+JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+
+
+def is_busy_error(error: sqlite3.Error) -> bool:
+    code = getattr(error, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xFF in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
+class LockWaitStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.busy_errors = 0
+        self.retried_operations = 0
+        self.failed_operations = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, waited: float, busy_errors: int, failed: bool):
+        with self._lock:
+            self.busy_errors += busy_errors
+            self.retried_operations += 1
+            if failed:
+                self.failed_operations += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "busy_errors": self.busy_errors,
+                "retried_operations": self.retried_operations,
+                "failed_operations": self.failed_operations,
+                "total_wait_seconds": round(self.total_wait, 4),
+                "max_wait_seconds": round(self.max_wait, 4),
+            }
 
 
 class Database:
-    def __init__(self, db_path="law_billing.db"):
+    def __init__(self, db_path="law_billing.db", busy_timeout: float = DEFAULT_BUSY_TIMEOUT,
+                 busy_retries: int = DEFAULT_BUSY_RETRIES, instrument=None, journal_mode: str = None,
+                 read_only: bool = False):
+        # None keeps the file's current journal mode; WAL does not work on network shares.
+        if journal_mode is not None and journal_mode.upper() not in JOURNAL_MODES:
+            raise ValueError(f"Unknown journal mode: {journal_mode}")
         self.db_path = db_path
-        self.connection = None
+        self.journal_mode = journal_mode and journal_mode.upper()
+        # Read-only opens leave the file untouched: no schema setup, migrations or journal change.
+        self.read_only = read_only
+        self.busy_timeout = busy_timeout
+        self.busy_retries = busy_retries
+        self.instrument = instrument
+        self.lock_stats = LockWaitStats()
+        self.writer = None
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
         self.connect()
-        self.create_tables()
+        if not read_only:
+            self.with_retry(self.create_tables)
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self.connect()
+        return connection
+
+    def connect(self) -> sqlite3.Connection:
+        if self.read_only:
+            connection = sqlite3.connect(f"{Path(self.db_path).resolve().as_uri()}?mode=ro", uri=True,
+                                         timeout=self.busy_timeout, check_same_thread=False)
+        else:
+            connection = sqlite3.connect(self.db_path, timeout=self.busy_timeout, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA foreign_keys = ON")
+        if self.journal_mode and not self.read_only:
+            self.with_retry(connection.execute, f"PRAGMA journal_mode = {self.journal_mode}")
+        self._local.connection = connection
+        with self._connections_lock:
+            self._connections.append(connection)
+        return connection
 
-    def connect(self):
-        self.connection = sqlite3.connect(self.db_path)
-        self.connection.row_factory = sqlite3.Row
-        self.connection.execute("PRAGMA foreign_keys = ON")
+    def with_retry(self, operation, *args):
+        started = time.monotonic()
+        busy_errors = 0
+        while True:
+            try:
+                result = operation(*args)
+            except sqlite3.OperationalError as e:
+                if not is_busy_error(e):
+                    raise
+                busy_errors += 1
+                connection = getattr(self._local, "connection", None)
+                if connection is not None and connection.in_transaction:
+                    connection.rollback()
+                if busy_errors > self.busy_retries:
+                    self.lock_stats.record(time.monotonic() - started, busy_errors, failed=True)
+                    raise
+                time.sleep(random.uniform(0, min(BUSY_BACKOFF_MAX, BUSY_BACKOFF_BASE * 2 ** busy_errors)))
+            else:
+                if busy_errors:
+                    self.lock_stats.record(time.monotonic() - started, busy_errors, failed=False)
+                return result
+
+    def start_writer(self, **options) -> DatabaseWriter:
+        if self.writer is None:
+            self.writer = DatabaseWriter(self, **options)
+        return self.writer
+
+    def close_thread_connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            self._local.connection = None
+            with self._connections_lock:
+                self._connections.remove(connection)
+            connection.close()
 
     def close(self):
-        if self.connection:
-            self.connection.close()
+        if self.writer:
+            self.writer.close()
+            self.writer = None
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
 
     def create_tables(self):
         cursor = self.connection.cursor()
@@ -129,24 +261,231 @@ class Database:
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_billing_case ON billing_entries(case_id)
         """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_billing_case_date ON billing_entries(case_id, entry_date)
+        """)
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_payments_person ON payments(person_id)
         """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_people_name ON people(last_name, first_name)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_cases_created ON cases(created_at)
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS call_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                call_datetime TEXT NOT NULL,
+                phone_number TEXT NOT NULL,
+                phone_digits TEXT NOT NULL,
+                phone_key TEXT NOT NULL,
+                duration_minutes INTEGER NOT NULL,
+                contact_name TEXT NOT NULL DEFAULT '',
+                imported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS call_log_contacts (
+                phone_key TEXT PRIMARY KEY,
+                name TEXT NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_call_log_key ON call_log(call_datetime, phone_digits, duration_minutes)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_call_log_phone ON call_log(phone_key, call_datetime)
+        """)
+        # Serves the "phone" sort keyset; id is the rowid, so the index already ends with it.
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_call_log_phone_sort ON call_log(phone_digits, call_datetime)
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS db_meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        """)
+        cursor.execute("INSERT OR IGNORE INTO db_meta (key, value) VALUES ('data_version', 0)")
+        for table in VERSIONED_TABLES:
+            for operation in ("INSERT", "UPDATE", "DELETE"):
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS bump_data_version_{table}_{operation.lower()}
+                    AFTER {operation} ON {table}
+                    BEGIN
+                        UPDATE db_meta SET value = value + 1 WHERE key = 'data_version';
+                    END
+                """)
+        cursor.execute("INSERT OR IGNORE INTO db_meta (key, value) VALUES ('contacts_version', 0)")
+        for table, operations in CONTACT_TRIGGERS.items():
+            for operation in operations:
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS bump_contacts_version_{table}_{operation.split()[0].lower()}
+                    AFTER {operation} ON {table}
+                    BEGIN
+                        UPDATE db_meta SET value = value + 1 WHERE key = 'contacts_version';
+                    END
+                """)
+
+        call_log_columns = {row[1] for row in cursor.execute("PRAGMA table_info(call_log)")}
+        if "contact_name" not in call_log_columns:
+            cursor.execute("ALTER TABLE call_log ADD COLUMN contact_name TEXT NOT NULL DEFAULT ''")
+            cursor.execute("DELETE FROM db_meta WHERE key = 'call_log_contacts_version'")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_call_log_contact ON call_log(contact_name, call_datetime)
+        """)
 
         self.connection.commit()
 
+    def submit(self, query, params=None) -> WriteFuture:
+        if self.writer is not None and not self.writer.is_writer_thread():
+            return self.writer.submit(query, params)
+        future = WriteFuture()
+        try:
+            cursor = self._execute(query, params)
+        except sqlite3.Error as e:
+            future.set_exception(e)
+        else:
+            result = WriteResult(cursor.lastrowid, cursor.rowcount)
+            future.set_executed(result)
+            future.set_result(result)
+        return future
+
     def execute(self, query, params=None):
-        cursor = self.connection.cursor()
-        cursor.execute(query, params or ())
-        self.connection.commit()
+        if self.writer is not None:
+            return self.submit(query, params).result()
+        return self._execute(query, params)
+
+    def executemany(self, query, params_seq):
+        params_seq = list(params_seq)
+        if self.writer is not None and not self.writer.is_writer_thread():
+            return self.writer.submit(query, params_seq, many=True).result()
+
+        def run():
+            cursor = self.connection.executemany(query, params_seq)
+            self.connection.commit()
+            return cursor
+        started = self.begin_statement(query)
+        try:
+            cursor = self.with_retry(run)
+        finally:
+            self.end_statement()
+        self.record_statement(query, started, max(cursor.rowcount, 0))
+        return WriteResult(cursor.lastrowid, cursor.rowcount)
+
+    def execute_all(self, statements: list) -> WriteResult:
+        # Runs (query, params, many) statements as one transaction: one writer command, one commit.
+        # The result is the last statement's, with every statement's result in .results.
+        statements = [(query, list(params) if many else params, many) for query, params, many in statements]
+        if self.writer is not None and not self.writer.is_writer_thread():
+            return self.writer.submit_all(statements).result()
+
+        def run():
+            self.connection.execute("BEGIN IMMEDIATE")
+            results = []
+            try:
+                for query, params, many in statements:
+                    cursor = self.connection.cursor()
+                    started = self.begin_statement(query)
+                    try:
+                        if many:
+                            cursor.executemany(query, params)
+                        else:
+                            cursor.execute(query, params or ())
+                    finally:
+                        self.end_statement()
+                    self.record_statement(query, started, max(cursor.rowcount, 0))
+                    results.append(WriteResult(cursor.lastrowid, cursor.rowcount))
+            except BaseException:
+                self.connection.rollback()
+                raise
+            self.connection.commit()
+            return results
+        results = self.with_retry(run)
+        return WriteResult(results[-1].lastrowid, results[-1].rowcount, results)
+
+    def _execute(self, query, params=None):
+        def run():
+            cursor = self.connection.cursor()
+            cursor.execute(query, params or ())
+            self.connection.commit()
+            return cursor
+        started = self.begin_statement(query)
+        try:
+            cursor = self.with_retry(run)
+        finally:
+            self.end_statement()
+        self.record_statement(query, started, max(cursor.rowcount, 0))
         return cursor
 
+    def begin_statement(self, query) -> float:
+        if self.instrument is not None:
+            self.instrument.begin_statement(query)
+        return time.perf_counter()
+
+    def end_statement(self):
+        if self.instrument is not None:
+            self.instrument.end_statement()
+
+    def record_statement(self, query, started: float, rows: int):
+        ended = time.perf_counter()
+        if self.instrument is not None:
+            self.instrument.record(query, ended - started, rows)
+        if tracer.enabled:
+            self.trace_statement(query, started, ended, rows)
+
+    def trace_statement(self, query, started: float, ended: float, rows: int):
+        sql = normalize_sql(query)
+        tracer.complete(sql[:80], "db", started, ended, {"sql": sql, "rows": rows})
+
     def fetchall(self, query, params=None):
-        cursor = self.connection.cursor()
-        cursor.execute(query, params or ())
-        return cursor.fetchall()
+        started = self.begin_statement(query)
+        try:
+            rows = self.with_retry(lambda: self.connection.execute(query, params or ()).fetchall())
+        finally:
+            self.end_statement()
+        self.record_statement(query, started, len(rows))
+        return rows
 
     def fetchone(self, query, params=None):
+        started = self.begin_statement(query)
+        try:
+            row = self.with_retry(lambda: self.connection.execute(query, params or ()).fetchone())
+        finally:
+            self.end_statement()
+        self.record_statement(query, started, 0 if row is None else 1)
+        return row
+
+    def get_data_version(self) -> int:
+        row = self.fetchone("SELECT value FROM db_meta WHERE key = 'data_version'")
+        return row[0] if row else 0
+
+    def get_contacts_version(self) -> int:
+        row = self.fetchone("SELECT value FROM db_meta WHERE key = 'contacts_version'")
+        return row[0] if row else 0
+
+    def iterate(self, query, params=None, batch_size=500):
         cursor = self.connection.cursor()
-        cursor.execute(query, params or ())
-        return cursor.fetchone()
\ No newline at end of file
+        opened = started = self.begin_statement(query)
+        elapsed = 0.0
+        count = 0
+        try:
+            self.with_retry(cursor.execute, query, params or ())
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                elapsed += time.perf_counter() - started
+                if not rows:
+                    break
+                count += len(rows)
+                yield from rows
+                started = time.perf_counter()
+        finally:
+            cursor.close()
+            self.end_statement()
+            if self.instrument is not None:
+                self.instrument.record(query, elapsed, count)
+            if tracer.enabled:
+                self.trace_statement(query, opened, time.perf_counter(), count)
@@ -0,0 +1,60 @@
+import os
+import sqlite3
+import sys
+
+from core.lazy_import import is_available, lazy_import
+
+HAS_PSUTIL = is_available("psutil")
+psutil = lazy_import("psutil")
+
+
+def file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def load_database_stats(queries) -> dict:
+    db = queries.db
+    page_size = db.fetchone("PRAGMA page_size")[0]
+    stats = {
+        "page_size": page_size,
+        "page_count": db.fetchone("PRAGMA page_count")[0],
+        "freelist_count": db.fetchone("PRAGMA freelist_count")[0],
+        "cache_size": db.fetchone("PRAGMA cache_size")[0],
+        "file_bytes": file_size(db.db_path),
+        "wal_bytes": file_size(f"{db.db_path}-wal"),
+    }
+    try:
+        rows = db.fetchall("""
+            SELECT s.name, COALESCE(m.type, 'table') AS type, SUM(s.pgsize) AS bytes, COUNT(*) AS pages
+            FROM dbstat s LEFT JOIN sqlite_master m ON m.name = s.name
+            GROUP BY s.name ORDER BY bytes DESC
+        """)
+        stats["objects"] = [dict(row) for row in rows]
+    except sqlite3.OperationalError:
+        rows = db.fetchall("SELECT name, type FROM sqlite_master WHERE type IN ('table', 'index') ORDER BY name")
+        stats["objects"] = [{"name": row["name"], "type": row["type"], "bytes": None, "pages": None} for row in rows]
+    return stats
+
+
+def process_memory() -> dict:
+    if HAS_PSUTIL:
+        info = psutil.Process().memory_info()
+        return {"rss_bytes": info.rss, "peak_bytes": getattr(info, "peak_wset", None)}
+    try:
+        import resource
+    except ImportError:
+        return {"rss_bytes": None, "peak_bytes": None}
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"rss_bytes": None, "peak_bytes": peak if sys.platform == "darwin" else peak * 1024}
+
+
+def format_bytes(size) -> str:
+    if size is None:
+        return "--"
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024.0
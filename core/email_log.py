@@ -0,0 +1,106 @@
+import os
+import re
+from datetime import datetime
+from core.lazy_import import lazy_import, lazy_attribute
+
+policy = lazy_import("email.policy")
+BytesParser = lazy_attribute("email.parser", "BytesParser")
+
+
+EMAIL_LOG_COLUMNS = [
+    'email_datetime', 'email_date', 'sender', 'recipients', 'cc', 'subject', 'attachments', 'file_path'
+]
+
+
+def normalize_email(email) -> str:
+    if not email:
+        return ""
+    return re.sub(r'[^a-zA-Z0-9@.;]', '', email.lower())
+
+
+def extract_email_addresses(text) -> str:
+    if not text:
+        return ""
+    all_emails = re.findall(r'[\w\.-]+@[\w\.-]+\.\w+', str(text), re.IGNORECASE)
+    seen = set()
+    unique_emails = []
+    for email in all_emails:
+        lower = email.lower()
+        if lower not in seen:
+            seen.add(lower)
+            unique_emails.append(lower)
+    return "; ".join(unique_emails)
+
+
+def parse_email_date(date_str) -> tuple:
+    if not date_str:
+        return "", ""
+    date_formats = [
+        "%a, %d %b %Y %H:%M:%S %z",
+        "%a, %d %b %Y %H:%M:%S %Z",
+        "%d %b %Y %H:%M:%S %z",
+        "%a, %d %b %Y %H:%M:%S",
+        "%d %b %Y %H:%M:%S",
+    ]
+    clean_date = re.sub(r'\s+\([^)]+\)', '', str(date_str)).strip()
+    for fmt in date_formats:
+        try:
+            dt = datetime.strptime(clean_date, fmt)
+            return dt.strftime("%Y-%m-%d %H:%M:%S"), dt.strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return str(date_str), str(date_str)[:10] if len(str(date_str)) >= 10 else str(date_str)
+
+
+def read_email_message(file_path: str):
+    with open(file_path, 'rb') as f:
+        return BytesParser(policy=policy.default).parse(f)
+
+
+def get_attachment_names(msg) -> list:
+    attachments = []
+    for part in msg.walk():
+        if part.get_content_disposition() == 'attachment':
+            filename = part.get_filename()
+            if filename:
+                attachments.append(filename)
+    return attachments
+
+
+def parse_eml_file(file_path: str) -> dict:
+    msg = read_email_message(file_path)
+    email_datetime, email_date = parse_email_date(msg.get('Date', ''))
+    return {
+        'file_path': os.path.abspath(file_path),
+        'email_datetime': email_datetime,
+        'email_date': email_date,
+        'sender': extract_email_addresses(msg.get('From', '')),
+        'recipients': extract_email_addresses(msg.get('To', '')),
+        'cc': extract_email_addresses(msg.get('Cc', '')),
+        'subject': msg.get('Subject', '') or '',
+        'attachments': "; ".join(get_attachment_names(msg))
+    }
+
+
+def email_record_key(record: dict) -> str:
+    return f"{record['email_datetime']}|{record['sender']}|{record['subject']}"
+
+
+def import_eml_files(file_paths: list, existing_keys: set = None) -> tuple:
+    existing_keys = set() if existing_keys is None else existing_keys
+    new_records = []
+    duplicates = 0
+    failed_files = []
+    for file_path in file_paths:
+        try:
+            record = parse_eml_file(file_path)
+            if record:
+                key = email_record_key(record)
+                if key in existing_keys:
+                    duplicates += 1
+                else:
+                    existing_keys.add(key)
+                    new_records.append(record)
+        except Exception as e:
+            failed_files.append(f"{os.path.basename(file_path)}: {str(e)}")
+    return new_records, duplicates, failed_files
@@ -0,0 +1,75 @@
+import os
+import re
+import sys
+import subprocess
+from typing import List
+
+from core.utils import get_app_path
+
+
+DEFAULT_PROFILE_MODULES = ["gui.main_window"]
+
+DEFERRED_MODULES = ["docx", "email.parser"]
+
+IMPORT_TIME_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def profile_import(module_name: str) -> List[dict]:
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        capture_output=True, text=True, cwd=get_app_path(), env=env
+    )
+    if result.returncode != 0:
+        message = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed"
+        raise ImportError(f"{module_name}: {message}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append({
+                'module': name,
+                'self_ms': int(self_us) / 1000.0,
+                'cumulative_ms': int(cumulative_us) / 1000.0,
+                'depth': len(indent) // 2,
+            })
+    return entries
+
+
+def top_level_costs(entries: List[dict]) -> List[dict]:
+    costs = {}
+    for entry in entries:
+        package = entry['module'].split(".")[0]
+        costs[package] = costs.get(package, 0.0) + entry['self_ms']
+    return sorted(
+        ({'package': package, 'self_ms': total} for package, total in costs.items()),
+        key=lambda row: row['self_ms'], reverse=True
+    )
+
+
+def format_import_report(module_name: str, entries: List[dict], limit: int = 25) -> str:
+    total_ms = sum(entry['self_ms'] for entry in entries)
+    lines = [f"import {module_name}: {total_ms:.1f} ms total, {len(entries)} modules", ""]
+
+    lines.append(f"{'Cumulative ms':>14}  {'Self ms':>9}  Module")
+    for entry in sorted(entries, key=lambda e: e['cumulative_ms'], reverse=True)[:limit]:
+        lines.append(f"{entry['cumulative_ms']:14.1f}  {entry['self_ms']:9.1f}  {entry['module']}")
+
+    lines.append("")
+    lines.append(f"{'Self ms':>14}  Package")
+    for row in top_level_costs(entries)[:limit]:
+        lines.append(f"{row['self_ms']:14.1f}  {row['package']}")
+    return "\n".join(lines)
+
+
+def format_deferred_report(module_names: List[str] = None) -> str:
+    lines = [f"{'Cost ms':>14}  Deferred module (loaded on first use)"]
+    for module_name in module_names or DEFERRED_MODULES:
+        try:
+            total_ms = sum(entry['self_ms'] for entry in profile_import(module_name))
+            lines.append(f"{total_ms:14.1f}  {module_name}")
+        except ImportError:
+            lines.append(f"{'--':>14}  {module_name} (not installed)")
+    return "\n".join(lines)
@@ -0,0 +1,245 @@
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_right
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional
+
+
+DEFAULT_SLOW_QUERY_MS = 100.0
+DEFAULT_N_PLUS_ONE_THRESHOLD = 20
+SLOW_LOG_MAX_BYTES = 1024 * 1024
+SLOW_LOG_BACKUP_COUNT = 3
+RECENT_ACTION_LIMIT = 50
+LATENCY_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000)
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r"(?<![\w.])\d+(?:\.\d+)?\b")
+PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def normalize_sql(query: str) -> str:
+    shape = STRING_LITERAL.sub("?", query)
+    shape = NUMBER_LITERAL.sub("?", shape)
+    shape = PLACEHOLDER_LIST.sub("(?, ...)", shape)
+    return WHITESPACE.sub(" ", shape).strip()
+
+
+def get_slow_query_log_path(app_path: str) -> str:
+    return os.path.join(app_path, "slow_queries.log")
+
+
+class HitCounter:
+    def __init__(self, name: str):
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self):
+        self.hits += 1
+
+    def miss(self):
+        self.misses += 1
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+
+cache_counters: Dict[str, HitCounter] = {}
+
+
+def cache_counter(name: str) -> HitCounter:
+    counter = cache_counters.get(name)
+    if counter is None:
+        counter = cache_counters[name] = HitCounter(name)
+    return counter
+
+
+def latency_bucket_labels() -> List[str]:
+    labels = [f"< {LATENCY_BUCKETS_MS[0]} ms"]
+    labels += [f"{low}-{high} ms" for low, high in zip(LATENCY_BUCKETS_MS, LATENCY_BUCKETS_MS[1:])]
+    return labels + [f">= {LATENCY_BUCKETS_MS[-1]} ms"]
+
+
+class StatementStats:
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.count = 0
+        self.rows = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def record(self, elapsed: float, rows: int):
+        self.count += 1
+        self.rows += rows
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+
+    def as_dict(self) -> dict:
+        return {
+            "sql": self.sql,
+            "count": self.count,
+            "rows": self.rows,
+            "total_ms": round(self.total_time * 1000.0, 3),
+            "max_ms": round(self.max_time * 1000.0, 3),
+        }
+
+
+class QueryAction:
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = time.time()
+        self.ended_at = None
+        self.statements: Dict[str, StatementStats] = {}
+        self.n_plus_one: List[str] = []
+
+    @property
+    def statement_count(self) -> int:
+        return sum(stats.count for stats in self.statements.values())
+
+    @property
+    def total_time(self) -> float:
+        return sum(stats.total_time for stats in self.statements.values())
+
+    def record(self, sql: str, elapsed: float, rows: int) -> StatementStats:
+        stats = self.statements.get(sql)
+        if stats is None:
+            stats = self.statements[sql] = StatementStats(sql)
+        stats.record(elapsed, rows)
+        return stats
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "started_at": self.started_at,
+            "ended_at": self.ended_at,
+            "statements": self.statement_count,
+            "total_ms": round(self.total_time * 1000.0, 3),
+            "n_plus_one": list(self.n_plus_one),
+            "by_statement": sorted((stats.as_dict() for stats in self.statements.values()),
+                                   key=lambda stats: stats["total_ms"], reverse=True),
+        }
+
+
+class QueryInstrument:
+    def __init__(self, slow_query_ms: float = DEFAULT_SLOW_QUERY_MS,
+                 n_plus_one_threshold: int = DEFAULT_N_PLUS_ONE_THRESHOLD,
+                 slow_log_path: Optional[str] = None):
+        self.slow_query_ms = slow_query_ms
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.slow_log_path = slow_log_path
+        self.current: Optional[QueryAction] = None
+        self.recent = deque(maxlen=RECENT_ACTION_LIMIT)
+        self.totals: Dict[str, StatementStats] = {}
+        self.slow_queries = 0
+        self.latency_counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.running: Dict[int, List[tuple]] = {}
+        self._lock = threading.Lock()
+        self._handler = None
+        self.logger = logging.Logger("law_billing.queries")
+        if slow_log_path:
+            self._handler = RotatingFileHandler(slow_log_path, maxBytes=SLOW_LOG_MAX_BYTES,
+                                                backupCount=SLOW_LOG_BACKUP_COUNT, encoding="utf-8", delay=True)
+            self._handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+            self.logger.addHandler(self._handler)
+
+    def begin_action(self, name: str) -> QueryAction:
+        action = QueryAction(name)
+        with self._lock:
+            self._finish_current()
+            self.current = action
+        return action
+
+    def end_action(self):
+        with self._lock:
+            self._finish_current()
+
+    def _finish_current(self):
+        if self.current is not None:
+            self.current.ended_at = time.time()
+            self.recent.append(self.current)
+            self.current = None
+
+    @contextmanager
+    def action(self, name: str):
+        action = self.begin_action(name)
+        try:
+            yield action
+        finally:
+            with self._lock:
+                if self.current is action:
+                    self._finish_current()
+
+    def begin_statement(self, query: str):
+        self.running.setdefault(threading.get_ident(), []).append((query, time.time()))
+
+    def end_statement(self):
+        statements = self.running.get(threading.get_ident())
+        if statements:
+            statements.pop()
+
+    def running_statements(self, thread_id: int) -> List[tuple]:
+        return list(self.running.get(thread_id, ()))
+
+    def record(self, query: str, elapsed: float, rows: int = 0):
+        sql = normalize_sql(query)
+        flagged = None
+        with self._lock:
+            totals = self.totals.get(sql)
+            if totals is None:
+                totals = self.totals[sql] = StatementStats(sql)
+            totals.record(elapsed, rows)
+            action = self.current
+            if action is not None:
+                stats = action.record(sql, elapsed, rows)
+                if stats.count == self.n_plus_one_threshold + 1:
+                    action.n_plus_one.append(sql)
+                    flagged = action.name
+            elapsed_ms = elapsed * 1000.0
+            self.latency_counts[bisect_right(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+            slow = elapsed_ms >= self.slow_query_ms
+            if slow:
+                self.slow_queries += 1
+
+        if flagged is not None:
+            self.logger.warning("N+1 in %r: statement ran more than %d times: %s",
+                                flagged, self.n_plus_one_threshold, sql)
+        if slow:
+            self.logger.warning("%.1f ms, %d rows%s: %s", elapsed * 1000.0, rows,
+                                f" in {action.name!r}" if action is not None else "", sql)
+
+    def actions(self) -> List[QueryAction]:
+        with self._lock:
+            return list(self.recent) + ([self.current] if self.current is not None else [])
+
+    def latency_histogram(self) -> List[tuple]:
+        with self._lock:
+            return list(zip(latency_bucket_labels(), self.latency_counts))
+
+    def top_statements(self, limit: int = 20) -> List[dict]:
+        with self._lock:
+            stats = [stats.as_dict() for stats in self.totals.values()]
+        return sorted(stats, key=lambda s: s["total_ms"], reverse=True)[:limit]
+
+    def reset(self):
+        with self._lock:
+            self.current = None
+            self.recent.clear()
+            self.totals.clear()
+            self.slow_queries = 0
+            self.latency_counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def close(self):
+        if self._handler is not None:
+            self.logger.removeHandler(self._handler)
+            self._handler.close()
+            self._handler = None
@@ -0,0 +1,574 @@
+import os
+import re
+import copy
+import calendar
+import concurrent.futures
+from datetime import date
+from typing import List, Optional
+from core.lazy_import import is_available, lazy_attribute
+from core.instrumentation import cache_counter
+from core.tracing import tracer
+
+HAS_DOCX = is_available("docx")
+
+Document = lazy_attribute("docx", "Document")
+Inches = lazy_attribute("docx.shared", "Inches")
+Pt = lazy_attribute("docx.shared", "Pt")
+WD_ALIGN_PARAGRAPH = lazy_attribute("docx.enum.text", "WD_ALIGN_PARAGRAPH")
+WD_TABLE_ALIGNMENT = lazy_attribute("docx.enum.table", "WD_TABLE_ALIGNMENT")
+WD_CELL_VERTICAL_ALIGNMENT = lazy_attribute("docx.enum.table", "WD_CELL_VERTICAL_ALIGNMENT")
+qn = lazy_attribute("docx.oxml.ns", "qn")
+nsdecls = lazy_attribute("docx.oxml.ns", "nsdecls")
+OxmlElement = lazy_attribute("docx.oxml", "OxmlElement")
+parse_xml = lazy_attribute("docx.oxml", "parse_xml")
+
+
+BOLD_LABELS = {
+    "FEE TRUST ACCOUNT", "EXPENSE TRUST ACCOUNT", "Fee Trust Balance:",
+    "Expense Trust Balance:", "Combined Trust Balance:",
+    "Fee Replenishment Required:", "Expense Replenishment Required:"
+}
+
+BATCH_FILTERS = {
+    "open": "Open Matters",
+    "activity": "Matters with Activity in Period",
+    "open_activity": "Open Matters with Activity in Period",
+}
+
+
+def set_cell_border(cell):
+    tc = cell._tc
+    tcPr = tc.get_or_add_tcPr()
+    tcBorders = OxmlElement('w:tcBorders')
+    for border_name in ['top', 'left', 'bottom', 'right']:
+        border = OxmlElement(f'w:{border_name}')
+        border.set(qn('w:val'), 'nil')
+        tcBorders.append(border)
+    tcPr.append(tcBorders)
+
+
+def set_no_paragraph_spacing(doc):
+    style = doc.styles['Normal']
+    style.paragraph_format.space_before = Pt(0)
+    style.paragraph_format.space_after = Pt(0)
+
+
+def add_paragraph_no_spacing(doc, text="", alignment=None, bold=False, font_size=None):
+    para = doc.add_paragraph()
+    para.paragraph_format.space_before = Pt(0)
+    para.paragraph_format.space_after = Pt(0)
+    if alignment:
+        para.alignment = alignment
+    if text:
+        run = para.add_run(text)
+        run.bold = bold
+        if font_size:
+            run.font.size = font_size
+    return para
+
+
+_template_cache = {}
+template_cache = cache_counter("Invoice template")
+
+
+def set_column_widths(table, widths, rows=None):
+    for row in (table.rows if rows is None else rows):
+        for idx, width in enumerate(widths):
+            if idx < len(row.cells):
+                row.cells[idx].width = width
+
+
+def remove_paragraph_spacing_in_table(table, rows=None):
+    for row in (table.rows if rows is None else rows):
+        for cell in row.cells:
+            for paragraph in cell.paragraphs:
+                paragraph.paragraph_format.space_before = Pt(0)
+                paragraph.paragraph_format.space_after = Pt(0)
+
+
+def _xml_escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _run_xml(text: str) -> str:
+    parts = []
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    for line_idx, line in enumerate(lines):
+        if line_idx:
+            parts.append('<w:br/>')
+        for tab_idx, chunk in enumerate(line.split("\t")):
+            if tab_idx:
+                parts.append('<w:tab/>')
+            if chunk:
+                parts.append(f'<w:t xml:space="preserve">{_xml_escape(chunk)}</w:t>')
+    return f'<w:r>{"".join(parts)}</w:r>' if parts else ''
+
+
+def _cell_xml(text: str, width, centered: bool) -> str:
+    if centered:
+        return (
+            f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width.twips}"/><w:vAlign w:val="center"/></w:tcPr>'
+            f'<w:p><w:pPr><w:spacing w:before="0" w:after="0"/><w:jc w:val="center"/></w:pPr>{_run_xml(text)}</w:p></w:tc>'
+        )
+    return (
+        f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width.twips}"/></w:tcPr>'
+        f'<w:p><w:pPr><w:spacing w:before="0" w:after="0"/></w:pPr>{_run_xml(text)}</w:p></w:tc>'
+    )
+
+
+def append_table_rows(table, rows: list, widths: list, centered: list):
+    if not rows:
+        return
+    rows_xml = "".join(
+        "<w:tr>" + "".join(
+            _cell_xml(text, widths[col], centered[col]) for col, text in enumerate(values)
+        ) + "</w:tr>"
+        for values in rows
+    )
+    parsed = parse_xml(f'<w:tbl {nsdecls("w")}>{rows_xml}</w:tbl>')
+    tbl = table._tbl
+    for tr in list(parsed):
+        tbl.append(tr)
+
+
+def get_invoice_template(image_path: str = None):
+    mtime = os.path.getmtime(image_path) if image_path and os.path.exists(image_path) else None
+    key = (image_path, mtime)
+    template = _template_cache.get(key)
+    if template is not None:
+        template_cache.hit()
+    else:
+        template_cache.miss()
+        template = Document()
+        set_no_paragraph_spacing(template)
+        add_header(template, image_path)
+        style = template.styles['Normal']
+        style.font.name = 'Arial'
+        style.font.size = Pt(10)
+        _template_cache.clear()
+        _template_cache[key] = template
+    return template
+
+
+def clear_invoice_template_cache():
+    _template_cache.clear()
+
+
+def add_header(doc, image_path):
+    section = doc.sections[0]
+    section.different_first_page_header_footer = True
+    header = section.first_page_header
+    header_table = header.add_table(rows=1, cols=2, width=Inches(6.5))
+    header_table.autofit = False
+    left_cell = header_table.rows[0].cells[0]
+    right_cell = header_table.rows[0].cells[1]
+    set_cell_border(left_cell)
+    set_cell_border(right_cell)
+    left_cell.width = Inches(3.25)
+    right_cell.width = Inches(3.25)
+    if image_path and os.path.exists(image_path):
+        left_para = left_cell.paragraphs[0]
+        left_para.paragraph_format.space_before = Pt(0)
+        left_para.paragraph_format.space_after = Pt(0)
+        left_run = left_para.add_run()
+        left_run.add_picture(image_path, width=Inches(2.5))
+    right_cell.vertical_alignment = WD_CELL_VERTICAL_ALIGNMENT.CENTER
+    right_para = right_cell.paragraphs[0]
+    right_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    right_para.paragraph_format.space_before = Pt(0)
+    right_para.paragraph_format.space_after = Pt(0)
+    phone_run = right_para.add_run("404-556-7057")
+    phone_run.font.size = Pt(10)
+    right_para.add_run("\n")
+    email_run = right_para.add_run("bbc@chintellalaw.com")
+    email_run.font.size = Pt(10)
+    right_para.add_run("\n")
+    web_run = right_para.add_run("www.chintellalaw.com")
+    web_run.font.size = Pt(10)
+
+
+def calculate_reconciliation(fee_balance, expense_balance, fee_target, expense_target, mode):
+    result = {
+        'original_fee_balance': fee_balance,
+        'original_expense_balance': expense_balance,
+        'transfer_amount': 0,
+        'transfer_direction': None,
+        'is_final': False
+    }
+
+    if mode == "final":
+        result['is_final'] = True
+        combined_balance = fee_balance + expense_balance
+        result['total_due'] = max(0, -combined_balance)
+        result['fee_replenishment'] = 0
+        result['expense_replenishment'] = 0
+        result['adjusted_fee_balance'] = fee_balance
+        result['adjusted_expense_balance'] = expense_balance
+        if expense_balance > 0 and fee_balance < 0:
+            result['transfer_amount'] = min(expense_balance, -fee_balance)
+            result['transfer_direction'] = 'expense_to_fee'
+        elif fee_balance > 0 and expense_balance < 0:
+            result['transfer_amount'] = min(fee_balance, -expense_balance)
+            result['transfer_direction'] = 'fee_to_expense'
+
+    elif mode == "transfer":
+        adjusted_fee_balance = fee_balance
+        adjusted_expense_balance = expense_balance
+
+        if expense_balance > 0 and fee_balance < 0:
+            transfer = min(expense_balance, -fee_balance)
+            result['transfer_amount'] = transfer
+            result['transfer_direction'] = 'expense_to_fee'
+            adjusted_fee_balance = fee_balance + transfer
+            adjusted_expense_balance = expense_balance - transfer
+        elif fee_balance > 0 and expense_balance < 0:
+            transfer = min(fee_balance, -expense_balance)
+            result['transfer_amount'] = transfer
+            result['transfer_direction'] = 'fee_to_expense'
+            adjusted_fee_balance = fee_balance - transfer
+            adjusted_expense_balance = expense_balance + transfer
+
+        result['adjusted_fee_balance'] = adjusted_fee_balance
+        result['adjusted_expense_balance'] = adjusted_expense_balance
+        result['fee_replenishment'] = max(0, fee_target - adjusted_fee_balance)
+        result['expense_replenishment'] = max(0, expense_target - adjusted_expense_balance)
+        result['total_due'] = result['fee_replenishment'] + result['expense_replenishment']
+
+    else:
+        result['adjusted_fee_balance'] = fee_balance
+        result['adjusted_expense_balance'] = expense_balance
+        result['fee_replenishment'] = max(0, fee_target - fee_balance)
+        result['expense_replenishment'] = max(0, expense_target - expense_balance)
+        result['total_due'] = result['fee_replenishment'] + result['expense_replenishment']
+
+    return result
+
+
+def build_summary_rows(trust_data, fee_balance, expense_balance, fee_target, expense_target, reconciliation):
+    if reconciliation['is_final']:
+        rows_data = [
+            ("FEE TRUST ACCOUNT", ""),
+            ("Total Fee Payments Received:", f"${trust_data['total_fee_payments']:.2f}"),
+            ("Total Fees Billed:", f"(${trust_data['total_fees_billed']:.2f})"),
+            ("Fee Trust Balance:", f"${fee_balance:.2f}"),
+            ("", ""),
+            ("EXPENSE TRUST ACCOUNT", ""),
+            ("Total Expense Payments Received:", f"${trust_data['total_expense_payments']:.2f}"),
+            ("Total Expenses Billed:", f"(${trust_data['total_expenses_billed']:.2f})"),
+            ("Expense Trust Balance:", f"${expense_balance:.2f}"),
+            ("", ""),
+            ("Combined Trust Balance:", f"${fee_balance + expense_balance:.2f}"),
+        ]
+        if reconciliation['transfer_amount'] > 0:
+            if reconciliation['transfer_direction'] == 'expense_to_fee':
+                rows_data.append((f"(Expense funds applied to fees: ${reconciliation['transfer_amount']:.2f})", ""))
+            else:
+                rows_data.append((f"(Fee funds applied to expenses: ${reconciliation['transfer_amount']:.2f})", ""))
+        return rows_data
+
+    elif reconciliation['transfer_amount'] > 0:
+        if reconciliation['transfer_direction'] == 'expense_to_fee':
+            transfer_label = "Transfer from Expense to Fee Trust:"
+        else:
+            transfer_label = "Transfer from Fee to Expense Trust:"
+
+        return [
+            ("FEE TRUST ACCOUNT", ""),
+            ("Total Fee Payments Received:", f"${trust_data['total_fee_payments']:.2f}"),
+            ("Total Fees Billed:", f"(${trust_data['total_fees_billed']:.2f})"),
+            ("Fee Trust Balance:", f"${fee_balance:.2f}"),
+            ("", ""),
+            ("EXPENSE TRUST ACCOUNT", ""),
+            ("Total Expense Payments Received:", f"${trust_data['total_expense_payments']:.2f}"),
+            ("Total Expenses Billed:", f"(${trust_data['total_expenses_billed']:.2f})"),
+            ("Expense Trust Balance:", f"${expense_balance:.2f}"),
+            ("", ""),
+            (transfer_label, f"${reconciliation['transfer_amount']:.2f}"),
+            ("", ""),
+            ("Adjusted Fee Trust Balance:", f"${reconciliation['adjusted_fee_balance']:.2f}"),
+            ("Fee Trust Target:", f"${fee_target:.2f}"),
+            ("Fee Replenishment Required:", f"${reconciliation['fee_replenishment']:.2f}"),
+            ("", ""),
+            ("Adjusted Expense Trust Balance:", f"${reconciliation['adjusted_expense_balance']:.2f}"),
+            ("Expense Trust Target:", f"${expense_target:.2f}"),
+            ("Expense Replenishment Required:", f"${reconciliation['expense_replenishment']:.2f}"),
+        ]
+    else:
+        return [
+            ("FEE TRUST ACCOUNT", ""),
+            ("Total Fee Payments Received:", f"${trust_data['total_fee_payments']:.2f}"),
+            ("Total Fees Billed:", f"(${trust_data['total_fees_billed']:.2f})"),
+            ("Fee Trust Balance:", f"${fee_balance:.2f}"),
+            ("Fee Trust Target:", f"${fee_target:.2f}"),
+            ("Fee Replenishment Required:", f"${reconciliation['fee_replenishment']:.2f}"),
+            ("", ""),
+            ("EXPENSE TRUST ACCOUNT", ""),
+            ("Total Expense Payments Received:", f"${trust_data['total_expense_payments']:.2f}"),
+            ("Total Expenses Billed:", f"(${trust_data['total_expenses_billed']:.2f})"),
+            ("Expense Trust Balance:", f"${expense_balance:.2f}"),
+            ("Expense Trust Target:", f"${expense_target:.2f}"),
+            ("Expense Replenishment Required:", f"${reconciliation['expense_replenishment']:.2f}"),
+        ]
+
+
+def _create_summary_table(doc, rows_data: list, bold_labels: set = None):
+    if bold_labels is None:
+        bold_labels = BOLD_LABELS
+    summary_table = doc.add_table(rows=len(rows_data), cols=2)
+    summary_table.style = 'Table Grid'
+    summary_table.alignment = WD_TABLE_ALIGNMENT.CENTER
+
+    for i, (label, value) in enumerate(rows_data):
+        summary_table.rows[i].cells[0].text = label
+        summary_table.rows[i].cells[1].text = value
+        summary_table.rows[i].cells[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
+        if label in bold_labels:
+            for paragraph in summary_table.rows[i].cells[0].paragraphs:
+                for run in paragraph.runs:
+                    run.bold = True
+            if value:
+                for paragraph in summary_table.rows[i].cells[1].paragraphs:
+                    for run in paragraph.runs:
+                        run.bold = True
+    remove_paragraph_spacing_in_table(summary_table)
+    return summary_table
+
+
+def _add_entries_table(doc, title, headers, widths, centered, rows, total_label, total_text):
+    add_paragraph_no_spacing(doc, title, bold=True, font_size=Pt(12))
+    table = doc.add_table(rows=1, cols=len(headers))
+    table.style = 'Table Grid'
+    table.alignment = WD_TABLE_ALIGNMENT.CENTER
+    table.autofit = False
+    header_row = table.rows[0]
+    set_column_widths(table, widths, [header_row])
+    hdr_cells = header_row.cells
+    for i, text in enumerate(headers):
+        hdr_cells[i].text = text
+        hdr_cells[i].paragraphs[0].runs[0].bold = True
+        hdr_cells[i].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+    append_table_rows(table, rows, widths, centered)
+    total_row = table.add_row()
+    total_cells = total_row.cells
+    total_cells[0].merge(total_cells[-2])
+    total_cells[0].text = total_label
+    total_cells[0].paragraphs[0].runs[0].bold = True
+    total_cells[0].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
+    total_cells[-1].text = total_text
+    total_cells[-1].paragraphs[0].runs[0].bold = True
+    total_cells[-1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+    set_column_widths(table, widths, [header_row, total_row])
+    remove_paragraph_spacing_in_table(table, [header_row, total_row])
+    add_paragraph_no_spacing(doc)
+
+
+def _add_time_entries_table(doc, time_entries, billing_rate, period_fees):
+    rate_text = f"${billing_rate:.2f}"
+    rows = [
+        (
+            str(entry['entry_date']),
+            entry['description'] or '',
+            f"{entry['hours']:.1f}",
+            rate_text,
+            f"${(entry['hours'] or 0) * billing_rate:.2f}",
+        )
+        for entry in time_entries
+    ]
+    _add_entries_table(
+        doc, "Professional Services", ['Date', 'Description', 'Hours', 'Rate', 'Amount'],
+        [Inches(0.9), Inches(3.6), Inches(0.6), Inches(0.7), Inches(0.8)],
+        [True, False, True, True, True],
+        rows, "Total Professional Services", f"${period_fees:.2f}"
+    )
+
+
+def _add_expense_entries_table(doc, expense_entries, period_expenses):
+    rows = [
+        (
+            str(entry['entry_date']),
+            entry['description'] or '',
+            f"${(entry['amount_cents'] or 0) / 100.0:.2f}",
+        )
+        for entry in expense_entries
+    ]
+    _add_entries_table(
+        doc, "Expenses", ['Date', 'Description', 'Amount'],
+        [Inches(0.9), Inches(4.9), Inches(0.8)],
+        [True, False, True],
+        rows, "Total Expenses", f"${period_expenses:.2f}"
+    )
+
+
+def build_invoice_job(matter: dict, entries: list, trust_data: dict, year: int, month: int,
+                      fee_target: float, expense_target: float, reconcile_mode: str,
+                      image_path: str = None, output_path: str = None) -> dict:
+    rate_cents = matter.get('billing_rate_cents')
+    return {
+        'matter': matter,
+        'entries': entries,
+        'billing_rate': (30000 if rate_cents is None else rate_cents) / 100.0,
+        'trust_data': trust_data,
+        'year': year,
+        'month': month,
+        'fee_target': fee_target,
+        'expense_target': expense_target,
+        'reconcile_mode': reconcile_mode,
+        'image_path': image_path,
+        'output_path': output_path,
+    }
+
+
+def build_invoice_document(job: dict):
+    matter = job['matter']
+    entries = job['entries']
+    billing_rate = job['billing_rate']
+    trust_data = job['trust_data']
+    year, month = job['year'], job['month']
+    fee_target = job['fee_target']
+    expense_target = job['expense_target']
+
+    last_day = calendar.monthrange(year, month)[1]
+    balance_date_str = f"{month}/{last_day}/{year}"
+
+    fee_balance = trust_data['fee_balance']
+    expense_balance = trust_data['expense_balance']
+
+    reconciliation = calculate_reconciliation(
+        fee_balance, expense_balance, fee_target, expense_target, job['reconcile_mode']
+    )
+
+    time_entries = [e for e in entries if not e['is_expense']]
+    expense_entries = [e for e in entries if e['is_expense']]
+    period_fees = sum((e['hours'] or 0) * billing_rate for e in time_entries)
+    period_expenses = sum((e['amount_cents'] or 0) / 100.0 for e in expense_entries)
+
+    client_name = f"{matter.get('first_name') or ''} {matter.get('last_name') or ''}".strip() or "Client"
+    client_address = matter.get('address') or ''
+    case_name = matter.get('case_name') or ''
+    period_name = date(year, month, 1).strftime("%B %Y")
+
+    doc = copy.deepcopy(get_invoice_template(job.get('image_path')))
+
+    invoice_type = "FINAL INVOICE" if reconciliation['is_final'] else "INVOICE"
+    add_paragraph_no_spacing(doc, invoice_type, WD_ALIGN_PARAGRAPH.CENTER, bold=True, font_size=Pt(18))
+    add_paragraph_no_spacing(doc)
+
+    info_table = doc.add_table(rows=1, cols=2)
+    info_table.autofit = True
+    left_cell = info_table.rows[0].cells[0]
+    left_cell.text = f"Bill To:\n{client_name}"
+    if client_address:
+        left_cell.text += f"\n{client_address}"
+    right_cell = info_table.rows[0].cells[1]
+    right_cell.text = f"Invoice Date: {date.today().strftime('%B %d, %Y')}\nPeriod: {period_name}\nMatter: {case_name}"
+    remove_paragraph_spacing_in_table(info_table)
+    add_paragraph_no_spacing(doc)
+
+    if time_entries:
+        _add_time_entries_table(doc, time_entries, billing_rate, period_fees)
+
+    if expense_entries:
+        _add_expense_entries_table(doc, expense_entries, period_expenses)
+
+    add_paragraph_no_spacing(doc, f"Trust Account Summary as of {balance_date_str}", bold=True, font_size=Pt(12))
+    rows_data = build_summary_rows(trust_data, fee_balance, expense_balance, fee_target, expense_target, reconciliation)
+    _create_summary_table(doc, rows_data)
+
+    add_paragraph_no_spacing(doc)
+    add_paragraph_no_spacing(doc, f"TOTAL AMOUNT DUE: ${reconciliation['total_due']:.2f}", WD_ALIGN_PARAGRAPH.RIGHT, bold=True, font_size=Pt(14))
+    add_paragraph_no_spacing(doc)
+    add_paragraph_no_spacing(doc)
+    add_paragraph_no_spacing(doc, "Thank you for your business.", WD_ALIGN_PARAGRAPH.CENTER)
+
+    return doc
+
+
+def render_invoice(job: dict) -> str:
+    with tracer.span("docx.build_invoice", "docx", entries=len(job['entries'])):
+        doc = build_invoice_document(job)
+    with tracer.span("docx.save", "docx", path=job['output_path']):
+        doc.save(job['output_path'])
+    return job['output_path']
+
+
+def invoice_filename(case_name: str, year: int, month: int) -> str:
+    period_name = date(year, month, 1).strftime("%B %Y")
+    return f"Invoice_{case_name}_{period_name.replace(' ', '_')}.docx"
+
+
+def _safe_filename(name: str) -> str:
+    return re.sub(r'[<>:"/\\|?*\x00-\x1f]', '_', name).strip() or "Invoice"
+
+
+def select_batch_matters(case_queries, invoice_queries, year: int, month: int,
+                         matter_filter: str = "open") -> List[dict]:
+    include_closed = matter_filter == "activity"
+    matters = case_queries.get_matters_for_invoice(include_closed=include_closed)
+    if matter_filter in ("activity", "open_activity"):
+        active_ids = invoice_queries.get_case_ids_with_activity(year, month)
+        matters = [m for m in matters if m['id'] in active_ids]
+    return matters
+
+
+def prepare_batch_jobs(case_queries, billing_queries, invoice_queries, year: int, month: int,
+                       output_dir: str, matter_filter: str = "open",
+                       fee_target: float = 0.0, expense_target: float = 0.0,
+                       reconcile_mode: str = "none", image_path: str = None) -> List[dict]:
+    matters = select_batch_matters(case_queries, invoice_queries, year, month, matter_filter)
+    case_ids = [m['id'] for m in matters]
+    entries_by_case = billing_queries.get_entries_for_period_by_case(year, month, case_ids)
+    trust_by_case = invoice_queries.get_trust_balances_by_case(year, month, case_ids)
+
+    jobs = []
+    used_names = set()
+    for matter in matters:
+        filename = _safe_filename(invoice_filename(matter.get('case_name') or '', year, month))
+        if filename.lower() in used_names:
+            stem, ext = os.path.splitext(filename)
+            filename = f"{stem}_{matter['id']}{ext}"
+        used_names.add(filename.lower())
+        jobs.append(build_invoice_job(
+            matter, entries_by_case.get(matter['id'], []), trust_by_case[matter['id']],
+            year, month, fee_target, expense_target, reconcile_mode,
+            image_path=image_path, output_path=os.path.join(output_dir, filename)
+        ))
+    return jobs
+
+
+def existing_invoice_paths(jobs: List[dict]) -> List[str]:
+    return [job['output_path'] for job in jobs if os.path.exists(job['output_path'])]
+
+
+class BatchInvoiceRun:
+    def __init__(self, jobs: List[dict], max_workers: Optional[int] = None):
+        self.jobs = jobs
+        self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+        self.futures = [self.executor.submit(render_invoice, job) for job in jobs]
+        self.cancelled = False
+
+    def completed_count(self) -> int:
+        return sum(1 for f in self.futures if f.done())
+
+    def is_done(self) -> bool:
+        return all(f.done() for f in self.futures)
+
+    def cancel(self):
+        self.cancelled = True
+        for future in self.futures:
+            future.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+    def results(self) -> tuple:
+        saved, failed = [], []
+        for job, future in zip(self.jobs, self.futures):
+            if future.cancelled() or not future.done():
+                continue
+            error = future.exception()
+            if error:
+                failed.append(f"{os.path.basename(job['output_path'])}: {error}")
+            else:
+                saved.append(future.result())
+        return saved, failed
@@ -0,0 +1,65 @@
+import importlib
+import importlib.util
+
+
+def is_available(module_name: str) -> bool:
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyModule:
+    def __init__(self, module_name: str):
+        self._module_name = module_name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._module_name)
+        return self._module
+
+    def is_loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._module_name}' ({state})>"
+
+
+class LazyAttribute:
+    def __init__(self, module: LazyModule, name: str):
+        self._lazy_module = module
+        self._name = name
+        self._value = None
+
+    def _load(self):
+        if self._value is None:
+            self._value = getattr(self._lazy_module._load(), self._name)
+        return self._value
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __repr__(self):
+        return f"<lazy attribute '{self._lazy_module._module_name}.{self._name}'>"
+
+
+_lazy_modules = {}
+
+
+def lazy_import(module_name: str) -> LazyModule:
+    module = _lazy_modules.get(module_name)
+    if module is None:
+        module = _lazy_modules[module_name] = LazyModule(module_name)
+    return module
+
+
+def lazy_attribute(module_name: str, name: str) -> LazyAttribute:
+    return LazyAttribute(lazy_import(module_name), name)
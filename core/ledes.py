@@ -0,0 +1,122 @@
+import re
+from datetime import date
+
+
+LEDES_VERSION_LINE = "LEDES1998B[]"
+
+LEDES_FIELDS = [
+    "INVOICE_DATE", "INVOICE_NUMBER", "CLIENT_ID", "LAW_FIRM_MATTER_ID", "INVOICE_TOTAL",
+    "BILLING_START_DATE", "BILLING_END_DATE", "INVOICE_DESCRIPTION", "LINE_ITEM_NUMBER",
+    "EXP/FEE/INV_ADJ_TYPE", "LINE_ITEM_NUMBER_OF_UNITS", "LINE_ITEM_ADJUSTMENT_AMOUNT",
+    "LINE_ITEM_TOTAL", "LINE_ITEM_DATE", "LINE_ITEM_TASK_CODE", "LINE_ITEM_EXPENSE_CODE",
+    "LINE_ITEM_ACTIVITY_CODE", "TIMEKEEPER_ID", "LINE_ITEM_DESCRIPTION", "LAW_FIRM_ID",
+    "LINE_ITEM_UNIT_COST", "TIMEKEEPER_NAME", "TIMEKEEPER_CLASSIFICATION", "CLIENT_MATTER_ID",
+]
+
+TIMEKEEPER_CLASSIFICATIONS = {
+    "PT": "Partner",
+    "AS": "Associate",
+    "OC": "Of Counsel",
+    "LA": "Legal Assistant",
+    "OT": "Other Timekeeper",
+}
+
+LINE_END = "\r\n"
+
+
+def ledes_text(value) -> str:
+    if value is None:
+        return ""
+    text = str(value).replace("[]", " ").replace("|", " ")
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def ledes_date(value) -> str:
+    if not value:
+        return ""
+    return str(value)[:10].replace("-", "")
+
+
+def ledes_amount(cents) -> str:
+    return f"{(cents or 0) / 100.0:.2f}"
+
+
+def ledes_line(values: list) -> str:
+    return "|".join(values) + "[]" + LINE_END
+
+
+def ledes_invoice_number(case_id: int, billing_end: str) -> str:
+    return f"{case_id}-{ledes_date(billing_end)}"
+
+
+def iter_ledes_lines(billing_queries, case_id: int = None, start_date=None, end_date=None,
+                     invoice_date: date = None, law_firm_id: str = "", timekeeper_id: str = "",
+                     timekeeper_name: str = "", timekeeper_classification: str = "PT"):
+    invoice_totals = billing_queries.get_ledes_invoice_totals(case_id, start_date, end_date)
+    invoice_date_text = ledes_date((invoice_date or date.today()).isoformat())
+    firm_fields = {
+        'law_firm_id': ledes_text(law_firm_id),
+        'timekeeper_id': ledes_text(timekeeper_id),
+        'timekeeper_name': ledes_text(timekeeper_name),
+        'timekeeper_classification': ledes_text(timekeeper_classification),
+    }
+
+    yield LEDES_VERSION_LINE + LINE_END
+    yield ledes_line(LEDES_FIELDS)
+
+    current_case_id = None
+    line_number = 0
+    invoice_fields = []
+    for entry in billing_queries.iter_ledes_entries(case_id, start_date, end_date):
+        if entry['case_id'] != current_case_id:
+            current_case_id = entry['case_id']
+            line_number = 0
+            totals = invoice_totals.get(current_case_id, {})
+            billing_start = str(start_date) if start_date else totals.get('first_date')
+            billing_end = str(end_date) if end_date else totals.get('last_date')
+            invoice_fields = [
+                invoice_date_text,
+                ledes_invoice_number(current_case_id, billing_end),
+                ledes_text(entry['client_id']),
+                ledes_text(entry['case_number'] or current_case_id),
+                ledes_amount(totals.get('total_cents')),
+                ledes_date(billing_start),
+                ledes_date(billing_end),
+                ledes_text(entry['case_name']),
+            ]
+
+        line_number += 1
+        if entry['is_expense']:
+            entry_type, units, unit_cost = "E", "1", ledes_amount(entry['amount_cents'])
+        else:
+            entry_type = "F"
+            units = f"{entry['hours'] or 0:.2f}"
+            unit_cost = ledes_amount(entry['billing_rate_cents'])
+
+        yield ledes_line(invoice_fields + [
+            str(line_number),
+            entry_type,
+            units,
+            "0.00",
+            ledes_amount(entry['total_cents']),
+            ledes_date(entry['entry_date']),
+            "",
+            "",
+            "",
+            firm_fields['timekeeper_id'] if entry_type == "F" else "",
+            ledes_text(entry['description']),
+            firm_fields['law_firm_id'],
+            unit_cost,
+            firm_fields['timekeeper_name'] if entry_type == "F" else "",
+            firm_fields['timekeeper_classification'] if entry_type == "F" else "",
+            "",
+        ])
+
+
+def export_ledes(file_path: str, billing_queries, **options) -> int:
+    line_items = 0
+    with open(file_path, "w", encoding="utf-8", newline="") as f:
+        for line in iter_ledes_lines(billing_queries, **options):
+            f.write(line)
+            line_items += 1
+    return max(line_items - 2, 0)
@@ -1,6 +1,8 @@
 from core.base_queries import BaseQueries
+from core.call_log import build_phone_directory, normalize_phone, phone_key
 from core.models import Person, Case, CasePerson, BillingEntry, Payment
-from typing import List
+from typing import List, Dict, Optional, Iterable, Iterator
+from datetime import date, timedelta
 import calendar
 
 
@@ -18,6 +20,55 @@ BILLING_COLUMNS = "id, case_id, entry_date, hours, is_expense, amount_cents, des
 PAYMENT_COLUMNS = "id, person_id, case_id, payment_date, amount_cents, expense_amount_cents, payment_method, reference_number, notes, created_at"
 
 
+PAGE_SIZE = 200
+
+CALL_LOG_IMPORT_BATCH_SIZE = 5000
+
+CALL_LOG_CONTACT_SQL = """COALESCE((SELECT cc.name FROM call_log_contacts cc
+    WHERE cc.phone_key = call_log.phone_key), '')"""
+
+# Keyset columns per sort: one direction for all so a row-value comparison pages through them.
+CALL_LOG_SORTS = {
+    "newest": ("DESC", (("cl.call_datetime", "call_datetime"), ("cl.id", "id"))),
+    "oldest": ("ASC", (("cl.call_datetime", "call_datetime"), ("cl.id", "id"))),
+    "phone": ("ASC", (("cl.phone_digits", "phone_digits"), ("cl.call_datetime", "call_datetime"), ("cl.id", "id"))),
+    "contact": ("ASC", (("cl.contact_name", "contact_name"), ("cl.call_datetime", "call_datetime"),
+                        ("cl.id", "id"))),
+}
+
+CASE_INSERT_SQL = """
+    INSERT INTO cases (case_number, case_name, is_litigation, court_type, county, status, billing_rate_cents)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+LEDES_LINE_TOTAL_SQL = """CASE WHEN be.is_expense = 1 THEN COALESCE(be.amount_cents, 0)
+                   ELSE CAST(ROUND(COALESCE(be.hours, 0) * c.billing_rate_cents) AS INTEGER) END"""
+
+
+def month_date_range(year: int, month: int) -> tuple:
+    start_date = f"{year}-{month:02d}-01"
+    if month == 12:
+        end_date = f"{year + 1}-01-01"
+    else:
+        end_date = f"{year}-{month + 1:02d}-01"
+    return start_date, end_date
+
+
+def month_end_date(year: int, month: int) -> str:
+    last_day = calendar.monthrange(year, month)[1]
+    return f"{year}-{month:02d}-{last_day:02d}"
+
+
+def _case_id_filter(case_ids: Optional[Iterable[int]], column: str) -> tuple:
+    if case_ids is None:
+        return "", ()
+    case_ids = tuple(case_ids)
+    if not case_ids:
+        return " AND 0", ()
+    placeholders = ", ".join("?" for _ in case_ids)
+    return f" AND {column} IN ({placeholders})", case_ids
+
+
 class PersonQueries(BaseQueries[Person]):
     table_name = "people"
     model_class = Person
@@ -50,6 +101,19 @@ class PersonQueries(BaseQueries[Person]):
             person.id
         ))
 
+    def get_page(self, after: Optional[Person] = None, limit: int = PAGE_SIZE) -> List[Person]:
+        where, params = "", ()
+        if after is not None:
+            where = "WHERE (last_name, first_name, id) > (?, ?, ?)"
+            params = (after.last_name, after.first_name, after.id)
+        rows = self.db.fetchall(f"""
+            SELECT {PERSON_COLUMNS} FROM people
+            {where}
+            ORDER BY last_name, first_name, id
+            LIMIT ?
+        """, params + (limit,))
+        return [Person(**dict(row)) for row in rows]
+
     def find_duplicates(self, first_name: str, last_name: str) -> List[Person]:
         rows = self.db.fetchall(f"""
             SELECT {PERSON_COLUMNS} FROM people 
@@ -129,20 +193,23 @@ class CaseQueries(BaseQueries[Case]):
 
         return f"{clean_name}-{next_number:03d}"
 
+    def _create_params(self, case: Case) -> tuple:
+        return (case.case_number, case.case_name, case.is_litigation, case.court_type, case.county, case.status, case.billing_rate_cents)
+
     def create(self, case: Case) -> int:
-        cursor = self.db.execute("""
-            INSERT INTO cases (case_number, case_name, is_litigation, court_type, county, status, billing_rate_cents)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (case.case_number, case.case_name, case.is_litigation, case.court_type, case.county, case.status, case.billing_rate_cents))
+        cursor = self.db.execute(CASE_INSERT_SQL, self._create_params(case))
         return cursor.lastrowid
 
     def create_with_client(self, case: Case, client_id: int, party_designation: str = None) -> int:
-        case_id = self.create(case)
-        self.db.execute("""
-            INSERT INTO case_people (case_id, person_id, role, party_designation)
-            VALUES (?, ?, 'client', ?)
-        """, (case_id, client_id, party_designation))
-        return case_id
+        # One transaction, so a case is never stored without its client.
+        result = self.db.execute_all([
+            (CASE_INSERT_SQL, self._create_params(case), False),
+            ("""
+                INSERT INTO case_people (case_id, person_id, role, party_designation)
+                VALUES (last_insert_rowid(), ?, 'client', ?)
+            """, (client_id, party_designation), False),
+        ])
+        return result.results[0].lastrowid
 
     def update(self, case: Case):
         self.db.execute("""
@@ -161,6 +228,56 @@ class CaseQueries(BaseQueries[Case]):
         rows = self.db.fetchall(query)
         return [dict(row) for row in rows]
 
+    def get_page_with_client(self, include_closed: bool = True, after: Optional[dict] = None,
+                             limit: int = PAGE_SIZE) -> List[dict]:
+        conditions, params = [], []
+        if not include_closed:
+            conditions.append("c.status = 'Open'")
+        if after is not None:
+            conditions.append("(c.created_at, c.id) < (?, ?)")
+            params.extend([after['created_at'], after['id']])
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.db.fetchall(f"""
+            SELECT c.id, c.case_number, c.case_name, c.is_litigation, c.court_type, c.county,
+                   c.status, c.billing_rate_cents, c.created_at,
+                   p.first_name || ' ' || p.last_name as client_name,
+                   p.id as client_id
+            FROM cases c
+            LEFT JOIN case_people cp ON c.id = cp.case_id AND cp.role = 'client'
+            LEFT JOIN people p ON cp.person_id = p.id
+            {where}
+            ORDER BY c.created_at DESC, c.id DESC
+            LIMIT ?
+        """, params + [limit])
+        return [dict(row) for row in rows]
+
+    def get_balance_totals(self, include_closed: bool = True) -> dict:
+        query = """
+            SELECT
+                COALESCE(SUM(pt.fee_cents), 0) - COALESCE(SUM(bt.hours * c.billing_rate_cents), 0) as fee_balance_cents,
+                COALESCE(SUM(pt.expense_cents), 0) - COALESCE(SUM(bt.expense_cents), 0) as expense_balance_cents
+            FROM cases c
+            LEFT JOIN (
+                SELECT case_id,
+                       SUM(CASE WHEN is_expense = 0 THEN hours ELSE 0 END) as hours,
+                       SUM(CASE WHEN is_expense = 1 THEN amount_cents ELSE 0 END) as expense_cents
+                FROM billing_entries
+                GROUP BY case_id
+            ) bt ON bt.case_id = c.id
+            LEFT JOIN (
+                SELECT case_id,
+                       SUM(amount_cents) as fee_cents,
+                       SUM(expense_amount_cents) as expense_cents
+                FROM payments
+                WHERE case_id IS NOT NULL
+                GROUP BY case_id
+            ) pt ON pt.case_id = c.id
+        """
+        if not include_closed:
+            query += " WHERE c.status = 'Open'"
+        row = self.db.fetchone(query)
+        return dict(row) if row else {"fee_balance_cents": 0, "expense_balance_cents": 0}
+
     def get_matters_for_invoice(self, include_closed: bool = True) -> List[dict]:
         select_clause = """
             c.id, c.case_name, c.case_number, c.billing_rate_cents,
@@ -405,12 +522,29 @@ class BillingQueries(BaseQueries[BillingEntry]):
         """, (case_id,))
         return [dict(row) for row in rows]
 
+    def get_page_by_case(self, case_id: int, after: Optional[dict] = None,
+                         limit: int = PAGE_SIZE) -> List[dict]:
+        keyset, params = "", (case_id,)
+        if after is not None:
+            keyset = "AND (be.entry_date, be.id) < (?, ?)"
+            params += (after['entry_date'], after['id'])
+        rows = self.db.fetchall(f"""
+            SELECT be.*,
+                   c.case_number, c.case_name,
+                   c.billing_rate_cents,
+                   p.first_name || ' ' || p.last_name as client_name
+            FROM billing_entries be
+            JOIN cases c ON be.case_id = c.id
+            LEFT JOIN case_people cp ON c.id = cp.case_id AND cp.role = 'client'
+            LEFT JOIN people p ON cp.person_id = p.id
+            WHERE be.case_id = ? {keyset}
+            ORDER BY be.entry_date DESC, be.id DESC
+            LIMIT ?
+        """, params + (limit,))
+        return [dict(row) for row in rows]
+
     def get_entries_for_period(self, case_id: int, year: int, month: int) -> List[dict]:
-        start_date = f"{year}-{month:02d}-01"
-        if month == 12:
-            end_date = f"{year + 1}-01-01"
-        else:
-            end_date = f"{year}-{month + 1:02d}-01"
+        start_date, end_date = month_date_range(year, month)
         rows = self.db.fetchall("""
             SELECT entry_date, hours, is_expense, amount_cents, description
             FROM billing_entries
@@ -419,6 +553,67 @@ class BillingQueries(BaseQueries[BillingEntry]):
         """, (case_id, start_date, end_date))
         return [dict(row) for row in rows]
 
+    def get_entries_for_period_by_case(self, year: int, month: int,
+                                       case_ids: Optional[Iterable[int]] = None) -> Dict[int, List[dict]]:
+        start_date, end_date = month_date_range(year, month)
+        case_filter, case_params = _case_id_filter(case_ids, "case_id")
+        rows = self.db.fetchall(f"""
+            SELECT case_id, entry_date, hours, is_expense, amount_cents, description
+            FROM billing_entries
+            WHERE entry_date >= ? AND entry_date < ?{case_filter}
+            ORDER BY case_id, entry_date ASC
+        """, (start_date, end_date) + case_params)
+        entries_by_case = {}
+        for row in rows:
+            entry = dict(row)
+            entries_by_case.setdefault(entry.pop('case_id'), []).append(entry)
+        return entries_by_case
+
+    def _ledes_filter(self, case_id: int = None, start_date=None, end_date=None):
+        conditions, params = [], []
+        if case_id is not None:
+            conditions.append("be.case_id = ?")
+            params.append(case_id)
+        if start_date:
+            conditions.append("be.entry_date >= ?")
+            params.append(str(start_date))
+        if end_date:
+            conditions.append("be.entry_date <= ?")
+            params.append(str(end_date))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, tuple(params)
+
+    def get_ledes_invoice_totals(self, case_id: int = None, start_date=None, end_date=None) -> Dict[int, dict]:
+        where, params = self._ledes_filter(case_id, start_date, end_date)
+        rows = self.db.fetchall(f"""
+            SELECT be.case_id,
+                   SUM({LEDES_LINE_TOTAL_SQL}) as total_cents,
+                   MIN(be.entry_date) as first_date,
+                   MAX(be.entry_date) as last_date
+            FROM billing_entries be
+            JOIN cases c ON be.case_id = c.id
+            {where}
+            GROUP BY be.case_id
+        """, params)
+        return {row['case_id']: dict(row) for row in rows}
+
+    def iter_ledes_entries(self, case_id: int = None, start_date=None, end_date=None) -> Iterator[dict]:
+        where, params = self._ledes_filter(case_id, start_date, end_date)
+        rows = self.db.iterate(f"""
+            SELECT be.id, be.case_id, be.entry_date, be.hours, be.is_expense,
+                   be.amount_cents, be.description,
+                   c.case_number, c.case_name, c.billing_rate_cents,
+                   (SELECT MIN(cp.person_id) FROM case_people cp
+                    WHERE cp.case_id = c.id AND cp.role = 'client') as client_id,
+                   {LEDES_LINE_TOTAL_SQL} as total_cents
+            FROM billing_entries be
+            JOIN cases c ON be.case_id = c.id
+            {where}
+            ORDER BY be.case_id, be.entry_date, be.id
+        """, params)
+        for row in rows:
+            yield dict(row)
+
     def get_case_totals(self, case_id: int) -> dict:
         row = self.db.fetchone("""
             SELECT 
@@ -496,7 +691,8 @@ class RecentCountyQueries:
         self.db = db
 
     def add_recent(self, county_name: str):
-        self.db.execute("""
+        # Nothing reads this back immediately, so the write is queued without waiting for its commit.
+        self.db.submit("""
             INSERT INTO recent_counties (county_name, last_used) 
             VALUES (?, CURRENT_TIMESTAMP)
             ON CONFLICT(county_name) DO UPDATE SET last_used = CURRENT_TIMESTAMP
@@ -515,8 +711,7 @@ class InvoiceQueries:
         self.db = db
 
     def get_trust_balances(self, case_id: int, year: int, month: int) -> dict:
-        last_day = calendar.monthrange(year, month)[1]
-        cutoff_date = f"{year}-{month:02d}-{last_day:02d}"
+        cutoff_date = month_end_date(year, month)
 
         billing_row = self.db.fetchone("""
             SELECT 
@@ -537,6 +732,55 @@ class InvoiceQueries:
         """, (case_id, cutoff_date))
         payments = dict(payment_row) if payment_row else {'total_fee_payments_cents': 0, 'total_expense_payments_cents': 0}
 
+        return self._build_trust_balances(billing, payments)
+
+    def get_trust_balances_by_case(self, year: int, month: int,
+                                   case_ids: Optional[Iterable[int]] = None) -> Dict[int, dict]:
+        cutoff_date = month_end_date(year, month)
+        case_filter, case_params = _case_id_filter(case_ids, "c.id")
+
+        rows = self.db.fetchall(f"""
+            SELECT
+                c.id as case_id,
+                COALESCE(billing.total_fees_cents, 0) as total_fees_cents,
+                COALESCE(billing.total_expenses_cents, 0) as total_expenses_cents,
+                COALESCE(payments.total_fee_payments_cents, 0) as total_fee_payments_cents,
+                COALESCE(payments.total_expense_payments_cents, 0) as total_expense_payments_cents
+            FROM cases c
+            LEFT JOIN (
+                SELECT
+                    be.case_id,
+                    SUM(CASE WHEN be.is_expense = 0 THEN be.hours * c2.billing_rate_cents ELSE 0 END) as total_fees_cents,
+                    SUM(CASE WHEN be.is_expense = 1 THEN be.amount_cents ELSE 0 END) as total_expenses_cents
+                FROM billing_entries be
+                JOIN cases c2 ON be.case_id = c2.id
+                WHERE be.entry_date <= ?
+                GROUP BY be.case_id
+            ) billing ON c.id = billing.case_id
+            LEFT JOIN (
+                SELECT
+                    case_id,
+                    SUM(amount_cents) as total_fee_payments_cents,
+                    SUM(expense_amount_cents) as total_expense_payments_cents
+                FROM payments
+                WHERE payment_date <= ?
+                GROUP BY case_id
+            ) payments ON c.id = payments.case_id
+            WHERE 1{case_filter}
+        """, (cutoff_date, cutoff_date) + case_params)
+
+        return {row['case_id']: self._build_trust_balances(dict(row), dict(row)) for row in rows}
+
+    def get_case_ids_with_activity(self, year: int, month: int) -> set:
+        start_date, end_date = month_date_range(year, month)
+        rows = self.db.fetchall("""
+            SELECT case_id FROM billing_entries WHERE entry_date >= ? AND entry_date < ?
+            UNION
+            SELECT case_id FROM payments WHERE case_id IS NOT NULL AND payment_date >= ? AND payment_date < ?
+        """, (start_date, end_date, start_date, end_date))
+        return {row['case_id'] for row in rows}
+
+    def _build_trust_balances(self, billing: dict, payments: dict) -> dict:
         total_fee_payments = payments['total_fee_payments_cents'] / 100.0
         total_expense_payments = payments['total_expense_payments_cents'] / 100.0
         total_fees_billed = billing['total_fees_cents'] / 100.0
@@ -563,11 +807,7 @@ class ReportQueries:
         self.db = db
 
     def get_monthly_billing_summary(self, year: int, month: int, include_closed: bool = True) -> List[dict]:
-        start_date = f"{year}-{month:02d}-01"
-        if month == 12:
-            end_date = f"{year + 1}-01-01"
-        else:
-            end_date = f"{year}-{month + 1:02d}-01"
+        start_date, end_date = month_date_range(year, month)
 
         status_filter = "" if include_closed else "AND c.status = 'Open'"
 
@@ -683,4 +923,116 @@ class ReportQueries:
         totals['total_billed_cents'] = totals['total_fees_cents'] + totals['total_expenses_cents']
         totals['total_payments_cents'] = totals['total_fee_payments_cents'] + totals['total_expense_payments_cents']
 
-        return totals
\ No newline at end of file
+        return totals
+
+
+class CallLogQueries:
+    def __init__(self, db):
+        self.db = db
+
+    def import_records(self, records: List[dict]) -> int:
+        self.refresh_contacts()
+        inserted = 0
+        for start in range(0, len(records), CALL_LOG_IMPORT_BATCH_SIZE):
+            rows = []
+            for r in records[start:start + CALL_LOG_IMPORT_BATCH_SIZE]:
+                key = phone_key(r['phone_number'])
+                rows.append((r['call_datetime'], r['phone_number'], r['phone_digits'], key,
+                             r['duration_minutes'], key))
+            result = self.db.executemany("""
+                INSERT OR IGNORE INTO call_log
+                    (call_datetime, phone_number, phone_digits, phone_key, duration_minutes, contact_name)
+                VALUES (?, ?, ?, ?, ?, COALESCE((SELECT name FROM call_log_contacts cc WHERE cc.phone_key = ?), ''))
+            """, rows)
+            inserted += max(result.rowcount, 0)
+        return inserted
+
+    def clear(self):
+        self.db.execute("DELETE FROM call_log")
+
+    def refresh_contacts(self) -> int:
+        contacts_version = self.db.get_contacts_version()
+        row = self.db.fetchone("SELECT value FROM db_meta WHERE key = 'call_log_contacts_version'")
+        if row is None or row['value'] != contacts_version:
+            contacts = build_phone_directory(PersonQueries(self.db).get_phone_contacts())
+            # Resolve every stored call in one pass so listing and sorting never join contacts.
+            self.db.execute_all([
+                ("DELETE FROM call_log_contacts", None, False),
+                ("INSERT OR REPLACE INTO call_log_contacts (phone_key, name) VALUES (?, ?)",
+                 contacts.items(), True),
+                (f"""
+                    UPDATE call_log SET contact_name = {CALL_LOG_CONTACT_SQL}
+                    WHERE contact_name != {CALL_LOG_CONTACT_SQL}
+                """, None, False),
+                ("""
+                    INSERT INTO db_meta (key, value) VALUES ('call_log_contacts_version', ?)
+                    ON CONFLICT(key) DO UPDATE SET value = excluded.value
+                """, (contacts_version,), False),
+            ])
+        return self.db.fetchone("SELECT COUNT(*) FROM call_log_contacts")[0]
+
+    def _filter(self, start_date: Optional[str], end_date: Optional[str], phone: Optional[str]) -> tuple:
+        conditions, params = [], []
+        if start_date:
+            conditions.append("cl.call_datetime >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("cl.call_datetime < ?")
+            params.append((date.fromisoformat(end_date) + timedelta(days=1)).isoformat())
+        digits = normalize_phone(phone)
+        if len(digits) >= 10:
+            conditions.append("cl.phone_key = ?")
+            params.append(phone_key(phone))
+        elif digits:
+            conditions.append("instr(cl.phone_digits, ?) > 0")
+            params.append(digits)
+        return conditions, params
+
+    def count(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+              phone: Optional[str] = None) -> int:
+        conditions, params = self._filter(start_date, end_date, phone)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self.db.fetchone(f"SELECT COUNT(*) FROM call_log cl {where}", params)[0]
+
+    def get_page(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                 phone: Optional[str] = None, sort: str = "newest", after: Optional[dict] = None,
+                 limit: int = PAGE_SIZE) -> List[dict]:
+        direction, keyset = CALL_LOG_SORTS[sort]
+        conditions, params = self._filter(start_date, end_date, phone)
+        if after is not None:
+            columns = ", ".join(expression for expression, _ in keyset)
+            placeholders = ", ".join("?" for _ in keyset)
+            conditions.append(f"({columns}) {'<' if direction == 'DESC' else '>'} ({placeholders})")
+            params.extend(after[key] for _, key in keyset)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        order_by = ", ".join(f"{expression} {direction}" for expression, _ in keyset)
+        rows = self.db.fetchall(f"""
+            SELECT cl.id, cl.call_datetime, cl.phone_number, cl.phone_digits, cl.duration_minutes,
+                   cl.contact_name
+            FROM call_log cl
+            {where}
+            ORDER BY {order_by}
+            LIMIT ?
+        """, params + [limit])
+        return [dict(row) for row in rows]
+
+
+class QuerySet:
+    def __init__(self, db):
+        self.db = db
+        self.people = PersonQueries(db)
+        self.cases = CaseQueries(db)
+        self.case_people = CasePersonQueries(db)
+        self.billing = BillingQueries(db)
+        self.payments = PaymentQueries(db)
+        self.recent_counties = RecentCountyQueries(db)
+        self.invoices = InvoiceQueries(db)
+        self.reports = ReportQueries(db)
+        self.call_logs = CallLogQueries(db)
+
+    def call_many(self, calls: list) -> list:
+        # (service, method[, args[, kwargs]]) calls; RemoteQuerySet sends the same list as one request.
+        return [self._call(*call) for call in calls]
+
+    def _call(self, service: str, method: str, args=(), kwargs=None):
+        return getattr(getattr(self, service), method)(*args, **(kwargs or {}))
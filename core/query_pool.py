@@ -0,0 +1,68 @@
+import sqlite3
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+from core.queries import QuerySet
+
+
+DEFAULT_QUERY_WORKERS = 2
+
+
+class QueryTask:
+    def __init__(self):
+        self.future = None
+        self.cancelled = False
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            if self.future.cancel():
+                return
+            if self._connection is not None:
+                self._connection.interrupt()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout=None):
+        return self.future.result(timeout)
+
+
+class QueryPool:
+    def __init__(self, queries: QuerySet, max_workers: int = DEFAULT_QUERY_WORKERS):
+        self.queries = queries
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="query")
+        # One worker keeps mutations in submission order; they are never interrupted.
+        self._write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="query-write")
+
+    def _run(self, task: QueryTask, fn, args, kwargs):
+        queries = self.queries
+        with task._lock:
+            if task.cancelled:
+                raise CancelledError()
+            task._connection = getattr(queries.db, "connection", None)
+        try:
+            return fn(queries, *args, **kwargs)
+        except sqlite3.OperationalError:
+            if task.cancelled:
+                raise CancelledError() from None
+            raise
+        finally:
+            with task._lock:
+                task._connection = None
+
+    def submit(self, fn, *args, **kwargs) -> QueryTask:
+        task = QueryTask()
+        task.future = self._executor.submit(self._run, task, fn, args, kwargs)
+        return task
+
+    def submit_write(self, fn, *args, **kwargs) -> QueryTask:
+        task = QueryTask()
+        task.future = self._write_executor.submit(fn, self.queries, *args, **kwargs)
+        return task
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self._write_executor.shutdown(wait=True)
@@ -0,0 +1,158 @@
+import csv
+from datetime import date
+from typing import List
+
+from core.invoices import (
+    HAS_DOCX, Document, Pt, WD_ALIGN_PARAGRAPH, WD_TABLE_ALIGNMENT, add_header
+)
+
+
+REPORT_HEADERS = [
+    "Matter", "Client", "Status", "Hours", "Fees Billed",
+    "Expenses Billed", "Total Billed", "Fee Payments",
+    "Expense Payments", "Total Payments", "Balance"
+]
+
+REPORT_TYPES = {
+    "monthly": "Monthly Billing Summary",
+    "all_time": "All-Time Summary",
+}
+
+NUMERIC_COLUMN_START = 3
+
+
+def calculate_report_totals(data: list) -> dict:
+    totals = {
+        'total_hours': 0,
+        'total_fees_cents': 0,
+        'total_expenses_cents': 0,
+        'total_fee_payments_cents': 0,
+        'total_expense_payments_cents': 0,
+        'matter_count': len(data)
+    }
+
+    for row in data:
+        totals['total_hours'] += row.get('total_hours') or 0
+        totals['total_fees_cents'] += row.get('total_fees_cents') or 0
+        totals['total_expenses_cents'] += row.get('total_expenses_cents') or 0
+        totals['total_fee_payments_cents'] += row.get('total_fee_payments_cents') or 0
+        totals['total_expense_payments_cents'] += row.get('total_expense_payments_cents') or 0
+
+    totals['total_billed_cents'] = totals['total_fees_cents'] + totals['total_expenses_cents']
+    totals['total_payments_cents'] = totals['total_fee_payments_cents'] + totals['total_expense_payments_cents']
+
+    return totals
+
+
+def report_balance_cents(row: dict) -> int:
+    billed = (row.get('total_fees_cents') or 0) + (row.get('total_expenses_cents') or 0)
+    paid = (row.get('total_fee_payments_cents') or 0) + (row.get('total_expense_payments_cents') or 0)
+    return paid - billed
+
+
+def report_row_values(row: dict) -> List[str]:
+    total_hours = row.get('total_hours') or 0
+    fees_cents = row.get('total_fees_cents') or 0
+    expenses_cents = row.get('total_expenses_cents') or 0
+    fee_payments_cents = row.get('total_fee_payments_cents') or 0
+    expense_payments_cents = row.get('total_expense_payments_cents') or 0
+
+    return [
+        row.get('case_name') or '',
+        row.get('client_name') or 'No Client',
+        row.get('status') or 'Open',
+        f"{total_hours:.1f}",
+        f"${fees_cents / 100:.2f}",
+        f"${expenses_cents / 100:.2f}",
+        f"${(fees_cents + expenses_cents) / 100:.2f}",
+        f"${fee_payments_cents / 100:.2f}",
+        f"${expense_payments_cents / 100:.2f}",
+        f"${(fee_payments_cents + expense_payments_cents) / 100:.2f}",
+        f"${report_balance_cents(row) / 100:.2f}"
+    ]
+
+
+def report_title(report_type: str, year: int = None, month: int = None) -> str:
+    if report_type == "monthly":
+        month_name = date(year, month, 1).strftime("%B %Y")
+        return f"Monthly Billing Summary - {month_name}"
+    return "All-Time Billing Summary"
+
+
+def report_filename(title: str, extension: str) -> str:
+    return f"{title.replace(' ', '_').replace('-', '')}.{extension}"
+
+
+def report_summary_text(totals: dict) -> str:
+    return (
+        f"Matters: {totals['matter_count']} | "
+        f"Hours: {totals['total_hours']:.1f} | "
+        f"Total Billed: ${totals['total_billed_cents'] / 100:.2f} | "
+        f"Total Payments: ${totals['total_payments_cents'] / 100:.2f} | "
+        f"Net Balance: ${(totals['total_payments_cents'] - totals['total_billed_cents']) / 100:.2f}"
+    )
+
+
+def generate_report_data(report_queries, report_type: str, year: int = None, month: int = None,
+                         include_closed: bool = True) -> tuple:
+    if report_type == "monthly":
+        data = report_queries.get_monthly_billing_summary(year, month, include_closed)
+        totals = report_queries.get_period_totals(year, month, include_closed)
+    else:
+        data = report_queries.get_all_matters_summary(include_closed)
+        totals = calculate_report_totals(data)
+    return data, totals
+
+
+def write_report_csv(file_path: str, rows: List[List[str]]):
+    with open(file_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(REPORT_HEADERS)
+        writer.writerows(rows)
+
+
+def build_report_document(title: str, rows: List[List[str]], totals: dict, image_path: str = None):
+    doc = Document()
+    style = doc.styles['Normal']
+    style.font.name = 'Arial'
+    style.font.size = Pt(9)
+    style.paragraph_format.space_before = Pt(0)
+    style.paragraph_format.space_after = Pt(0)
+    add_header(doc, image_path)
+
+    title_para = doc.add_paragraph()
+    title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    title_run = title_para.add_run(title)
+    title_run.bold = True
+    title_run.font.size = Pt(16)
+
+    date_para = doc.add_paragraph()
+    date_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    date_para.add_run(f"Generated: {date.today().strftime('%B %d, %Y')}")
+
+    doc.add_paragraph()
+
+    table = doc.add_table(rows=1, cols=len(REPORT_HEADERS))
+    table.style = 'Table Grid'
+    table.alignment = WD_TABLE_ALIGNMENT.CENTER
+
+    header_row = table.rows[0]
+    for i, header in enumerate(REPORT_HEADERS):
+        cell = header_row.cells[i]
+        cell.text = header
+        cell.paragraphs[0].runs[0].bold = True
+        cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    for values in rows:
+        row_cells = table.add_row().cells
+        for col_idx, text in enumerate(values):
+            row_cells[col_idx].text = text
+            if col_idx >= NUMERIC_COLUMN_START:
+                row_cells[col_idx].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
+
+    doc.add_paragraph()
+
+    summary_para = doc.add_paragraph()
+    summary_para.add_run("Summary: ").bold = True
+    summary_para.add_run(report_summary_text(totals))
+    return doc
@@ -0,0 +1,103 @@
+import json
+import os
+from pathlib import Path
+
+from core.instrumentation import cache_counter
+
+
+
+SNAPSHOT_SUFFIX = ".snapshot.json"
+SNAPSHOT_FORMAT = 1
+
+snapshot_cache = cache_counter("Warm-start snapshot")
+
+SNAPSHOT_LOADERS = {
+    "cases_open": lambda case_queries: case_queries.get_all_with_client(include_closed=False),
+    "cases_all": lambda case_queries: case_queries.get_all_with_client(include_closed=True),
+    "grand_totals_open": lambda case_queries: case_queries.get_balance_totals(include_closed=False),
+    "grand_totals_all": lambda case_queries: case_queries.get_balance_totals(include_closed=True),
+}
+
+
+def snapshot_key(name: str, include_closed: bool) -> str:
+    return f"{name}_{'all' if include_closed else 'open'}"
+
+
+def get_snapshot_path(db_path) -> Path:
+    path = Path(db_path)
+    return path.with_name(path.stem + SNAPSHOT_SUFFIX)
+
+
+class WarmStartSnapshot:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+        self.session_keys = set()
+        self.dirty = False
+
+    def load(self) -> bool:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if not isinstance(data, dict) or data.get("format") != SNAPSHOT_FORMAT:
+            return False
+        self.entries = {
+            key: entry for key, entry in (data.get("entries") or {}).items()
+            if key in SNAPSHOT_LOADERS and isinstance(entry, dict) and "data_version" in entry
+        }
+        return bool(self.entries)
+
+    def save(self):
+        if not self.dirty:
+            return
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"format": SNAPSHOT_FORMAT, "entries": self.entries}, f)
+        os.replace(temp_path, self.path)
+        self.dirty = False
+
+    def get(self, key: str):
+        entry = self.entries.get(key)
+        if entry is None:
+            snapshot_cache.miss()
+            return None
+        snapshot_cache.hit()
+        return entry["value"]
+
+    def versions(self) -> dict:
+        return {key: entry["data_version"] for key, entry in self.entries.items()}
+
+    def record(self, key: str, value, data_version: int):
+        self.entries[key] = {"data_version": data_version, "value": value}
+        self.session_keys.add(key)
+        self.dirty = True
+
+    def record_values(self, data_version: int, values: dict):
+        for key, value in values.items():
+            self.record(key, value, data_version)
+
+    def merge(self, data_version: int, values: dict) -> list:
+        updated = []
+        for key, value in values.items():
+            entry = self.entries.get(key)
+            if entry and key in self.session_keys and entry["data_version"] > data_version:
+                continue
+            self.entries[key] = {"data_version": data_version, "value": value}
+            self.dirty = True
+            updated.append(key)
+        return updated
+
+
+def load_snapshot_values(queries, keys) -> tuple:
+    data_version = queries.db.get_data_version()
+    return data_version, {key: SNAPSHOT_LOADERS[key](queries.cases) for key in keys}
+
+
+def revalidate_snapshot(queries, versions: dict):
+    data_version = queries.db.get_data_version()
+    stale_keys = [key for key, version in versions.items() if version != data_version]
+    if not stale_keys:
+        return None
+    return load_snapshot_values(queries, stale_keys)
@@ -0,0 +1,42 @@
+import os
+import time
+from typing import List, Tuple
+
+
+class StartupTimeline:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.marks: List[Tuple[str, float]] = []
+        self.written = False
+
+    def mark(self, label: str) -> float:
+        elapsed_ms = (time.perf_counter() - self.start) * 1000.0
+        self.marks.append((label, elapsed_ms))
+        return elapsed_ms
+
+    def elapsed(self, label: str):
+        for mark_label, elapsed_ms in self.marks:
+            if mark_label == label:
+                return elapsed_ms
+        return None
+
+    def format(self) -> str:
+        lines = []
+        previous = 0.0
+        for label, elapsed_ms in self.marks:
+            lines.append(f"{elapsed_ms:9.1f} ms  (+{elapsed_ms - previous:7.1f})  {label}")
+            previous = elapsed_ms
+        return "\n".join(lines)
+
+    def write(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"Startup timeline ({time.strftime('%Y-%m-%d %H:%M:%S')})\n")
+            f.write(self.format() + "\n")
+        self.written = True
+
+
+startup_timeline = StartupTimeline()
+
+
+def get_startup_log_path(app_path: str) -> str:
+    return os.path.join(app_path, "startup_log.txt")
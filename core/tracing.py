@@ -0,0 +1,102 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Optional
+
+
+TRACE_ENV_VAR = "LAW_BILLING_TRACE"
+TRACE_SETTING = "diagnostics/trace_enabled"
+MAX_TRACE_EVENTS = 1_000_000
+NULL_SPAN = nullcontext()
+
+
+def get_trace_dir(app_path: str) -> str:
+    return os.path.join(app_path, "traces")
+
+
+def trace_path_from_env(app_path: str) -> Optional[str]:
+    value = os.environ.get(TRACE_ENV_VAR, "").strip()
+    if not value or value.lower() in ("0", "false", "no", "off"):
+        return None
+    if value.lower() in ("1", "true", "yes", "on"):
+        return new_trace_path(app_path)
+    return value
+
+
+def new_trace_path(app_path: str) -> str:
+    return os.path.join(get_trace_dir(app_path), f"trace_{time.strftime('%Y%m%d_%H%M%S')}.json")
+
+
+class TraceRecorder:
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self.origin = time.perf_counter()
+        self.events = deque(maxlen=MAX_TRACE_EVENTS)
+        self.thread_names = {}
+        self._lock = threading.Lock()
+
+    def start(self, path: str):
+        with self._lock:
+            self.path = path
+            self.origin = time.perf_counter()
+            self.events.clear()
+            self.thread_names.clear()
+            self.enabled = True
+
+    def stop(self) -> Optional[str]:
+        with self._lock:
+            if not self.enabled:
+                return None
+            self.enabled = False
+            events = list(self.events)
+            thread_names = dict(self.thread_names)
+            self.events.clear()
+        self.write(self.path, events, thread_names)
+        return self.path
+
+    def complete(self, name: str, category: str, started: float, ended: Optional[float] = None,
+                 args: Optional[dict] = None):
+        if not self.enabled:
+            return
+        if ended is None:
+            ended = time.perf_counter()
+        thread_id = threading.get_ident()
+        if thread_id not in self.thread_names:
+            self.thread_names[thread_id] = threading.current_thread().name
+        event = {
+            "name": name, "cat": category, "ph": "X", "pid": os.getpid(), "tid": thread_id,
+            "ts": round((started - self.origin) * 1e6, 3),
+            "dur": round((ended - started) * 1e6, 3),
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def span(self, name: str, category: str, **args):
+        if not self.enabled:
+            return NULL_SPAN
+        return self._span(name, category, args)
+
+    @contextmanager
+    def _span(self, name: str, category: str, args: dict):
+        started = time.perf_counter()
+        try:
+            yield args
+        finally:
+            self.complete(name, category, started, args=args)
+
+    def write(self, path: str, events: list, thread_names: dict):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        pid = os.getpid()
+        metadata = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "Law Firm Billing System"}}]
+        metadata += [{"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id, "args": {"name": name}}
+                     for thread_id, name in thread_names.items()]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f)
+
+
+tracer = TraceRecorder()
@@ -1,8 +1,26 @@
-from PySide6.QtCore import QDate
+import os
+import sys
 from datetime import date, datetime
 from typing import Optional, Union
 
 
+DB_FILENAME = "law_billing.db"
+
+
+def get_app_path() -> str:
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_default_db_path() -> str:
+    return os.path.join(get_app_path(), DB_FILENAME)
+
+
+def get_image_path() -> str:
+    return os.path.join(get_app_path(), "law_image.jpg")
+
+
 def parse_date(value: Union[str, date, datetime, None]) -> Optional[date]:
     if value is None:
         return None
@@ -33,17 +51,6 @@ def parse_datetime(value: Union[str, datetime, None]) -> Optional[datetime]:
     return None
 
 
-def date_to_qdate(d: Union[str, date, None]) -> QDate:
-    parsed = parse_date(d)
-    if parsed:
-        return QDate(parsed.year, parsed.month, parsed.day)
-    return QDate.currentDate()
-
-
-def qdate_to_date(qd: QDate) -> date:
-    return date(qd.year(), qd.month(), qd.day())
-
-
 def format_matter_display(matter: dict, include_client: bool = False) -> str:
     matter_name = matter.get('case_name') or ''
     client_name = matter.get('client_name') or 'No Client'
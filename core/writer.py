@@ -0,0 +1,229 @@
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+
+DEFAULT_MAX_BATCH_SIZE = 256
+DEFAULT_MAX_LATENCY = 0.01
+
+
+class WriteResult:
+    def __init__(self, lastrowid: int, rowcount: int, results: list = None):
+        self.lastrowid = lastrowid
+        self.rowcount = rowcount
+        # Per-statement results of a multi-statement command, in order.
+        self.results = results
+
+
+class WriteFuture(Future):
+    def __init__(self):
+        super().__init__()
+        self._executed = threading.Event()
+        self._write_result = None
+
+    def set_executed(self, result: WriteResult):
+        self._write_result = result
+        self._executed.set()
+
+    def set_exception(self, exception):
+        super().set_exception(exception)
+        self._executed.set()
+
+    def rowid(self, timeout=None) -> int:
+        if not self._executed.wait(timeout):
+            raise TimeoutError("Write was not executed in time")
+        if self._write_result is None:
+            return self.result(0).lastrowid
+        return self._write_result.lastrowid
+
+
+class WriteCommand:
+    def __init__(self, query: str, params, many: bool = False):
+        self.query = query
+        self.params = params or ()
+        self.many = many
+        self.future = WriteFuture()
+
+    @property
+    def statements(self) -> list:
+        return [(self.query, self.params, self.many)]
+
+
+class WriteAllCommand(WriteCommand):
+    def __init__(self, statements: list):
+        super().__init__(None, None)
+        self._statements = statements
+
+    @property
+    def statements(self) -> list:
+        return self._statements
+
+
+class DatabaseWriter:
+    def __init__(self, db, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_latency: float = DEFAULT_MAX_LATENCY):
+        self.db = db
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.batches = 0
+        self.commands = 0
+        self._queue = queue.Queue()
+        self._ready = threading.Event()
+        self._error = None
+        self._stopped = False
+        self._lock = threading.Lock()
+        self._batch = []
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    def is_writer_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def submit(self, query: str, params=None, many: bool = False) -> WriteFuture:
+        return self._enqueue(WriteCommand(query, params, many))
+
+    def submit_all(self, statements: list) -> WriteFuture:
+        return self._enqueue(WriteAllCommand(statements))
+
+    def _enqueue(self, command: WriteCommand) -> WriteFuture:
+        with self._lock:
+            if self._stopped or not self._thread.is_alive():
+                command.future.set_exception(sqlite3.ProgrammingError("Database writer is closed"))
+                return command.future
+            self._queue.put(command)
+        return command.future
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self):
+        try:
+            connection = self.db.connection
+            connection.isolation_level = None
+            connection.execute("PRAGMA synchronous = NORMAL")
+        except sqlite3.Error as e:
+            self._error = e
+            self._ready.set()
+            return
+        self._ready.set()
+        try:
+            running = True
+            while running:
+                command = self._queue.get()
+                if command is None:
+                    break
+                running = self._commit_batch(connection, command)
+        except BaseException as e:
+            # Nothing will drain the queue once this thread is gone, so no future may be left waiting.
+            self._stop(e)
+            raise
+        finally:
+            self._stop(sqlite3.ProgrammingError("Database writer is closed"))
+            self.db.close_thread_connection()
+
+    def _stop(self, error: BaseException):
+        with self._lock:
+            self._stopped = True
+            pending = self._batch
+            self._batch = []
+            while True:
+                try:
+                    command = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if command is not None:
+                    pending.append(command)
+        self._fail(pending, error)
+
+    def _fail(self, batch: list, error: BaseException):
+        for pending in batch:
+            if not pending.future.done():
+                pending.future.set_exception(error)
+
+    def _abort_batch(self, connection, error: BaseException):
+        try:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+        except Exception:
+            pass
+        batch, self._batch = self._batch, []
+        self._fail(batch, error)
+
+    def _commit_batch(self, connection, command: WriteCommand) -> bool:
+        deadline = time.monotonic() + self.max_latency
+        self._batch = [command]
+        running = True
+        try:
+            self.db.with_retry(connection.execute, "BEGIN IMMEDIATE")
+        except Exception as e:
+            self._abort_batch(connection, e)
+            return True
+
+        while True:
+            error = self._apply(connection, command)
+            if error is not None:
+                # The batch transaction itself is gone, so earlier commands were lost with it.
+                self._abort_batch(connection, error)
+                return True
+            if len(self._batch) >= self.max_batch_size or time.monotonic() >= deadline:
+                break
+            try:
+                command = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if command is None:
+                running = False
+                break
+            self._batch.append(command)
+
+        try:
+            connection.execute("COMMIT")
+        except Exception as e:
+            self._abort_batch(connection, e)
+            return running
+
+        batch, self._batch = self._batch, []
+        self.batches += 1
+        self.commands += len(batch)
+        for pending in batch:
+            if not pending.future.done():
+                pending.future.set_result(pending.future._write_result)
+        return running
+
+    def _apply(self, connection, command: WriteCommand):
+        # A command's statements share one savepoint, so a failure undoes all of them. Returns an
+        # error only when the surrounding batch transaction cannot continue.
+        try:
+            connection.execute("SAVEPOINT write_command")
+            results = []
+            for query, params, many in command.statements:
+                started = self.db.begin_statement(query)
+                try:
+                    if many:
+                        cursor = connection.executemany(query, params)
+                    else:
+                        cursor = connection.execute(query, params or ())
+                finally:
+                    self.db.end_statement()
+                self.db.record_statement(query, started, max(cursor.rowcount, 0))
+                results.append(WriteResult(cursor.lastrowid, cursor.rowcount))
+            connection.execute("RELEASE write_command")
+        except Exception as e:
+            command.future.set_exception(e)
+            if not connection.in_transaction:
+                return e
+            try:
+                connection.execute("ROLLBACK TO write_command")
+                connection.execute("RELEASE write_command")
+            except Exception as rollback_error:
+                return rollback_error
+            return None
+        command.future.set_executed(WriteResult(cursor.lastrowid, cursor.rowcount, results))
+        return None
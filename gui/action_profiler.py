@@ -0,0 +1,140 @@
+import os
+import re
+import io
+import time
+import pstats
+import cProfile
+import tracemalloc
+from PySide6.QtCore import QEvent, QObject, QTimer, Signal
+from PySide6.QtWidgets import QApplication, QDialog, QWidget
+from gui.action_tracker import ACTION_EVENTS, RELEASE_EVENTS, describe_owner, describe_target
+
+
+PROFILE_SHORTCUT = "Ctrl+Shift+P"
+TOP_FUNCTIONS = 60
+TOP_ALLOCATIONS = 40
+TRACEMALLOC_FRAMES = 10
+
+
+def get_profile_dir(app_path: str, action_name: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", action_name).strip("_")[:60] or "action"
+    return os.path.join(app_path, "profiles", f"{time.strftime('%Y%m%d_%H%M%S')}_{slug}")
+
+
+def write_profile(folder: str, action_name: str, profile: cProfile.Profile, elapsed: float,
+                  before, after, peak: int):
+    os.makedirs(folder, exist_ok=True)
+    profile.dump_stats(os.path.join(folder, "profile.pstats"))
+
+    for sort_key, filename in (("cumulative", "profile_cumulative.txt"), ("tottime", "profile_tottime.txt")):
+        output = io.StringIO()
+        output.write(f"{action_name}: {elapsed * 1000.0:.1f} ms\n\n")
+        pstats.Stats(profile, stream=output).sort_stats(sort_key).print_stats(TOP_FUNCTIONS)
+        with open(os.path.join(folder, filename), "w", encoding="utf-8") as f:
+            f.write(output.getvalue())
+
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__),
+              tracemalloc.Filter(False, "<frozen importlib._bootstrap>")]
+    differences = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "traceback")
+    with open(os.path.join(folder, "allocations.txt"), "w", encoding="utf-8") as f:
+        f.write(f"{action_name}: peak traced memory {peak / 1024.0:.1f} KB\n")
+        for index, stat in enumerate(differences[:TOP_ALLOCATIONS], 1):
+            f.write(f"\n#{index}: {stat.size_diff / 1024.0:+.1f} KB in {stat.count_diff:+d} blocks "
+                    f"({stat.size / 1024.0:.1f} KB live)\n")
+            for line in stat.traceback.format(most_recent_first=True):
+                f.write(f"  {line}\n")
+
+
+class ActionProfiler(QObject):
+    armed_changed = Signal(bool)
+    saved = Signal(str)
+    failed = Signal(str)
+
+    def __init__(self, output_dir: str, parent=None):
+        super().__init__(parent)
+        self.output_dir = output_dir
+        self.armed = False
+        self.capture = None
+
+    def arm(self):
+        if self.armed:
+            return
+        self.armed = True
+        QApplication.instance().installEventFilter(self)
+        self.armed_changed.emit(True)
+
+    def disarm(self):
+        if not self.armed:
+            return
+        self.armed = False
+        app = QApplication.instance()
+        if app is not None:
+            app.removeEventFilter(self)
+        if self.capture is not None:
+            self.capture["profile"].disable()
+            if self.capture["stop_tracemalloc"]:
+                tracemalloc.stop()
+            self.capture = None
+        self.armed_changed.emit(False)
+
+    def toggle(self):
+        if self.armed:
+            self.disarm()
+        else:
+            self.arm()
+
+    def eventFilter(self, obj, event):
+        event_type = event.type()
+        if self.capture is None:
+            if event_type in ACTION_EVENTS and isinstance(obj, QWidget):
+                if event_type == QEvent.Type.KeyPress and not event.spontaneous():
+                    return False
+                target = describe_target(obj)
+                if target:
+                    owner = describe_owner(obj)
+                    self.start(f"{owner}: {target}" if owner else target, until_release=True)
+            elif event_type == QEvent.Type.Show and isinstance(obj, QDialog):
+                self.start(f"open {obj.windowTitle() or type(obj).__name__}", until_release=False)
+        elif self.capture["until_release"] and event_type in RELEASE_EVENTS:
+            self.capture["until_release"] = False
+            QTimer.singleShot(0, self.finish)
+        return False
+
+    def start(self, name: str, until_release: bool):
+        stop_tracemalloc = not tracemalloc.is_tracing()
+        if stop_tracemalloc:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        tracemalloc.reset_peak()
+        profile = cProfile.Profile()
+        self.capture = {
+            "name": name,
+            "until_release": until_release,
+            "stop_tracemalloc": stop_tracemalloc,
+            "profile": profile,
+            "before": tracemalloc.take_snapshot(),
+        }
+        if not until_release:
+            QTimer.singleShot(0, self.finish)
+        self.capture["started"] = time.perf_counter()
+        profile.enable()
+
+    def finish(self):
+        capture = self.capture
+        if capture is None:
+            return
+        capture["profile"].disable()
+        elapsed = time.perf_counter() - capture["started"]
+        after = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        self.capture = None
+        if capture["stop_tracemalloc"]:
+            tracemalloc.stop()
+        self.disarm()
+
+        folder = get_profile_dir(self.output_dir, capture["name"])
+        try:
+            write_profile(folder, capture["name"], capture["profile"], elapsed, capture["before"], after, peak)
+        except OSError as e:
+            self.failed.emit(str(e))
+            return
+        self.saved.emit(folder)
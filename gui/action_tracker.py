@@ -0,0 +1,83 @@
+import time
+from PySide6.QtCore import QEvent, QObject, QTimer
+from PySide6.QtWidgets import (
+    QAbstractButton, QAbstractItemView, QApplication, QComboBox, QDialog, QTabWidget, QWidget
+)
+from core.tracing import tracer
+
+
+ACTION_EVENTS = (QEvent.Type.MouseButtonPress, QEvent.Type.KeyPress)
+RELEASE_EVENTS = (QEvent.Type.MouseButtonRelease, QEvent.Type.KeyRelease)
+
+
+def describe_owner(widget: QWidget) -> str:
+    while widget is not None:
+        if type(widget).__module__.startswith("gui."):
+            return type(widget).__name__
+        widget = widget.parentWidget()
+    return ""
+
+
+def describe_target(widget: QWidget) -> str:
+    while widget is not None:
+        if isinstance(widget, QAbstractButton):
+            return f"click {widget.text().replace('&', '') or type(widget).__name__}"
+        if isinstance(widget, QComboBox):
+            return f"choose {widget.objectName() or type(widget).__name__}"
+        if isinstance(widget, QAbstractItemView):
+            return "select row"
+        widget = widget.parentWidget()
+    return None
+
+
+class ActionTracker(QObject):
+    def __init__(self, instrument, parent=None):
+        super().__init__(parent)
+        self.instrument = instrument
+        self.pending_span = None
+        self.current_input = None
+
+    def install(self):
+        QApplication.instance().installEventFilter(self)
+
+    def uninstall(self):
+        app = QApplication.instance()
+        if app is not None:
+            app.removeEventFilter(self)
+
+    def track_tabs(self, tab_widget: QTabWidget):
+        tab_widget.currentChanged.connect(lambda index: self.begin(f"tab {tab_widget.tabText(index)}"))
+
+    def begin(self, name: str, until_release: bool = False):
+        self.instrument.begin_action(name)
+        if tracer.enabled:
+            self.pending_span = (name, time.perf_counter())
+            if not until_release:
+                self.finish_span_when_idle()
+
+    def finish_span_when_idle(self):
+        name, started = self.pending_span
+        self.pending_span = None
+        QTimer.singleShot(0, lambda: tracer.complete(name, "ui", started))
+
+    def eventFilter(self, obj, event):
+        event_type = event.type()
+        if event_type in ACTION_EVENTS and isinstance(obj, QWidget):
+            if event_type == QEvent.Type.KeyPress and not event.spontaneous():
+                return False
+            # An ignored press is re-sent to each parent; only the first delivery starts an action.
+            current_input = (event_type, event.timestamp())
+            if current_input == self.current_input:
+                return False
+            self.current_input = current_input
+            target = describe_target(obj)
+            if target:
+                owner = describe_owner(obj)
+                self.begin(f"{owner}: {target}" if owner else target, until_release=True)
+        elif event_type in RELEASE_EVENTS:
+            self.current_input = None
+            if self.pending_span is not None:
+                self.finish_span_when_idle()
+        elif event_type == QEvent.Type.Show and isinstance(obj, QDialog):
+            self.begin(f"open {obj.windowTitle() or type(obj).__name__}")
+        return False
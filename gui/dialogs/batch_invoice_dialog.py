@@ -0,0 +1,89 @@
+import os
+from datetime import date
+from PySide6.QtWidgets import (
+    QHBoxLayout, QFormLayout, QComboBox, QLineEdit, QPushButton, QFileDialog, QLabel
+)
+from core.invoices import BATCH_FILTERS
+from gui.dialogs.base_dialog import BaseFormDialog
+
+
+class BatchInvoiceDialog(BaseFormDialog):
+    SETTINGS_PREFIX = "batch_invoices"
+
+    def __init__(self, parent=None, month: int = None, year: int = None, app_settings=None):
+        self.month = month or date.today().month
+        self.year = year or date.today().year
+        self.app_settings = app_settings
+        super().__init__(parent, title="Batch Generate Invoices", min_width=450)
+        self.load_settings()
+
+    def setup_ui(self):
+        form = QFormLayout()
+
+        self.month_combo = QComboBox()
+        for i in range(1, 13):
+            self.month_combo.addItem(date(2000, i, 1).strftime("%B"), i)
+        self.month_combo.setCurrentIndex(self.month - 1)
+        form.addRow("Month:", self.month_combo)
+
+        self.year_combo = QComboBox()
+        current_year = date.today().year
+        for y in range(current_year - 5, current_year + 2):
+            self.year_combo.addItem(str(y), y)
+        self.year_combo.setCurrentText(str(self.year))
+        form.addRow("Year:", self.year_combo)
+
+        self.filter_combo = QComboBox()
+        for key, label in BATCH_FILTERS.items():
+            self.filter_combo.addItem(label, key)
+        form.addRow("Matters:", self.filter_combo)
+
+        dir_layout = QHBoxLayout()
+        self.output_dir_edit = QLineEdit()
+        self.output_dir_edit.setPlaceholderText("Folder for the generated invoices")
+        dir_layout.addWidget(self.output_dir_edit)
+        browse_btn = QPushButton("Browse...")
+        browse_btn.clicked.connect(self.browse_output_dir)
+        dir_layout.addWidget(browse_btn)
+        form.addRow("Save To:", dir_layout)
+
+        self.main_layout.addLayout(form)
+
+        note = QLabel("Trust targets and reconciliation mode are taken from the Invoicing tab.")
+        note.setWordWrap(True)
+        note.setStyleSheet("color: #666; font-size: 9pt;")
+        self.main_layout.addWidget(note)
+
+    def browse_output_dir(self):
+        directory = QFileDialog.getExistingDirectory(self, "Select Invoice Folder", self.output_dir_edit.text())
+        if directory:
+            self.output_dir_edit.setText(directory)
+
+    def validate(self) -> bool:
+        if not os.path.isdir(self.output_dir_edit.text().strip()):
+            self.show_validation_warning("Please select an existing folder for the invoices.")
+            return False
+        return True
+
+    def load_settings(self):
+        if not self.app_settings:
+            return
+        self.output_dir_edit.setText(self.app_settings.get_value(f"{self.SETTINGS_PREFIX}/output_dir", ""))
+        index = self.filter_combo.findData(self.app_settings.get_value(f"{self.SETTINGS_PREFIX}/matter_filter", "open"))
+        if index >= 0:
+            self.filter_combo.setCurrentIndex(index)
+
+    def save_settings(self):
+        if not self.app_settings:
+            return
+        options = self.get_options()
+        for key in ("output_dir", "matter_filter"):
+            self.app_settings.save_value(f"{self.SETTINGS_PREFIX}/{key}", options[key])
+
+    def get_options(self) -> dict:
+        return {
+            'year': self.year_combo.currentData(),
+            'month': self.month_combo.currentData(),
+            'matter_filter': self.filter_combo.currentData(),
+            'output_dir': self.output_dir_edit.text().strip(),
+        }
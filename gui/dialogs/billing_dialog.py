@@ -1,7 +1,7 @@
 from PySide6.QtWidgets import QDialog, QVBoxLayout, QFormLayout, QDialogButtonBox
 from PySide6.QtCore import QDate
 from core.models import BillingEntry
-from core.utils import qdate_to_date
+from gui.utils import qdate_to_date
 from gui.dialogs.dialog_helpers import DialogFieldsMixin
 from gui.dialogs.billing_entry_mixin import BillingEntryMixin
 
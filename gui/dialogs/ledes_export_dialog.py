@@ -0,0 +1,83 @@
+from PySide6.QtWidgets import QFormLayout, QComboBox, QLineEdit
+from core.ledes import TIMEKEEPER_CLASSIFICATIONS
+from gui.dialogs.base_dialog import BaseFormDialog
+from gui.widgets.date_filter_widget import DateFilterWidget
+
+
+class LedesExportDialog(BaseFormDialog):
+    SETTINGS_PREFIX = "ledes_export"
+
+    def __init__(self, parent=None, matter: dict = None, app_settings=None):
+        self.matter = matter
+        self.app_settings = app_settings
+        super().__init__(parent, title="Export LEDES 1998B", min_width=450)
+        self.load_settings()
+
+    def setup_ui(self):
+        form = QFormLayout()
+
+        self.scope_combo = QComboBox()
+        if self.matter:
+            self.scope_combo.addItem(f"Selected matter: {self.matter.get('case_name') or ''}", self.matter['id'])
+        self.scope_combo.addItem("All matters", None)
+        form.addRow("Matters:", self.scope_combo)
+
+        self.date_filter = DateFilterWidget()
+        form.addRow("Entries:", self.date_filter)
+
+        self.law_firm_id_edit = QLineEdit()
+        self.law_firm_id_edit.setPlaceholderText("Firm tax ID or e-billing ID")
+        form.addRow("Law Firm ID:", self.law_firm_id_edit)
+
+        self.timekeeper_id_edit = QLineEdit()
+        form.addRow("Timekeeper ID:", self.timekeeper_id_edit)
+
+        self.timekeeper_name_edit = QLineEdit()
+        self.timekeeper_name_edit.setPlaceholderText("Last, First")
+        form.addRow("Timekeeper Name:", self.timekeeper_name_edit)
+
+        self.classification_combo = QComboBox()
+        for code, label in TIMEKEEPER_CLASSIFICATIONS.items():
+            self.classification_combo.addItem(f"{code} - {label}", code)
+        form.addRow("Classification:", self.classification_combo)
+
+        self.main_layout.addLayout(form)
+
+    def validate(self) -> bool:
+        if self.date_filter.is_enabled():
+            start_date, end_date = self.date_filter.get_range()
+            if start_date > end_date:
+                self.show_validation_warning("The start date must be on or before the end date.")
+                return False
+        return True
+
+    def load_settings(self):
+        if not self.app_settings:
+            return
+        self.law_firm_id_edit.setText(self.app_settings.get_value(f"{self.SETTINGS_PREFIX}/law_firm_id", ""))
+        self.timekeeper_id_edit.setText(self.app_settings.get_value(f"{self.SETTINGS_PREFIX}/timekeeper_id", ""))
+        self.timekeeper_name_edit.setText(self.app_settings.get_value(f"{self.SETTINGS_PREFIX}/timekeeper_name", ""))
+        index = self.classification_combo.findData(
+            self.app_settings.get_value(f"{self.SETTINGS_PREFIX}/timekeeper_classification", "PT")
+        )
+        if index >= 0:
+            self.classification_combo.setCurrentIndex(index)
+
+    def save_settings(self):
+        if not self.app_settings:
+            return
+        options = self.get_options()
+        for key in ("law_firm_id", "timekeeper_id", "timekeeper_name", "timekeeper_classification"):
+            self.app_settings.save_value(f"{self.SETTINGS_PREFIX}/{key}", options[key])
+
+    def get_options(self) -> dict:
+        start_date, end_date = self.date_filter.get_range() if self.date_filter.is_enabled() else (None, None)
+        return {
+            'case_id': self.scope_combo.currentData(),
+            'start_date': start_date,
+            'end_date': end_date,
+            'law_firm_id': self.law_firm_id_edit.text().strip(),
+            'timekeeper_id': self.timekeeper_id_edit.text().strip(),
+            'timekeeper_name': self.timekeeper_name_edit.text().strip(),
+            'timekeeper_classification': self.classification_combo.currentData(),
+        }
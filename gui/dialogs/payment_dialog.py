@@ -5,7 +5,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import QDate
 from core.models import Payment
 from core.queries import PersonQueries, CaseQueries
-from core.utils import qdate_to_date
+from gui.utils import qdate_to_date
 from gui.dialogs.dialog_helpers import DialogFieldsMixin
 
 
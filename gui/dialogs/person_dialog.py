@@ -1,5 +1,5 @@
 from core.models import Person
-from core.validation_helpers import check_duplicate_person
+from gui.validation_helpers import check_duplicate_person
 from gui.dialogs.base_dialog import BaseFormDialog
 from gui.widgets.person_form_widget import PersonFormWidget
 
@@ -0,0 +1,38 @@
+from PySide6.QtWidgets import QProgressDialog
+from PySide6.QtCore import Qt, QTimer
+
+
+class PoolProgressDialog(QProgressDialog):
+    POLL_INTERVAL_MS = 50
+
+    def __init__(self, run, label: str, title: str = "Working...", parent=None):
+        super().__init__(label, "Cancel", 0, len(run.futures), parent)
+        self.run = run
+        self.label_template = label
+        self.setWindowTitle(title)
+        self.setWindowModality(Qt.WindowModal)
+        self.setMinimumDuration(0)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+        self.canceled.connect(self.on_cancel)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.poll)
+
+    def exec(self):
+        self.timer.start(self.POLL_INTERVAL_MS)
+        return super().exec()
+
+    def poll(self):
+        completed = self.run.completed_count()
+        self.setValue(completed)
+        self.setLabelText(f"{self.label_template}\n{completed} of {self.maximum()} complete")
+        if self.run.is_done():
+            self.timer.stop()
+            self.run.shutdown()
+            self.accept()
+
+    def on_cancel(self):
+        self.timer.stop()
+        self.run.cancel()
+        self.reject()
@@ -1,9 +1,9 @@
 from PySide6.QtWidgets import QDialog, QVBoxLayout, QFormLayout, QDialogButtonBox, QMessageBox, QLabel, QTextEdit
-from core.utils import qdate_to_date, format_matter_display
+from core.utils import format_matter_display
+from gui.utils import qdate_to_date, load_combo_with_items
 from gui.dialogs.dialog_helpers import DialogFieldsMixin
 from gui.dialogs.billing_entry_mixin import BillingEntryMixin
 from gui.widgets.styled_combo_box import StyledComboBox
-from gui.utils import load_combo_with_items
 
 
 class QuickBillingDialog(QDialog, DialogFieldsMixin, BillingEntryMixin):
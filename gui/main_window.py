@@ -1,48 +1,99 @@
 from PySide6.QtWidgets import (
-    QMainWindow, QTabWidget, QWidget, QVBoxLayout, QStatusBar
+    QMainWindow, QTabWidget, QWidget, QVBoxLayout, QStatusBar, QMessageBox
 )
+from PySide6.QtCore import Qt, QEvent, QTimer
+from PySide6.QtGui import QKeySequence, QShortcut
 from core.database import Database
-from core.settings import AppSettings
-from core.queries import (
-    PersonQueries, CaseQueries, CasePersonQueries,
-    BillingQueries, PaymentQueries, RecentCountyQueries, InvoiceQueries, ReportQueries
-)
-from gui.widgets.case_widget import CaseWidget
-from gui.widgets.people_widget import PeopleWidget
-from gui.widgets.matter_billing_widget import MatterBillingWidget
-from gui.widgets.call_log_widget import CallLogWidget
-from gui.widgets.email_log_widget import EmailLogWidget
-from gui.widgets.invoice_widget import InvoiceWidget
-from gui.widgets.reports_widget import ReportsWidget
+from core.instrumentation import QueryInstrument, get_slow_query_log_path
+from gui.settings import AppSettings
+from core.queries import QuerySet
+from core.query_pool import QueryPool
+from core.snapshot import WarmStartSnapshot, get_snapshot_path, revalidate_snapshot
+from gui.query_runner import QueryRunner
+from gui.action_tracker import ActionTracker
+from gui.action_profiler import PROFILE_SHORTCUT, ActionProfiler
+from gui.stall_watchdog import StallWatchdog, get_stall_log_path
+from core.startup import startup_timeline, get_startup_log_path
+from core.tracing import TRACE_SETTING, tracer, new_trace_path, trace_path_from_env
+from core.utils import get_app_path
+
+
+class LazyTab(QWidget):
+    def __init__(self, factory, parent=None):
+        super().__init__(parent)
+        self.factory = factory
+        self.widget = None
+        self.tab_layout = QVBoxLayout(self)
+        self.tab_layout.setContentsMargins(0, 0, 0, 0)
+
+    def is_built(self) -> bool:
+        return self.widget is not None
+
+    def ensure_built(self):
+        if self.widget is None:
+            self.widget = self.factory()
+            self.tab_layout.addWidget(self.widget)
+        return self.widget
 
 
 class MainWindow(QMainWindow):
-    def __init__(self, db_path=None):
+    def __init__(self, db_path=None, server_url=None, diagnostics: bool = False):
         super().__init__()
+        self.diagnostics = diagnostics
         self.setWindowTitle("Law Firm Billing System")
         self.resize(1200, 900)
         self.setMinimumSize(400, 300)
 
         self.app_settings = AppSettings()
+        self.instrument = None
+        self.start_tracing()
 
-        if db_path:
-            self.db = Database(db_path)
+        if server_url:
+            from core.api_client import ApiClient, RemoteQuerySet
+            queries = RemoteQuerySet(ApiClient(server_url))
+            self.setWindowTitle(f"Law Firm Billing System - {server_url}")
         else:
-            self.db = Database()
+            self.instrument = QueryInstrument(slow_log_path=get_slow_query_log_path(get_app_path()))
+            queries = QuerySet(Database(db_path, instrument=self.instrument) if db_path
+                               else Database(instrument=self.instrument))
+            queries.db.start_writer()
+        self.db = queries.db
 
-        self.person_queries = PersonQueries(self.db)
-        self.case_queries = CaseQueries(self.db)
-        self.case_person_queries = CasePersonQueries(self.db)
-        self.billing_queries = BillingQueries(self.db)
-        self.payment_queries = PaymentQueries(self.db)
-        self.recent_county_queries = RecentCountyQueries(self.db)
-        self.invoice_queries = InvoiceQueries(self.db)
-        self.report_queries = ReportQueries(self.db)
+        self.person_queries = queries.people
+        self.case_queries = queries.cases
+        self.case_person_queries = queries.case_people
+        self.billing_queries = queries.billing
+        self.payment_queries = queries.payments
+        self.recent_county_queries = queries.recent_counties
+        self.invoice_queries = queries.invoices
+        self.report_queries = queries.reports
+        self.call_log_queries = queries.call_logs
+
+        self.query_runner = QueryRunner(QueryPool(queries))
+
+        self.snapshot = None
+        self.snapshot_loaded = False
+        if self.db.db_path:
+            self.snapshot = WarmStartSnapshot(get_snapshot_path(self.db.db_path))
+            self.snapshot_loaded = self.snapshot.load()
 
         self.setup_ui()
         self.restore_state()
+        self.stall_watchdog = StallWatchdog(get_stall_log_path(get_app_path()), self.instrument, parent=self)
+        self.stall_watchdog.start()
+        startup_timeline.mark("main window constructed")
+        self.installEventFilter(self)
+
+    def start_tracing(self):
+        trace_path = trace_path_from_env(get_app_path())
+        if trace_path is None and str(self.app_settings.get_value(TRACE_SETTING, False)).lower() == "true":
+            trace_path = new_trace_path(get_app_path())
+        if trace_path:
+            tracer.start(trace_path)
 
     def get_show_closed(self) -> bool:
+        if self.case_widget is None:
+            return False
         return self.case_widget.get_show_closed()
 
     def setup_ui(self):
@@ -53,23 +104,80 @@ class MainWindow(QMainWindow):
         self.tab_widget = QTabWidget()
         layout.addWidget(self.tab_widget)
 
+        self.case_widget = None
+        self.people_widget = None
+        self.billing_widget = None
+        self.call_log_widget = None
+        self.email_log_widget = None
+        self.invoice_widget = None
+        self.reports_widget = None
+
+        self.tab_factories = [
+            ("Client Matters", self.create_case_widget),
+            ("People", self.create_people_widget),
+            ("Billing/Payments", self.create_billing_widget),
+            ("Call Log", self.create_call_log_widget),
+            ("Email Log", self.create_email_log_widget),
+            ("Invoicing", self.create_invoice_widget),
+            ("Reports", self.create_reports_widget),
+        ]
+        self.diagnostics_widget = None
+        if self.diagnostics and self.instrument is not None:
+            self.tab_factories.append(("Diagnostics", self.create_diagnostics_widget))
+        self.lazy_tabs = []
+        for title, factory in self.tab_factories:
+            lazy_tab = LazyTab(factory)
+            self.lazy_tabs.append(lazy_tab)
+            self.tab_widget.addTab(lazy_tab, title)
+
+        self.status_bar = QStatusBar()
+        self.setStatusBar(self.status_bar)
+        self.status_bar.showMessage("Ready")
+        self.query_runner.busy_changed.connect(self.on_query_busy_changed)
+        self.query_runner.write_failed.connect(self.on_write_failed)
+
+        self.action_tracker = None
+        if self.instrument is not None:
+            self.action_tracker = ActionTracker(self.instrument, self)
+            self.action_tracker.track_tabs(self.tab_widget)
+            # The app-wide filter sees every event, so it only runs when someone is reading the actions.
+            if self.diagnostics or tracer.enabled:
+                self.action_tracker.install()
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
+
+        self.action_profiler = ActionProfiler(get_app_path(), self)
+        self.action_profiler.armed_changed.connect(self.on_profiler_armed_changed)
+        self.action_profiler.saved.connect(lambda folder: self.status_bar.showMessage(f"Profile saved to {folder}"))
+        self.action_profiler.failed.connect(lambda error: self.status_bar.showMessage(f"Profile failed: {error}"))
+        self.profile_shortcut = QShortcut(QKeySequence(PROFILE_SHORTCUT), self, context=Qt.ApplicationShortcut)
+        self.profile_shortcut.activated.connect(self.action_profiler.toggle)
+
+    def create_case_widget(self):
+        from gui.widgets.case_widget import CaseWidget
         self.case_widget = CaseWidget(
             self.case_queries,
             self.person_queries,
             self.case_person_queries,
             self.recent_county_queries,
-            app_settings=self.app_settings
+            app_settings=self.app_settings,
+            snapshot=self.snapshot,
+            query_runner=self.query_runner
         )
         self.case_widget.show_closed_changed.connect(self.on_show_closed_changed)
-        self.tab_widget.addTab(self.case_widget, "Client Matters")
+        return self.case_widget
 
+    def create_people_widget(self):
+        from gui.widgets.people_widget import PeopleWidget
         self.people_widget = PeopleWidget(
             self.person_queries,
             self.case_queries,
-            self.case_person_queries
+            self.case_person_queries,
+            query_runner=self.query_runner
         )
-        self.tab_widget.addTab(self.people_widget, "People")
+        return self.people_widget
 
+    def create_billing_widget(self):
+        from gui.widgets.matter_billing_widget import MatterBillingWidget
         self.billing_widget = MatterBillingWidget(
             self.billing_queries,
             self.payment_queries,
@@ -77,64 +185,150 @@ class MainWindow(QMainWindow):
             self.person_queries,
             self.case_person_queries,
             get_show_closed_callback=self.get_show_closed,
-            app_settings=self.app_settings
+            app_settings=self.app_settings,
+            snapshot=self.snapshot,
+            query_runner=self.query_runner
         )
-        self.tab_widget.addTab(self.billing_widget, "Billing/Payments")
+        return self.billing_widget
 
+    def create_call_log_widget(self):
+        from gui.widgets.call_log_widget import CallLogWidget
         self.call_log_widget = CallLogWidget(
             self.person_queries,
             self.case_queries,
-            self.billing_queries
+            self.billing_queries,
+            self.call_log_queries,
+            query_runner=self.query_runner
         )
-        self.tab_widget.addTab(self.call_log_widget, "Call Log")
+        return self.call_log_widget
 
+    def create_email_log_widget(self):
+        from gui.widgets.email_log_widget import EmailLogWidget
         self.email_log_widget = EmailLogWidget(
             self.case_queries,
             self.billing_queries,
-            app_settings=self.app_settings
+            app_settings=self.app_settings,
+            query_runner=self.query_runner
         )
-        self.tab_widget.addTab(self.email_log_widget, "Email Log")
+        return self.email_log_widget
 
+    def create_invoice_widget(self):
+        from gui.widgets.invoice_widget import InvoiceWidget
         self.invoice_widget = InvoiceWidget(
             self.case_queries,
             self.billing_queries,
             self.invoice_queries,
-            get_show_closed_callback=self.get_show_closed
+            get_show_closed_callback=self.get_show_closed,
+            query_runner=self.query_runner,
+            app_settings=self.app_settings
         )
-        self.tab_widget.addTab(self.invoice_widget, "Invoicing")
+        return self.invoice_widget
 
+    def create_reports_widget(self):
+        from gui.widgets.reports_widget import ReportsWidget
         self.reports_widget = ReportsWidget(
             self.report_queries,
-            get_show_closed_callback=self.get_show_closed
+            get_show_closed_callback=self.get_show_closed,
+            query_runner=self.query_runner
         )
-        self.tab_widget.addTab(self.reports_widget, "Reports")
+        return self.reports_widget
 
-        self.status_bar = QStatusBar()
-        self.setStatusBar(self.status_bar)
-        self.status_bar.showMessage("Ready")
+    def create_diagnostics_widget(self):
+        from gui.widgets.diagnostics_widget import DiagnosticsWidget
+        self.diagnostics_widget = DiagnosticsWidget(self.instrument, self.db, query_runner=self.query_runner,
+                                                    app_settings=self.app_settings,
+                                                    action_profiler=self.action_profiler)
+        return self.diagnostics_widget
 
-        self.tab_widget.currentChanged.connect(self.on_tab_changed)
+    def build_tab(self, index: int):
+        lazy_tab = self.lazy_tabs[index]
+        if not lazy_tab.is_built():
+            lazy_tab.ensure_built()
+            startup_timeline.mark(f"tab built: {self.tab_widget.tabText(index)}")
+            return True
+        return False
+
+    def eventFilter(self, obj, event):
+        if obj is self and event.type() == QEvent.Type.Paint:
+            self.removeEventFilter(self)
+            startup_timeline.mark("first paint")
+            if self.snapshot_loaded:
+                self.start_snapshot_revalidation()
+            QTimer.singleShot(0, self.warm_next_tab)
+        return super().eventFilter(obj, event)
+
+    def start_snapshot_revalidation(self):
+        self.query_runner.run(
+            "snapshot.revalidate", revalidate_snapshot, self.snapshot.versions(),
+            on_result=self.on_snapshot_revalidated,
+            on_error=lambda e: print(f"Warning: Failed to revalidate snapshot: {e}")
+        )
+
+    def on_snapshot_revalidated(self, result):
+        if result is None:
+            startup_timeline.mark("snapshot current")
+            return
+
+        data_version, values = result
+        if self.snapshot.merge(data_version, values):
+            for widget in (self.case_widget, self.billing_widget):
+                if widget is not None:
+                    widget.apply_snapshot()
+        startup_timeline.mark("snapshot revalidated")
+
+    def warm_next_tab(self):
+        for index in range(len(self.lazy_tabs)):
+            if not self.lazy_tabs[index].is_built():
+                self.build_tab(index)
+                QTimer.singleShot(0, self.warm_next_tab)
+                return
+        startup_timeline.mark("all tabs warmed")
+        if not startup_timeline.written:
+            try:
+                startup_timeline.write(get_startup_log_path(get_app_path()))
+            except OSError as e:
+                print(f"Warning: Failed to write startup log: {e}")
 
     def restore_state(self):
         self.app_settings.restore_window_geometry(self)
         saved_tab = self.app_settings.get_tab_index()
-        if 0 <= saved_tab < self.tab_widget.count():
-            self.tab_widget.setCurrentIndex(saved_tab)
+        if not 0 <= saved_tab < self.tab_widget.count():
+            saved_tab = 0
+        self.tab_widget.setCurrentIndex(saved_tab)
+        self.build_tab(saved_tab)
 
     def save_state(self):
         self.app_settings.save_window_geometry(self)
         self.app_settings.save_tab_index(self.tab_widget.currentIndex())
 
-        self.case_widget.save_state()
-        self.billing_widget.save_state()
-        self.email_log_widget.save_state()
+        for widget in (self.case_widget, self.billing_widget, self.email_log_widget):
+            if widget is not None:
+                widget.save_state()
+
+        if self.snapshot is not None:
+            self.snapshot.save()
+
+    def on_profiler_armed_changed(self, armed: bool):
+        if armed:
+            self.status_bar.showMessage(f"Profiling the next action ({PROFILE_SHORTCUT} to cancel)")
+        else:
+            self.status_bar.clearMessage()
+
+    def on_query_busy_changed(self, busy: bool):
+        self.status_bar.showMessage("Loading..." if busy else "Ready")
+
+    def on_write_failed(self, message: str):
+        QMessageBox.critical(self, "Error", f"Failed to save changes:\n{message}")
 
     def on_show_closed_changed(self, show_closed: bool):
-        self.billing_widget.refresh()
-        self.invoice_widget.refresh()
+        for widget in (self.billing_widget, self.invoice_widget):
+            if widget is not None:
+                widget.refresh()
 
     def on_tab_changed(self, index):
-        widget = self.tab_widget.widget(index)
+        if self.build_tab(index):
+            return
+        widget = self.lazy_tabs[index].widget
         if hasattr(widget, 'refresh'):
             widget.refresh()
 
@@ -144,5 +338,16 @@ class MainWindow(QMainWindow):
         except Exception as e:
             print(f"Warning: Failed to save state: {e}")
         finally:
+            self.stall_watchdog.stop()
+            self.action_profiler.disarm()
+            self.query_runner.shutdown()
+            if self.action_tracker is not None:
+                self.action_tracker.uninstall()
             self.db.close()
+            if self.instrument is not None:
+                self.instrument.close()
+            try:
+                tracer.stop()
+            except OSError as e:
+                print(f"Warning: Failed to write trace: {e}")
             event.accept()
@@ -0,0 +1,108 @@
+from concurrent.futures import CancelledError, Future
+from PySide6.QtCore import QObject, Signal
+
+
+class QueryRequest:
+    def __init__(self, key: str, task, on_result, on_error=None):
+        self.key = key
+        self.task = task
+        self.on_result = on_result
+        self.on_error = on_error
+
+
+class ImmediateTask:
+    def __init__(self, fn, queries, args, kwargs):
+        self.future = Future()
+        try:
+            self.future.set_result(fn(queries, *args, **kwargs))
+        except Exception as e:
+            self.future.set_exception(e)
+
+    def cancel(self):
+        pass
+
+
+class QueryRunner(QObject):
+    finished = Signal(object)
+    busy_changed = Signal(bool)
+    write_failed = Signal(str)
+
+    def __init__(self, pool=None, queries=None, parent=None):
+        super().__init__(parent)
+        self.pool = pool
+        self.queries = queries
+        self.active = {}
+        self.writes = set()
+        self.finished.connect(self.on_finished)
+
+    def is_busy(self) -> bool:
+        return bool(self.active or self.writes)
+
+    def run(self, key: str, fn, *args, on_result, on_error=None, **kwargs) -> QueryRequest:
+        self.cancel(key)
+        if self.pool is None:
+            task = ImmediateTask(fn, self.queries, args, kwargs)
+        else:
+            task = self.pool.submit(fn, *args, **kwargs)
+        request = QueryRequest(key, task, on_result, on_error)
+        was_busy = self.is_busy()
+        self.active[key] = request
+        if not was_busy:
+            self.busy_changed.emit(True)
+        task.future.add_done_callback(lambda _: self.finished.emit(request))
+        return request
+
+    def write(self, key: str, fn, *args, on_result=None, on_error=None, **kwargs) -> QueryRequest:
+        if self.pool is None:
+            task = ImmediateTask(fn, self.queries, args, kwargs)
+        else:
+            task = self.pool.submit_write(fn, *args, **kwargs)
+        request = QueryRequest(key, task, on_result, on_error)
+        was_busy = self.is_busy()
+        self.writes.add(request)
+        if not was_busy:
+            self.busy_changed.emit(True)
+        task.future.add_done_callback(lambda _: self.finished.emit(request))
+        return request
+
+    def cancel(self, key: str):
+        request = self.active.pop(key, None)
+        if request is not None:
+            request.task.cancel()
+            if not self.is_busy():
+                self.busy_changed.emit(False)
+
+    def is_loading(self, key: str) -> bool:
+        return key in self.active
+
+    def on_finished(self, request: QueryRequest):
+        is_write = request in self.writes
+        if is_write:
+            self.writes.discard(request)
+        elif self.active.get(request.key) is request:
+            del self.active[request.key]
+        else:
+            return
+        if not self.is_busy():
+            self.busy_changed.emit(False)
+
+        try:
+            result = request.task.future.result()
+        except CancelledError:
+            return
+        except Exception as e:
+            if request.on_error:
+                request.on_error(e)
+            elif is_write:
+                self.write_failed.emit(str(e))
+            else:
+                print(f"Warning: Query '{request.key}' failed: {e}")
+            return
+        if request.on_result:
+            request.on_result(result)
+
+    def shutdown(self):
+        for key in list(self.active):
+            self.cancel(key)
+        if self.pool is not None:
+            self.pool.shutdown()
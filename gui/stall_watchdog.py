@@ -0,0 +1,112 @@
+import os
+import sys
+import time
+import logging
+import threading
+import traceback
+from logging.handlers import RotatingFileHandler
+from typing import Optional
+
+from PySide6.QtCore import QObject, QTimer
+
+from core.instrumentation import SLOW_LOG_MAX_BYTES, SLOW_LOG_BACKUP_COUNT
+
+
+DEFAULT_STALL_THRESHOLD_MS = 1000
+HEARTBEAT_INTERVAL_MS = 100
+GUI_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def get_stall_log_path(app_path: str) -> str:
+    return os.path.join(app_path, "stall_log.txt")
+
+
+def find_widget_method(frame) -> Optional[str]:
+    while frame is not None:
+        code = frame.f_code
+        filename = os.path.abspath(code.co_filename)
+        if filename.startswith(GUI_DIR):
+            name = getattr(code, "co_qualname", code.co_name)
+            return f"{name} ({os.path.relpath(filename, os.path.dirname(GUI_DIR))}:{frame.f_lineno})"
+        frame = frame.f_back
+    return None
+
+
+class StallWatchdog(QObject):
+    def __init__(self, log_path: str, instrument=None, threshold_ms: float = DEFAULT_STALL_THRESHOLD_MS,
+                 parent=None):
+        super().__init__(parent)
+        self.instrument = instrument
+        self.threshold = threshold_ms / 1000.0
+        self.main_thread_id = threading.get_ident()
+        self.last_beat = time.monotonic()
+        self.stalled_since = None
+        self.stalls = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.logger = logging.Logger("law_billing.stalls")
+        self._handler = RotatingFileHandler(log_path, maxBytes=SLOW_LOG_MAX_BYTES,
+                                            backupCount=SLOW_LOG_BACKUP_COUNT, encoding="utf-8", delay=True)
+        self._handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        self.logger.addHandler(self._handler)
+
+        self.heartbeat = QTimer(self)
+        self.heartbeat.setInterval(HEARTBEAT_INTERVAL_MS)
+        self.heartbeat.timeout.connect(self.beat)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self.last_beat = time.monotonic()
+        self.heartbeat.start()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.watch, name="stall-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.heartbeat.stop()
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.logger.removeHandler(self._handler)
+        self._handler.close()
+
+    def beat(self):
+        now = time.monotonic()
+        stalled_since = self.stalled_since
+        if stalled_since is not None:
+            self.stalled_since = None
+            self.logger.warning("Main thread resumed after %.0f ms", (now - stalled_since) * 1000.0)
+        self.last_beat = now
+
+    def watch(self):
+        while not self._stop.wait(self.threshold / 4):
+            last_beat = self.last_beat
+            if self.stalled_since is None and time.monotonic() - last_beat > self.threshold:
+                self.stalled_since = last_beat
+                self.stalls += 1
+                self.capture(time.monotonic() - last_beat)
+
+    def capture(self, blocked: float):
+        frame = sys._current_frames().get(self.main_thread_id)
+        lines = [f"Main thread blocked for {blocked * 1000.0:.0f} ms"]
+        if frame is not None:
+            lines.append(f"  Widget method: {find_widget_method(frame) or 'unknown'}")
+        if self.instrument is not None:
+            action = self.instrument.current
+            if action is not None:
+                lines.append(f"  UI action: {action.name}")
+            for thread_id, label in ((self.main_thread_id, "SQL"), *self.other_threads()):
+                for query, started in self.instrument.running_statements(thread_id):
+                    lines.append(f"  {label} (running {time.time() - started:.1f} s): {' '.join(query.split())}")
+        if frame is not None:
+            lines.append("  Stack (most recent call last):")
+            lines.extend("  " + line for entry in traceback.format_stack(frame) for line in entry.rstrip().splitlines())
+        self.logger.warning("\n".join(lines))
+
+    def other_threads(self) -> list:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        return [(thread_id, f"SQL on {names.get(thread_id, thread_id)}")
+                for thread_id in list(self.instrument.running) if thread_id != self.main_thread_id]
@@ -1,7 +1,9 @@
-from PySide6.QtCore import QObject, QTimer, QEvent
+from PySide6.QtCore import Qt, QObject, QTimer, QEvent, QDate
 from PySide6.QtWidgets import QMenu, QApplication, QComboBox
 from PySide6.QtGui import QAction
-from typing import Callable, List, Tuple, Any, Optional
+from datetime import date
+from typing import Callable, List, Tuple, Any, Optional, Union
+from core.utils import parse_date
 
 
 class SpinBoxSelectAllFilter(QObject):
@@ -13,6 +15,17 @@ class SpinBoxSelectAllFilter(QObject):
         return super().eventFilter(obj, event)
 
 
+def date_to_qdate(d: Union[str, date, None]) -> QDate:
+    parsed = parse_date(d)
+    if parsed:
+        return QDate(parsed.year, parsed.month, parsed.day)
+    return QDate.currentDate()
+
+
+def qdate_to_date(qd: QDate) -> date:
+    return date(qd.year(), qd.month(), qd.day())
+
+
 def select_all_on_focus(spinbox):
     filter = SpinBoxSelectAllFilter(spinbox)
     spinbox.lineEdit().installEventFilter(filter)
@@ -45,7 +58,7 @@ def load_combo_with_items(combo: QComboBox, items: list,
 
 
 def show_table_context_menu(table, position, edit_callback=None, delete_callback=None, extra_actions=None):
-    selected = table.selectedItems()
+    selected = table.selectionModel().selectedIndexes()
     if not selected:
         return
 
@@ -58,18 +71,17 @@ def show_table_context_menu(table, position, edit_callback=None, delete_callback
 
     menu.addSeparator()
 
+    model = table.model()
     row = selected[0].row()
-    for col in range(table.columnCount()):
+    for col in range(model.columnCount()):
         if table.isColumnHidden(col):
             continue
 
-        item = table.item(row, col)
-        if not item or not item.text():
+        cell_text = model.index(row, col).data()
+        if not cell_text:
             continue
 
-        header = table.horizontalHeaderItem(col)
-        header_text = header.text() if header else f"Column {col}"
-        cell_text = item.text()
+        header_text = model.headerData(col, Qt.Horizontal) or f"Column {col}"
 
         display_text = cell_text if len(cell_text) <= 30 else cell_text[:27] + "..."
 
@@ -1,24 +1,20 @@
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox, QLabel
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QAbstractItemView,
+    QTableView, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox, QLabel
 )
 from PySide6.QtCore import Qt
 from gui.utils import show_table_context_menu
+from gui.widgets.table_model import ColumnarTableModel
 from typing import Callable, List, Dict, Any, Optional
 
 
-class TooltipTableWidgetItem(QTableWidgetItem):
-    def __init__(self, text: str):
-        super().__init__(text)
-        self.setToolTip(text)
-
-
-def configure_standard_table(table: QTableWidget, headers: list, 
+def configure_standard_table(table: QTableView, headers: list,
                              hide_id_column: bool = True,
                              stretch_last: bool = False,
-                             resize_mode: QHeaderView.ResizeMode = QHeaderView.Stretch):
-    table.setColumnCount(len(headers))
-    table.setHorizontalHeaderLabels(headers)
+                             resize_mode: QHeaderView.ResizeMode = QHeaderView.Stretch,
+                             **model_options) -> ColumnarTableModel:
+    model = ColumnarTableModel(headers, parent=table, **model_options)
+    table.setModel(model)
     table.horizontalHeader().setSectionResizeMode(resize_mode)
     if stretch_last and len(headers) > 1:
         table.horizontalHeader().setSectionResizeMode(len(headers) - 1, QHeaderView.Stretch)
@@ -27,14 +23,16 @@ def configure_standard_table(table: QTableWidget, headers: list,
     table.setEditTriggers(QTableWidget.NoEditTriggers)
     if hide_id_column and len(headers) > 0:
         table.setColumnHidden(0, True)
+    table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
     table.setSortingEnabled(True)
     table.setAlternatingRowColors(True)
     table.setContextMenuPolicy(Qt.CustomContextMenu)
+    return model
 
 
-def configure_billing_table(table: QTableWidget, headers: list):
-    table.setColumnCount(len(headers))
-    table.setHorizontalHeaderLabels(headers)
+def configure_billing_table(table: QTableView, headers: list, **model_options) -> ColumnarTableModel:
+    model = ColumnarTableModel(headers, parent=table, **model_options)
+    table.setModel(model)
     table.setColumnHidden(0, True)
     table.setSelectionBehavior(QTableWidget.SelectRows)
     table.setSelectionMode(QTableWidget.SingleSelection)
@@ -44,19 +42,29 @@ def configure_billing_table(table: QTableWidget, headers: list):
     table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
     table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
     table.horizontalHeader().setSectionResizeMode(len(headers) - 1, QHeaderView.Stretch)
+    table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+    table.setSortingEnabled(True)
     table.setContextMenuPolicy(Qt.CustomContextMenu)
+    return model
 
 
-def get_selected_row_id(table: QTableWidget, id_column: int = 0):
-    selected = table.selectedItems()
+def get_selected_row_id(table: QAbstractItemView, id_column: int = 0):
+    selected = table.selectionModel().selectedIndexes()
     if selected:
-        row = selected[0].row()
-        id_item = table.item(row, id_column)
-        if id_item:
-            return int(id_item.text())
+        id_text = table.model().index(selected[0].row(), id_column).data()
+        if id_text:
+            return int(id_text)
     return None
 
 
+def select_row_by_id(table: QTableView, row_id) -> bool:
+    row = table.model().row_for_id(row_id)
+    if row < 0:
+        return False
+    table.selectRow(row)
+    return True
+
+
 def set_table_row(table: QTableWidget, row: int, values: list, alignments: dict = None):
     for col, value in enumerate(values):
         text = str(value) if value is not None else ""
@@ -66,25 +74,8 @@ def set_table_row(table: QTableWidget, row: int, values: list, alignments: dict
         table.setItem(row, col, item)
 
 
-def populate_table_rows(table: QTableWidget, data: list, row_formatter: Callable,
-                        alignments: Optional[Dict[int, int]] = None,
-                        row_styler: Optional[Callable] = None):
-    table.setSortingEnabled(False)
-    table.setRowCount(len(data))
-    
-    for row, item in enumerate(data):
-        values = row_formatter(item)
-        for col, value in enumerate(values):
-            text = str(value) if value is not None else ""
-            table_item = TooltipTableWidgetItem(text)
-            if alignments and col in alignments:
-                table_item.setTextAlignment(alignments[col])
-            table.setItem(row, col, table_item)
-        
-        if row_styler:
-            row_styler(table, row, item)
-
-    table.setSortingEnabled(True)
+def populate_table_rows(model: ColumnarTableModel, data: list, row_formatter: Callable):
+    model.sync([row_formatter(item) for item in data])
 
 
 class BaseTableWidget(QWidget):
@@ -93,13 +84,14 @@ class BaseTableWidget(QWidget):
     def __init__(self):
         super().__init__()
         self.table = None
+        self.table_model = None
         self.count_label = None
         self.add_btn = None
         self.refresh_btn = None
 
-    def create_table(self) -> QTableWidget:
-        table = QTableWidget()
-        configure_standard_table(table, self.column_headers)
+    def create_table(self) -> QTableView:
+        table = QTableView()
+        self.table_model = configure_standard_table(table, self.column_headers)
         table.doubleClicked.connect(self.edit_item)
         table.customContextMenuRequested.connect(self.show_context_menu)
         return table
@@ -122,11 +114,19 @@ class BaseTableWidget(QWidget):
         return get_selected_row_id(self.table) if self.table else None
 
     def populate_table(self, data: list):
-        if self.table:
-            populate_table_rows(self.table, data, self.row_to_values)
+        if self.table_model:
+            populate_table_rows(self.table_model, data, self.row_to_values)
             if self.count_label:
                 self.count_label.setText(f"Total: {len(data)}")
 
+    def populate_table_pages(self, items: list, has_more: bool, fetch_page: Callable, total: int,
+                             query_runner=None):
+        if self.table_model:
+            self.table_model.show_pages(items, has_more, fetch_page, self.row_to_values,
+                                        query_runner=query_runner)
+            if self.count_label:
+                self.count_label.setText(f"Total: {total}")
+
     def show_context_menu(self, position):
         show_table_context_menu(
             self.table, position,
@@ -1,78 +1,57 @@
-import re
-import csv
-from datetime import datetime
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
-    QTableWidgetItem, QFileDialog, QLabel, QComboBox,
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableView,
+    QFileDialog, QLabel, QComboBox,
     QGroupBox, QHeaderView, QMessageBox, QLineEdit, QMenu
 )
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QCursor
-from core.models import ROLE_DISPLAY_NAMES
+from core.call_log import CallLogImportRun, format_call_datetime
+from core.queries import QuerySet
+from gui.dialogs.pool_progress_dialog import PoolProgressDialog
 from gui.dialogs.quick_billing_dialog import QuickBillingDialog
+from gui.query_runner import QueryRunner
+from gui.widgets.base_table_widget import configure_standard_table
 from gui.widgets.date_filter_widget import DateFilterWidget
+from gui.widgets.table_model import PAGE_SIZE, fetch_pages
 
-try:
-    import pandas as pd
-    HAS_PANDAS = True
-except ImportError:
-    HAS_PANDAS = False
+SORT_OPTIONS = [
+    ("Date (Newest First)", "newest"),
+    ("Date (Oldest First)", "oldest"),
+    ("Phone Number", "phone"),
+    ("Contact Name", "contact"),
+]
+
+
+def load_call_log(queries, filters: dict, sort: str, min_rows: int = 0) -> tuple:
+    first_page, filtered_count, total_count = queries.call_many([
+        ("call_logs", "get_page", (), dict(filters, sort=sort, limit=PAGE_SIZE)),
+        ("call_logs", "count", (), filters),
+        ("call_logs", "count"),
+    ])
+    items, has_more = fetch_pages(
+        lambda after, limit: queries.call_logs.get_page(**filters, sort=sort, after=after, limit=limit), min_rows,
+        first_page=first_page
+    )
+    return items, has_more, filtered_count, total_count
+
+
+def refresh_call_contacts(queries) -> int:
+    return queries.call_logs.refresh_contacts()
 
 
 class CallLogWidget(QWidget):
-    COLUMNS = ['call_datetime', 'call_date', 'phone_number', 'phone_digits', 'duration_minutes']
+    column_headers = ["ID", "Date/Time", "Phone Number", "Contact", "Duration (Min)"]
 
-    def __init__(self, person_queries, case_queries, billing_queries):
+    def __init__(self, person_queries, case_queries, billing_queries, call_log_queries, query_runner=None):
         super().__init__()
         self.person_queries = person_queries
         self.case_queries = case_queries
         self.billing_queries = billing_queries
-
-        self.phone_to_name = {}
-        self._loading = False
-
-        if HAS_PANDAS:
-            self.df = pd.DataFrame(columns=self.COLUMNS)
+        self.call_log_queries = call_log_queries
+        self.query_runner = query_runner or QueryRunner(queries=QuerySet(call_log_queries.db))
 
         self.setup_ui()
-        self.load_phone_contacts()
-        self.refresh_table()
-
-    def load_phone_contacts(self):
-        self.phone_to_name = {}
-
-        contacts = self.person_queries.get_phone_contacts()
-        for contact in contacts:
-            phone = contact.get('phone')
-            if phone:
-                phone_digits = self.normalize_phone(phone)
-                if phone_digits:
-                    first_name = contact.get('first_name') or ''
-                    last_name = contact.get('last_name') or ''
-                    full_name = f"{first_name} {last_name}".strip()
-
-                    roles = contact.get('roles')
-                    if roles:
-                        role_list = roles.split(',')
-                        role_display = ROLE_DISPLAY_NAMES.get(role_list[0].strip(), '')
-                        if role_display:
-                            full_name = f"{full_name} ({role_display})"
-
-                    self.phone_to_name[phone_digits] = full_name
-
-    def get_contact_name(self, phone_digits):
-        if not phone_digits:
-            return ""
-            
-        if phone_digits in self.phone_to_name:
-            return self.phone_to_name[phone_digits]
-
-        for stored_digits, name in self.phone_to_name.items():
-            if len(phone_digits) >= 10 and len(stored_digits) >= 10:
-                if stored_digits.endswith(phone_digits[-10:]) or phone_digits.endswith(stored_digits[-10:]):
-                    return name
-
-        return ""
+        self.refresh()
 
     def setup_ui(self):
         main_layout = QVBoxLayout(self)
@@ -112,7 +91,8 @@ class CallLogWidget(QWidget):
         sort_layout = QVBoxLayout()
         sort_layout.addWidget(QLabel("Sort By:"))
         self.sort_combo = QComboBox()
-        self.sort_combo.addItems(["Date (Newest First)", "Date (Oldest First)", "Phone Number", "Contact Name"])
+        for label, key in SORT_OPTIONS:
+            self.sort_combo.addItem(label, key)
         self.sort_combo.currentIndexChanged.connect(self.on_filter_changed)
         sort_layout.addWidget(self.sort_combo)
         filter_layout.addLayout(sort_layout)
@@ -120,30 +100,62 @@ class CallLogWidget(QWidget):
         filter_layout.addStretch()
         main_layout.addWidget(filter_group)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["Date/Time", "Phone Number", "Contact", "Duration (Min)"])
-        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
-        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
-        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
-        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeToContents)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.table.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.table = QTableView()
+        self.table_model = configure_standard_table(
+            self.table, self.column_headers, resize_mode=QHeaderView.ResizeToContents,
+            display_formatters={1: format_call_datetime}
+        )
+        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        self.table.setSortingEnabled(False)
         self.table.customContextMenuRequested.connect(self.show_context_menu)
         main_layout.addWidget(self.table)
 
         self.status_label = QLabel("Records: 0")
         main_layout.addWidget(self.status_label)
 
+    def get_filters(self) -> dict:
+        filters = {"phone": self.phone_filter.text().strip() or None}
+        if self.date_filter.is_enabled():
+            filters["start_date"], filters["end_date"] = self.date_filter.get_range()
+        return filters
+
     def on_filter_changed(self):
-        if not self._loading:
-            self.refresh_table()
+        self.refresh_table()
+
+    def refresh(self):
+        # Rebuilding contacts writes, so it queues behind other mutations rather than holding a read worker.
+        self.query_runner.write(
+            "call_log.contacts", refresh_call_contacts,
+            on_result=lambda _: self.refresh_table(self.table_model.rowCount())
+        )
 
     def on_refresh_contacts(self):
-        self.load_phone_contacts()
-        self.refresh_table()
-        QMessageBox.information(self, "Contacts Refreshed", f"Loaded {len(self.phone_to_name)} contacts from database.")
+        self.query_runner.write("call_log.contacts", refresh_call_contacts, on_result=self.on_contacts_refreshed)
+
+    def on_contacts_refreshed(self, count: int):
+        self.refresh_table(self.table_model.rowCount())
+        QMessageBox.information(self, "Contacts Refreshed", f"Loaded {count} contacts from database.")
+
+    def refresh_table(self, min_rows: int = 0):
+        filters, sort = self.get_filters(), self.sort_combo.currentData()
+        self.query_runner.run(
+            "call_log.list", load_call_log, filters, sort, min_rows,
+            on_result=lambda result: self.on_calls_loaded(result, filters, sort),
+            on_error=lambda e: self.status_label.setText(f"Error refreshing: {e}")
+        )
+
+    def on_calls_loaded(self, result: tuple, filters: dict, sort: str):
+        items, has_more, filtered_count, total_count = result
+        self.table_model.show_pages(
+            items, has_more,
+            lambda after, limit: self.call_log_queries.get_page(**filters, sort=sort, after=after, limit=limit),
+            self.row_to_values
+        )
+        self._update_status(filtered_count, total_count)
+
+    def row_to_values(self, call: dict) -> list:
+        return [call['id'], call['call_datetime'], call['phone_number'], call['contact_name'],
+                call['duration_minutes']]
 
     def show_context_menu(self, position):
         row = self.table.rowAt(position.y())
@@ -156,22 +168,14 @@ class CallLogWidget(QWidget):
             self.add_billing_entry(row)
 
     def add_billing_entry(self, row):
-        date_item = self.table.item(row, 0)
-        phone_item = self.table.item(row, 1)
-        contact_item = self.table.item(row, 2)
-        duration_item = self.table.item(row, 3)
-
-        prefill_parts = []
-        if date_item and date_item.text():
-            prefill_parts.append(f"Phone call on {date_item.text()}")
+        _, call_datetime, phone_number, contact_name, duration = self.table_model.row_values(row)
 
-        if contact_item and contact_item.text():
-            prefill_parts.append(f"with {contact_item.text()}")
-        elif phone_item and phone_item.text():
-            prefill_parts.append(f"with {phone_item.text()}")
-
-        if duration_item and duration_item.text():
-            prefill_parts.append(f"({duration_item.text()} min)")
+        prefill_parts = [f"Phone call on {format_call_datetime(call_datetime)}"]
+        if contact_name:
+            prefill_parts.append(f"with {contact_name}")
+        elif phone_number:
+            prefill_parts.append(f"with {phone_number}")
+        prefill_parts.append(f"({duration} min)")
 
         prefill_description = " ".join(prefill_parts)
 
@@ -183,98 +187,27 @@ class CallLogWidget(QWidget):
 
         if dialog.exec():
             entry_data = dialog.get_entry_data()
-            self.billing_queries.create_from_dict(entry_data)
-            QMessageBox.information(self, "Success", "Billing entry added successfully.")
-
-    def normalize_phone(self, phone):
-        if not phone:
-            return ""
-        return re.sub(r'\D', '', str(phone))
-
-    def parse_csv_file(self, file_path):
-        records = []
-        with open(file_path, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            lines = list(reader)
-            data_start = 0
-            for i, line in enumerate(lines):
-                if line and line[0].strip() == "Date (Pacific)":
-                    data_start = i + 1
-                    break
-            for row in lines[data_start:]:
-                if len(row) >= 4 and row[0].strip() and '/' in row[0]:
-                    date_str = row[0].strip()
-                    phone = row[1].strip()
-                    phone_digits = self.normalize_phone(phone)
-                    minutes_str = row[3].strip().replace(" Min", "").replace(" min", "")
-                    try:
-                        dt = datetime.strptime(date_str, "%m/%d/%Y %I:%M %p")
-                        call_datetime = dt.strftime("%Y-%m-%d %H:%M:%S")
-                        call_date = dt.strftime("%Y-%m-%d")
-                        duration = int(minutes_str)
-                        records.append({
-                            'call_datetime': call_datetime,
-                            'call_date': call_date,
-                            'phone_number': phone,
-                            'phone_digits': phone_digits,
-                            'duration_minutes': duration
-                        })
-                    except (ValueError, AttributeError):
-                        continue
-        return records
+            self.query_runner.write(
+                "billing.create_from_dict", lambda queries: queries.billing.create_from_dict(entry_data),
+                on_result=lambda _: QMessageBox.information(self, "Success", "Billing entry added successfully.")
+            )
 
     def load_csv(self):
-        if not HAS_PANDAS:
-            QMessageBox.warning(self, "Missing Dependency", "pandas is required for Call Log functionality.\nInstall with: pip install pandas")
-            return
-
         file_paths, _ = QFileDialog.getOpenFileNames(self, "Open CSV Files", "", "CSV Files (*.csv)")
         if not file_paths:
             return
 
-        self._loading = True
-        
-        try:
-            total_loaded = 0
-            total_duplicates = 0
-            failed_files = []
-
-            existing_keys = set()
-            if not self.df.empty:
-                existing_keys = set(
-                    self.df['call_datetime'] + '|' + self.df['phone_number'] + '|' + self.df['duration_minutes'].astype(str)
-                )
-
-            all_new_records = []
-
-            for file_path in file_paths:
-                try:
-                    records = self.parse_csv_file(file_path)
-                    for record in records:
-                        key = f"{record['call_datetime']}|{record['phone_number']}|{record['duration_minutes']}"
-                        if key in existing_keys:
-                            total_duplicates += 1
-                        else:
-                            existing_keys.add(key)
-                            all_new_records.append(record)
-                            total_loaded += 1
-
-                except Exception as e:
-                    failed_files.append(f"{file_path.split('/')[-1]}: {str(e)}")
-
-            if all_new_records:
-                new_df = pd.DataFrame(all_new_records)
-                if self.df.empty:
-                    self.df = new_df
-                else:
-                    self.df = pd.concat([self.df, new_df], ignore_index=True)
-
-        finally:
-            self._loading = False
+        run = CallLogImportRun(file_paths, self.call_log_queries)
+        progress = PoolProgressDialog(run, f"Importing {len(file_paths)} call log files...", "Import Call Logs", self)
+        progress.exec()
+        total_loaded, total_duplicates, failed_files = run.results()
 
         self.refresh_table()
 
-        message = f"Files processed: {len(file_paths)}\nLoaded: {total_loaded} new records\nSkipped: {total_duplicates} duplicates"
+        message = (f"Files processed: {run.completed_count()} of {len(file_paths)}\n"
+                   f"Loaded: {total_loaded} new records\nSkipped: {total_duplicates} duplicates")
+        if run.cancelled:
+            message = "Import cancelled.\n\n" + message
         if failed_files:
             message += f"\n\nFailed files:\n" + "\n".join(failed_files)
             QMessageBox.warning(self, "Import Complete with Errors", message)
@@ -282,83 +215,14 @@ class CallLogWidget(QWidget):
             QMessageBox.information(self, "Import Complete", message)
 
     def _update_status(self, filtered_count: int, total_count: int):
-        self.status_label.setText(f"Records: {filtered_count} (Total loaded: {total_count})")
-
-    def refresh_table(self):
-        if self._loading:
-            return
-            
-        if not HAS_PANDAS:
-            self.table.setRowCount(0)
-            self.status_label.setText("pandas not installed")
-            return
-
-        if self.df.empty:
-            self.table.setRowCount(0)
-            self.status_label.setText("Records: 0")
-            return
-
-        try:
-            filtered_df = self.df.copy()
-
-            if self.date_filter.is_enabled():
-                start, end = self.date_filter.get_range()
-                mask = (filtered_df['call_date'] >= start) & (filtered_df['call_date'] <= end)
-                filtered_df = filtered_df[mask]
-
-            phone_input = self.phone_filter.text().strip()
-            if phone_input:
-                phone_digits = self.normalize_phone(phone_input)
-                if phone_digits:
-                    mask = filtered_df['phone_digits'].str.contains(phone_digits, na=False)
-                    filtered_df = filtered_df[mask]
-
-            contact_names = filtered_df['phone_digits'].apply(self.get_contact_name)
-
-            sort_option = self.sort_combo.currentIndex()
-            if sort_option == 0:
-                sort_indices = filtered_df['call_datetime'].sort_values(ascending=False).index
-            elif sort_option == 1:
-                sort_indices = filtered_df['call_datetime'].sort_values(ascending=True).index
-            elif sort_option == 2:
-                sort_indices = filtered_df['phone_number'].sort_values().index
-            else:
-                temp_df = filtered_df.copy()
-                temp_df['_sort_contact'] = contact_names
-                sort_indices = temp_df['_sort_contact'].sort_values().index
-
-            filtered_df = filtered_df.loc[sort_indices]
-            contact_names = contact_names.loc[sort_indices]
-
-            self.table.setRowCount(len(filtered_df))
-            for row_idx, (idx, row) in enumerate(filtered_df.iterrows()):
-                try:
-                    dt = datetime.strptime(row['call_datetime'], "%Y-%m-%d %H:%M:%S")
-                    display_dt = dt.strftime("%m/%d/%Y %I:%M %p")
-                except (ValueError, TypeError):
-                    display_dt = str(row['call_datetime'])
-
-                self.table.setItem(row_idx, 0, QTableWidgetItem(display_dt))
-                self.table.setItem(row_idx, 1, QTableWidgetItem(str(row['phone_number'])))
-                self.table.setItem(row_idx, 2, QTableWidgetItem(contact_names.loc[idx]))
-                self.table.setItem(row_idx, 3, QTableWidgetItem(str(row['duration_minutes'])))
-
-            self._update_status(len(filtered_df), len(self.df))
-            
-        except Exception as e:
-            self.status_label.setText(f"Error refreshing: {str(e)}")
+        self.status_label.setText(f"Records: {filtered_count} (Total stored: {total_count})")
 
     def clear_data(self):
         reply = QMessageBox.question(
             self, "Confirm Clear",
-            "Are you sure you want to clear all loaded records?",
+            "Are you sure you want to delete all stored call records?",
             QMessageBox.Yes | QMessageBox.No
         )
         if reply == QMessageBox.Yes:
-            if HAS_PANDAS:
-                self.df = pd.DataFrame(columns=self.COLUMNS)
-            self.refresh_table()
-
-    def refresh(self):
-        self.load_phone_contacts()
-        self.refresh_table()
\ No newline at end of file
+            self.query_runner.write("call_logs.clear", lambda queries: queries.call_logs.clear(),
+                                    on_result=lambda _: self.refresh_table())
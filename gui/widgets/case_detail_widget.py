@@ -3,10 +3,25 @@ from PySide6.QtWidgets import (
     QPushButton, QLabel, QMessageBox, QFrame, QScrollArea, QSizePolicy
 )
 from PySide6.QtCore import Signal
-from core.queries import PersonQueries, CasePersonQueries, CaseQueries
+from core.queries import PersonQueries, CasePersonQueries, CaseQueries, QuerySet
 from core.models import ROLE_DISPLAY_NAMES, PARTY_DESIGNATION_DISPLAY
 from gui.dialogs.add_person_to_case_dialog import AddPersonToCaseDialog
 from gui.dialogs.person_dialog import PersonDialog
+from gui.query_runner import QueryRunner
+
+
+def save_case_client(queries, person, create_person: bool, case_person):
+    if create_person:
+        case_person.person_id = queries.people.create(person)
+    queries.case_people.update_client(case_person.case_id, case_person.person_id, case_person.party_designation)
+
+
+def save_case_person(queries, person, create_person: bool, case_person):
+    if create_person:
+        case_person.person_id = queries.people.create(person)
+    queries.case_people.add_person_to_case(case_person)
+    if case_person.role == 'opposing_counsel' and case_person.represents_person_id:
+        queries.case_people.clear_pro_se_for_party(case_person.case_id, case_person.represents_person_id)
 
 
 class CompactPersonCard(QFrame):
@@ -81,11 +96,12 @@ class CaseDetailWidget(QWidget):
     case_updated = Signal()
 
     def __init__(self, person_queries: PersonQueries, case_person_queries: CasePersonQueries,
-                 case_queries: CaseQueries, parent=None):
+                 case_queries: CaseQueries, query_runner=None, parent=None):
         super().__init__(parent)
         self.person_queries = person_queries
         self.case_person_queries = case_person_queries
         self.case_queries = case_queries
+        self.query_runner = query_runner or QueryRunner(queries=QuerySet(person_queries.db))
         self.current_case_id = None
         self.current_case = None
         self.setup_ui()
@@ -463,21 +479,10 @@ class CaseDetailWidget(QWidget):
 
         if dialog.exec():
             person = dialog.get_person()
-
-            if dialog.is_creating_new():
-                person_id = self.person_queries.create(person)
-            else:
-                person_id = person.id
-
-            case_person = dialog.get_case_person(person_id)
-            self.case_person_queries.update_client(
-                self.current_case_id, 
-                person_id, 
-                case_person.party_designation
-            )
-
-            self.refresh()
-            self.case_updated.emit()
+            creating = dialog.is_creating_new()
+            case_person = dialog.get_case_person(None if creating else person.id)
+            self.query_runner.write("case_people.update_client", save_case_client, person, creating, case_person,
+                                    on_result=lambda _: self.on_case_people_saved())
 
     def add_person(self, role: str, represents_person_id: int = None, represents_name: str = None):
         if not self.current_case_id:
@@ -512,23 +517,10 @@ class CaseDetailWidget(QWidget):
 
         if dialog.exec():
             person = dialog.get_person()
-
-            if dialog.is_creating_new():
-                person_id = self.person_queries.create(person)
-            else:
-                person_id = person.id
-
-            case_person = dialog.get_case_person(person_id)
-            self.case_person_queries.add_person_to_case(case_person)
-
-            if role == 'opposing_counsel' and case_person.represents_person_id:
-                self.case_person_queries.clear_pro_se_for_party(
-                    self.current_case_id, 
-                    case_person.represents_person_id
-                )
-
-            self.refresh()
-            self.case_updated.emit()
+            creating = dialog.is_creating_new()
+            case_person = dialog.get_case_person(None if creating else person.id)
+            self.query_runner.write("case_people.add_person_to_case", save_case_person, person, creating, case_person,
+                                    on_result=lambda _: self.on_case_people_saved())
 
     def edit_person(self, person_id: int):
         person = self.person_queries.get_by_id(person_id)
@@ -539,9 +531,8 @@ class CaseDetailWidget(QWidget):
         if dialog.exec():
             updated_person = dialog.get_person()
             updated_person.id = person_id
-            self.person_queries.update(updated_person)
-            self.refresh()
-            self.case_updated.emit()
+            self.query_runner.write("people.update", lambda queries: queries.people.update(updated_person),
+                                    on_result=lambda _: self.on_case_people_saved())
 
     def remove_person(self, case_person_id: int):
         reply = QMessageBox.question(
@@ -551,6 +542,12 @@ class CaseDetailWidget(QWidget):
         )
 
         if reply == QMessageBox.Yes:
-            self.case_person_queries.remove_person_from_case(case_person_id)
-            self.refresh()
-            self.case_updated.emit()
\ No newline at end of file
+            self.query_runner.write(
+                "case_people.remove_person_from_case",
+                lambda queries: queries.case_people.remove_person_from_case(case_person_id),
+                on_result=lambda _: self.on_case_people_saved()
+            )
+
+    def on_case_people_saved(self):
+        self.refresh()
+        self.case_updated.emit()
\ No newline at end of file
@@ -1,18 +1,46 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QSplitter,
-    QTableWidget, QMessageBox, QLabel, QGroupBox, QCheckBox
+    QTableView, QMessageBox, QLabel, QGroupBox, QCheckBox
 )
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QColor, QBrush
-from core.queries import CaseQueries, PersonQueries, CasePersonQueries, RecentCountyQueries
+from core.queries import CaseQueries, PersonQueries, CasePersonQueries, RecentCountyQueries, QuerySet
 from core.utils import format_matter_display
+from core.snapshot import snapshot_key, load_snapshot_values
+from gui.query_runner import QueryRunner
 from gui.dialogs.case_dialog import CaseDialog
 from gui.widgets.case_detail_widget import CaseDetailWidget
 from gui.widgets.styled_combo_box import StyledComboBox
-from gui.widgets.base_table_widget import configure_standard_table, get_selected_row_id, TooltipTableWidgetItem
+from gui.widgets.base_table_widget import configure_standard_table, get_selected_row_id, select_row_by_id
 from gui.utils import show_table_context_menu, load_combo_with_items
 
 
+CLOSED_CASE_BRUSH = QBrush(QColor("#888888"))
+
+
+def create_case(queries, case, client, party_designation: str, create_client: bool) -> int:
+    client_id = queries.people.create(client) if create_client else client.id
+    return queries.cases.create_with_client(case, client_id, party_designation)
+
+
+def update_case(queries, case, party_designation: str):
+    queries.cases.update(case)
+    queries.case_people.update_client_designation(case.id, party_designation)
+
+
+def update_case_status(queries, case_id: int, status: str):
+    case = queries.cases.get_by_id(case_id)
+    if case:
+        case.status = status
+        queries.cases.update(case)
+
+
+def load_case_for_edit(queries, case_id: int) -> tuple:
+    case = queries.cases.get_by_id(case_id)
+    client_info = queries.case_people.get_by_role(case_id, 'client') if case else []
+    return case, client_info[0].get('party_designation') if client_info else None
+
+
 class CaseWidget(QWidget):
 
     column_headers = ["ID", "Matter #", "Client", "Status", "Litigation", "Case Number", "Court", "County", "Rate"]
@@ -20,16 +48,19 @@ class CaseWidget(QWidget):
 
     def __init__(self, case_queries: CaseQueries, person_queries: PersonQueries,
                  case_person_queries: CasePersonQueries, recent_county_queries: RecentCountyQueries,
-                 app_settings=None):
+                 app_settings=None, snapshot=None, query_runner=None):
         super().__init__()
         self.case_queries = case_queries
         self.person_queries = person_queries
         self.case_person_queries = case_person_queries
         self.recent_county_queries = recent_county_queries
         self.app_settings = app_settings
+        self.snapshot = snapshot
+        self.query_runner = query_runner or QueryRunner(queries=QuerySet(case_queries.db))
 
         self.setup_ui()
-        self.refresh()
+        if not self.apply_snapshot():
+            self.refresh()
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -68,9 +99,17 @@ class CaseWidget(QWidget):
 
         list_layout.addLayout(button_layout)
 
-        self.table = QTableWidget()
-        configure_standard_table(self.table, self.column_headers)
-        self.table.itemSelectionChanged.connect(self.on_case_selected)
+        self.table = QTableView()
+        self.table_model = configure_standard_table(
+            self.table, self.column_headers,
+            display_formatters={
+                4: lambda is_litigation: "Yes" if is_litigation else "No",
+                7: lambda county: f"{county} County" if county else "",
+                8: lambda rate_cents: f"${(rate_cents or 0) / 100:.2f}/hr",
+            },
+            row_foreground=lambda values: CLOSED_CASE_BRUSH if values[3] == "Closed" else None
+        )
+        self.table.selectionModel().selectionChanged.connect(self.on_case_selected)
         self.table.doubleClicked.connect(self.edit_case)
         self.table.customContextMenuRequested.connect(self.show_context_menu)
         list_layout.addWidget(self.table)
@@ -85,9 +124,10 @@ class CaseWidget(QWidget):
         detail_layout.setContentsMargins(5, 5, 5, 5)
 
         self.detail_widget = CaseDetailWidget(
-            self.person_queries, 
+            self.person_queries,
             self.case_person_queries,
-            self.case_queries
+            self.case_queries,
+            query_runner=self.query_runner
         )
         self.detail_widget.case_updated.connect(self.on_case_detail_updated)
         detail_layout.addWidget(self.detail_widget)
@@ -116,15 +156,12 @@ class CaseWidget(QWidget):
 
     def show_context_menu(self, position):
         case_id = self.get_selected_case_id()
-        if not case_id:
-            return
-
-        case = self.case_queries.get_by_id(case_id)
-        if not case:
+        values = self.get_case_values(case_id)
+        if not values:
             return
 
         extra_actions = []
-        if case.status == "Open":
+        if values[3] == "Open":
             extra_actions.append(("Mark as Closed", lambda: self.set_case_status(case_id, "Closed")))
         else:
             extra_actions.append(("Reopen Matter", lambda: self.set_case_status(case_id, "Open")))
@@ -138,15 +175,15 @@ class CaseWidget(QWidget):
         )
 
     def set_case_status(self, case_id: int, status: str):
-        case = self.case_queries.get_by_id(case_id)
-        if case:
-            case.status = status
-            self.case_queries.update(case)
+        self.query_runner.write("cases.update", update_case_status, case_id, status,
+                                on_result=lambda _: self.on_case_status_saved(case_id, status))
+
+    def on_case_status_saved(self, case_id: int, status: str):
+        if status == "Open" or self.show_closed_checkbox.isChecked():
+            self.refresh(select_id=case_id)
+        else:
             self.refresh()
-            if status == "Open" or self.show_closed_checkbox.isChecked():
-                self.select_case(case_id)
-            else:
-                self.detail_widget.set_case(None)
+            self.detail_widget.set_case(None)
             self.show_closed_changed.emit(self.show_closed_checkbox.isChecked())
 
     def load_matter_combo(self, cases: list):
@@ -167,52 +204,32 @@ class CaseWidget(QWidget):
             self.detail_widget.set_case(None)
             return
 
-        for row in range(self.table.rowCount()):
-            item = self.table.item(row, 0)
-            if item and int(item.text()) == case_id:
-                self.table.selectRow(row)
-                break
+        select_row_by_id(self.table, case_id)
+
+    def case_to_values(self, case_data: dict) -> list:
+        return [
+            case_data.get('id'),
+            case_data.get('case_name') or '',
+            case_data.get('client_name') or 'No Client',
+            case_data.get('status') or 'Open',
+            bool(case_data.get('is_litigation')),
+            case_data.get('case_number') or '',
+            case_data.get('court_type') or '',
+            case_data.get('county'),
+            case_data.get('billing_rate_cents') or 0,
+        ]
 
     def populate_table(self, cases: list):
-        self.table.setSortingEnabled(False)
-        self.table.setRowCount(len(cases))
-
-        for row, case_data in enumerate(cases):
-            status = case_data.get('status') or 'Open'
-            is_closed = status == 'Closed'
-            
-            self.table.setItem(row, 0, TooltipTableWidgetItem(str(case_data.get('id', ''))))
-            self.table.setItem(row, 1, TooltipTableWidgetItem(case_data.get('case_name') or ''))
-            self.table.setItem(row, 2, TooltipTableWidgetItem(case_data.get('client_name') or 'No Client'))
-            self.table.setItem(row, 3, TooltipTableWidgetItem(status))
-
-            is_litigation = case_data.get('is_litigation')
-            litigation_display = "Yes" if is_litigation else "No"
-            self.table.setItem(row, 4, TooltipTableWidgetItem(litigation_display))
-
-            self.table.setItem(row, 5, TooltipTableWidgetItem(case_data.get('case_number') or ''))
-            self.table.setItem(row, 6, TooltipTableWidgetItem(case_data.get('court_type') or ''))
-
-            county = case_data.get('county')
-            county_display = f"{county} County" if county else ''
-            self.table.setItem(row, 7, TooltipTableWidgetItem(county_display))
-
-            rate_cents = case_data.get('billing_rate_cents') or 0
-            rate_display = f"${rate_cents / 100:.2f}/hr"
-            self.table.setItem(row, 8, TooltipTableWidgetItem(rate_display))
-
-            if is_closed:
-                for col in range(self.table.columnCount()):
-                    item = self.table.item(row, col)
-                    if item:
-                        item.setForeground(QBrush(QColor("#888888")))
-
-        self.table.setSortingEnabled(True)
+        self.table_model.sync([self.case_to_values(case_data) for case_data in cases])
         self.count_label.setText(f"Total Matters: {len(cases)}")
 
     def get_selected_case_id(self) -> int:
         return get_selected_row_id(self.table)
 
+    def get_case_values(self, case_id: int) -> list:
+        row = self.table_model.row_for_id(case_id) if case_id else -1
+        return self.table_model.row_values(row) if row >= 0 else None
+
     def on_case_selected(self):
         case_id = self.get_selected_case_id()
         self.detail_widget.set_case(case_id)
@@ -228,11 +245,31 @@ class CaseWidget(QWidget):
     def on_case_detail_updated(self):
         self.refresh()
 
-    def refresh(self):
-        selected_id = self.get_selected_case_id()
-        include_closed = self.show_closed_checkbox.isChecked()
-        
-        cases = self.case_queries.get_all_with_client(include_closed=include_closed)
+    def apply_snapshot(self) -> bool:
+        if self.snapshot is None:
+            return False
+        cases = self.snapshot.get(snapshot_key("cases", self.show_closed_checkbox.isChecked()))
+        if cases is None:
+            return False
+        self.show_cases(cases)
+        return True
+
+    def refresh(self, select_id: int = None):
+        key = snapshot_key("cases", self.show_closed_checkbox.isChecked())
+        self.count_label.setText("Loading matters...")
+        self.query_runner.run(
+            "case_widget.cases", load_snapshot_values, [key],
+            on_result=lambda result: self.on_cases_loaded(result, key, select_id)
+        )
+
+    def on_cases_loaded(self, result: tuple, key: str, select_id: int = None):
+        data_version, values = result
+        if self.snapshot is not None:
+            self.snapshot.record_values(data_version, values)
+        self.show_cases(values[key], select_id)
+
+    def show_cases(self, cases: list, select_id: int = None):
+        selected_id = select_id or self.get_selected_case_id()
         self.populate_table(cases)
         self.load_matter_combo(cases)
 
@@ -240,11 +277,7 @@ class CaseWidget(QWidget):
             self.select_case(selected_id)
 
     def select_case(self, case_id: int):
-        for row in range(self.table.rowCount()):
-            item = self.table.item(row, 0)
-            if item and int(item.text()) == case_id:
-                self.table.selectRow(row)
-                break
+        select_row_by_id(self.table, case_id)
 
         self.matter_combo.blockSignals(True)
         for i in range(self.matter_combo.count()):
@@ -263,32 +296,25 @@ class CaseWidget(QWidget):
             recent_county_queries=self.recent_county_queries
         )
         if dialog.exec():
-            case = dialog.get_case()
-            client = dialog.get_client()
-            party_designation = dialog.get_party_designation()
-
-            if dialog.is_creating_new_client():
-                client_id = self.person_queries.create(client)
-            else:
-                client_id = client.id
+            self.query_runner.write(
+                "cases.create", create_case, dialog.get_case(), dialog.get_client(),
+                dialog.get_party_designation(), dialog.is_creating_new_client(),
+                on_result=self.on_case_saved
+            )
 
-            case_id = self.case_queries.create_with_client(case, client_id, party_designation)
-            self.refresh()
-            self.select_case(case_id)
-            self.show_closed_changed.emit(self.show_closed_checkbox.isChecked())
+    def on_case_saved(self, case_id: int):
+        self.refresh(select_id=case_id)
+        self.show_closed_changed.emit(self.show_closed_checkbox.isChecked())
 
     def edit_case(self):
         case_id = self.get_selected_case_id()
         if not case_id:
             return
+        self.query_runner.run("cases.edit", load_case_for_edit, case_id,
+                              on_result=lambda result: self.show_edit_dialog(case_id, *result))
 
-        case = self.case_queries.get_by_id(case_id)
+    def show_edit_dialog(self, case_id: int, case, client_party_designation: str):
         if case:
-            client_info = self.case_person_queries.get_by_role(case_id, 'client')
-            client_party_designation = None
-            if client_info:
-                client_party_designation = client_info[0].get('party_designation')
-
             dialog = CaseDialog(
                 parent=self, 
                 case_queries=self.case_queries,
@@ -300,22 +326,16 @@ class CaseWidget(QWidget):
             if dialog.exec():
                 updated_case = dialog.get_case()
                 updated_case.id = case_id
-                self.case_queries.update(updated_case)
-                
-                new_party_designation = dialog.get_party_designation()
-                self.case_person_queries.update_client_designation(case_id, new_party_designation)
-
-                self.refresh()
-                self.select_case(case_id)
-                self.show_closed_changed.emit(self.show_closed_checkbox.isChecked())
+                self.query_runner.write("cases.update", update_case, updated_case, dialog.get_party_designation(),
+                                        on_result=lambda _: self.on_case_saved(case_id))
 
     def delete_case(self):
         case_id = self.get_selected_case_id()
         if not case_id:
             return
 
-        case = self.case_queries.get_by_id(case_id)
-        case_name = case.case_name if case else "this matter"
+        values = self.get_case_values(case_id)
+        case_name = values[1] if values and values[1] else "this matter"
 
         reply = QMessageBox.question(
             self, "Confirm Delete",
@@ -325,7 +345,6 @@ class CaseWidget(QWidget):
         )
 
         if reply == QMessageBox.Yes:
-            self.case_queries.delete(case_id)
             self.detail_widget.set_case(None)
-            self.refresh()
-            self.show_closed_changed.emit(self.show_closed_checkbox.isChecked())
\ No newline at end of file
+            self.query_runner.write("cases.delete", lambda queries: queries.cases.delete(case_id),
+                                    on_result=lambda _: self.on_case_saved(None))
\ No newline at end of file
@@ -0,0 +1,221 @@
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QPushButton, QLabel, QGroupBox,
+    QTableWidget, QTableWidgetItem, QHeaderView, QSplitter, QCheckBox, QMessageBox
+)
+from PySide6.QtCore import Qt, QTimer
+from core.diagnostics import load_database_stats, process_memory, format_bytes
+from core.instrumentation import cache_counters, normalize_sql
+from core.queries import QuerySet
+from core.tracing import TRACE_SETTING, tracer, new_trace_path
+from core.utils import get_app_path
+from gui.action_profiler import PROFILE_SHORTCUT
+from gui.query_runner import QueryRunner
+
+
+REFRESH_INTERVAL_MS = 2000
+DATABASE_REFRESH_INTERVAL_MS = 30000
+HISTOGRAM_BAR_WIDTH = 40
+SLOWEST_ACTION_COUNT = 15
+
+
+def make_table(headers: list) -> QTableWidget:
+    table = QTableWidget(0, len(headers))
+    table.setHorizontalHeaderLabels(headers)
+    table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+    table.horizontalHeader().setStretchLastSection(True)
+    table.verticalHeader().setVisible(False)
+    table.setEditTriggers(QTableWidget.NoEditTriggers)
+    table.setSelectionBehavior(QTableWidget.SelectRows)
+    table.setAlternatingRowColors(True)
+    return table
+
+
+def fill_table(table: QTableWidget, rows: list, numeric_columns=()):
+    table.setRowCount(len(rows))
+    for row_idx, values in enumerate(rows):
+        for col_idx, value in enumerate(values):
+            item = QTableWidgetItem(str(value))
+            if col_idx in numeric_columns:
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            table.setItem(row_idx, col_idx, item)
+
+
+def format_rate(counter) -> str:
+    rate = counter.hit_rate
+    return "--" if rate is None else f"{rate:.1%}"
+
+
+class DiagnosticsWidget(QWidget):
+    def __init__(self, instrument, db=None, query_runner=None, app_settings=None, action_profiler=None):
+        super().__init__()
+        self.instrument = instrument
+        self.db = db
+        self.app_settings = app_settings
+        self.action_profiler = action_profiler
+        self.query_runner = query_runner or QueryRunner(queries=QuerySet(db))
+        self.setup_ui()
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(REFRESH_INTERVAL_MS)
+        self.timer.timeout.connect(self.refresh_live)
+        self.database_timer = QTimer(self)
+        self.database_timer.setInterval(DATABASE_REFRESH_INTERVAL_MS)
+        self.database_timer.timeout.connect(self.refresh_database)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        summary_layout = QHBoxLayout()
+        self.statements_label = QLabel()
+        self.slow_label = QLabel()
+        self.memory_label = QLabel()
+        self.wal_label = QLabel()
+        for label in (self.statements_label, self.slow_label, self.memory_label, self.wal_label):
+            label.setStyleSheet("font-weight: bold;")
+            summary_layout.addWidget(label)
+            summary_layout.addSpacing(20)
+        summary_layout.addStretch()
+        self.trace_checkbox = QCheckBox("Record Trace")
+        self.trace_checkbox.setToolTip("Record a Chrome trace (open in Perfetto or chrome://tracing)")
+        self.trace_checkbox.setChecked(tracer.enabled)
+        self.trace_checkbox.toggled.connect(self.on_trace_toggled)
+        summary_layout.addWidget(self.trace_checkbox)
+        if self.action_profiler is not None:
+            self.profile_btn = QPushButton("Profile Next Action")
+            self.profile_btn.setCheckable(True)
+            self.profile_btn.setToolTip(f"Capture cProfile and tracemalloc data for the next click ({PROFILE_SHORTCUT})")
+            self.profile_btn.clicked.connect(self.action_profiler.toggle)
+            self.action_profiler.armed_changed.connect(self.profile_btn.setChecked)
+            summary_layout.addWidget(self.profile_btn)
+        self.refresh_btn = QPushButton("Refresh")
+        self.refresh_btn.clicked.connect(self.refresh)
+        summary_layout.addWidget(self.refresh_btn)
+        self.reset_btn = QPushButton("Reset Counters")
+        self.reset_btn.clicked.connect(self.reset_counters)
+        summary_layout.addWidget(self.reset_btn)
+        layout.addLayout(summary_layout)
+
+        splitter = QSplitter(Qt.Vertical)
+
+        top = QWidget()
+        top_layout = QGridLayout(top)
+        top_layout.setContentsMargins(0, 0, 0, 0)
+
+        latency_group = QGroupBox("Query Latency")
+        latency_layout = QVBoxLayout(latency_group)
+        self.latency_table = make_table(["Latency", "Statements", "Distribution"])
+        latency_layout.addWidget(self.latency_table)
+        top_layout.addWidget(latency_group, 0, 0)
+
+        cache_group = QGroupBox("Caches")
+        cache_layout = QVBoxLayout(cache_group)
+        self.cache_table = make_table(["Cache", "Hits", "Misses", "Hit Rate"])
+        cache_layout.addWidget(self.cache_table)
+        top_layout.addWidget(cache_group, 0, 1)
+        splitter.addWidget(top)
+
+        actions_group = QGroupBox("Slowest Recent Actions")
+        actions_layout = QVBoxLayout(actions_group)
+        self.actions_table = make_table(["Action", "Statements", "Query Time (ms)", "N+1 Patterns", "Slowest Statement"])
+        actions_layout.addWidget(self.actions_table)
+        splitter.addWidget(actions_group)
+
+        database_group = QGroupBox("Database")
+        database_layout = QVBoxLayout(database_group)
+        self.database_label = QLabel("Loading database statistics...")
+        database_layout.addWidget(self.database_label)
+        self.database_table = make_table(["Object", "Type", "Pages", "Size"])
+        database_layout.addWidget(self.database_table)
+        splitter.addWidget(database_group)
+
+        layout.addWidget(splitter)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.timer.start()
+        self.database_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.timer.stop()
+        self.database_timer.stop()
+
+    def refresh(self):
+        self.refresh_live()
+        self.refresh_database()
+
+    def reset_counters(self):
+        self.instrument.reset()
+        for counter in cache_counters.values():
+            counter.hits = counter.misses = 0
+        normalize_sql.cache_clear()
+        self.refresh_live()
+
+    def on_trace_toggled(self, checked: bool):
+        if self.app_settings is not None:
+            self.app_settings.save_value(TRACE_SETTING, checked)
+        if checked:
+            tracer.start(new_trace_path(get_app_path()))
+            return
+        try:
+            path = tracer.stop()
+        except OSError as e:
+            QMessageBox.warning(self, "Trace", f"Failed to write trace:\n{e}")
+            return
+        if path:
+            QMessageBox.information(self, "Trace", f"Trace saved to:\n{path}")
+
+    def refresh_live(self):
+        histogram = self.instrument.latency_histogram()
+        total = sum(count for _, count in histogram)
+        self.statements_label.setText(f"Statements: {total}")
+        self.slow_label.setText(f"Slow (>= {self.instrument.slow_query_ms:.0f} ms): {self.instrument.slow_queries}")
+        memory = process_memory()
+        if memory["rss_bytes"] is not None:
+            self.memory_label.setText(f"Memory: {format_bytes(memory['rss_bytes'])}")
+        else:
+            self.memory_label.setText(f"Peak Memory: {format_bytes(memory['peak_bytes'])}")
+
+        peak = max((count for _, count in histogram), default=0)
+        fill_table(self.latency_table, [
+            (label, count, "█" * round(HISTOGRAM_BAR_WIDTH * count / peak) if peak else "")
+            for label, count in histogram
+        ], numeric_columns=(1,))
+
+        sql_cache = normalize_sql.cache_info()
+        cache_rows = [(counter.name, counter.hits, counter.misses, format_rate(counter))
+                      for counter in cache_counters.values()]
+        lookups = sql_cache.hits + sql_cache.misses
+        cache_rows.append(("SQL shapes", sql_cache.hits, sql_cache.misses,
+                           f"{sql_cache.hits / lookups:.1%}" if lookups else "--"))
+        fill_table(self.cache_table, cache_rows, numeric_columns=(1, 2, 3))
+
+        actions = sorted(self.instrument.actions(), key=lambda action: action.total_time, reverse=True)
+        rows = []
+        for action in actions[:SLOWEST_ACTION_COUNT]:
+            slowest = max(action.statements.values(), key=lambda stats: stats.max_time, default=None)
+            rows.append((
+                action.name, action.statement_count, f"{action.total_time * 1000.0:.1f}",
+                len(action.n_plus_one), slowest.sql if slowest else ""
+            ))
+        fill_table(self.actions_table, rows, numeric_columns=(1, 2, 3))
+
+    def refresh_database(self):
+        if self.db is None or not self.db.db_path:
+            self.database_label.setText("Database statistics are only available for a local database.")
+            return
+        self.query_runner.run("diagnostics.database", load_database_stats, on_result=self.on_database_stats_loaded)
+
+    def on_database_stats_loaded(self, stats: dict):
+        self.wal_label.setText(f"WAL: {format_bytes(stats['wal_bytes'])}")
+        self.database_label.setText(
+            f"File: {format_bytes(stats['file_bytes'])}    "
+            f"Pages: {stats['page_count']} x {format_bytes(stats['page_size'])}    "
+            f"Free pages: {stats['freelist_count']}    "
+            f"WAL: {format_bytes(stats['wal_bytes'])}"
+        )
+        fill_table(self.database_table, [
+            (obj["name"], obj["type"], "--" if obj["pages"] is None else obj["pages"], format_bytes(obj["bytes"]))
+            for obj in stats["objects"]
+        ], numeric_columns=(2, 3))
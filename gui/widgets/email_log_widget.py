@@ -1,8 +1,5 @@
-import re
 import os
 from datetime import datetime
-from email import policy
-from email.parser import BytesParser
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
     QTableWidgetItem, QFileDialog, QLabel, QComboBox,
@@ -11,17 +8,21 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, QUrl
 from PySide6.QtGui import QCursor, QDesktopServices
+from core.email_log import read_email_message, get_attachment_names, email_record_key, import_eml_files
+from core.queries import QuerySet
 from gui.dialogs.quick_billing_dialog import QuickBillingDialog
+from gui.query_runner import QueryRunner
 from gui.widgets.date_filter_widget import DateFilterWidget
 
 
 class EmailLogWidget(QWidget):
 
-    def __init__(self, case_queries, billing_queries, app_settings=None):
+    def __init__(self, case_queries, billing_queries, app_settings=None, query_runner=None):
         super().__init__()
         self.case_queries = case_queries
         self.billing_queries = billing_queries
         self.app_settings = app_settings
+        self.query_runner = query_runner or QueryRunner(queries=QuerySet(billing_queries.db))
         self._loading = False
         self.records = []
 
@@ -141,8 +142,10 @@ class EmailLogWidget(QWidget):
 
         if dialog.exec():
             entry_data = dialog.get_entry_data()
-            self.billing_queries.create_from_dict(entry_data)
-            QMessageBox.information(self, "Success", "Billing entry added successfully.")
+            self.query_runner.write(
+                "billing.create_from_dict", lambda queries: queries.billing.create_from_dict(entry_data),
+                on_result=lambda _: QMessageBox.information(self, "Success", "Billing entry added successfully.")
+            )
 
     def open_email(self, row):
         file_path_item = self.table.item(row, 6)
@@ -171,8 +174,7 @@ class EmailLogWidget(QWidget):
 
     def display_email(self, file_path):
         try:
-            with open(file_path, 'rb') as f:
-                msg = BytesParser(policy=policy.default).parse(f)
+            msg = read_email_message(file_path)
             output = []
             output.append(f"From: {msg.get('From', '')}")
             output.append(f"To: {msg.get('To', '')}")
@@ -202,12 +204,7 @@ class EmailLogWidget(QWidget):
                         except Exception:
                             output.append("[Could not decode text/html content]")
                         break
-            attachments = []
-            for part in msg.walk():
-                if part.get_content_disposition() == 'attachment':
-                    filename = part.get_filename()
-                    if filename:
-                        attachments.append(filename)
+            attachments = get_attachment_names(msg)
             if attachments:
                 output.append("")
                 output.append("=" * 60)
@@ -219,71 +216,6 @@ class EmailLogWidget(QWidget):
         except Exception as e:
             self.email_viewer.setPlainText(f"Error loading email:\n{str(e)}")
 
-    def normalize_email(self, email):
-        if not email:
-            return ""
-        return re.sub(r'[^a-zA-Z0-9@.;]', '', email.lower())
-
-    def extract_email_addresses(self, text):
-        if not text:
-            return ""
-        all_emails = re.findall(r'[\w\.-]+@[\w\.-]+\.\w+', str(text), re.IGNORECASE)
-        seen = set()
-        unique_emails = []
-        for email in all_emails:
-            lower = email.lower()
-            if lower not in seen:
-                seen.add(lower)
-                unique_emails.append(lower)
-        return "; ".join(unique_emails)
-
-    def parse_email_date(self, date_str):
-        if not date_str:
-            return "", ""
-        date_formats = [
-            "%a, %d %b %Y %H:%M:%S %z",
-            "%a, %d %b %Y %H:%M:%S %Z",
-            "%d %b %Y %H:%M:%S %z",
-            "%a, %d %b %Y %H:%M:%S",
-            "%d %b %Y %H:%M:%S",
-        ]
-        clean_date = re.sub(r'\s+\([^)]+\)', '', str(date_str)).strip()
-        for fmt in date_formats:
-            try:
-                dt = datetime.strptime(clean_date, fmt)
-                return dt.strftime("%Y-%m-%d %H:%M:%S"), dt.strftime("%Y-%m-%d")
-            except ValueError:
-                continue
-        return str(date_str), str(date_str)[:10] if len(str(date_str)) >= 10 else str(date_str)
-
-    def parse_eml_file(self, file_path):
-        with open(file_path, 'rb') as f:
-            msg = BytesParser(policy=policy.default).parse(f)
-        date_str = msg.get('Date', '')
-        email_datetime, email_date = self.parse_email_date(date_str)
-        sender = self.extract_email_addresses(msg.get('From', ''))
-        recipients = self.extract_email_addresses(msg.get('To', ''))
-        cc = self.extract_email_addresses(msg.get('Cc', ''))
-        subject = msg.get('Subject', '') or ''
-        attachments_list = []
-        for part in msg.walk():
-            content_disposition = part.get_content_disposition()
-            if content_disposition == 'attachment':
-                filename = part.get_filename()
-                if filename:
-                    attachments_list.append(filename)
-        attachments = "; ".join(attachments_list)
-        return {
-            'file_path': os.path.abspath(file_path),
-            'email_datetime': email_datetime,
-            'email_date': email_date,
-            'sender': sender,
-            'recipients': recipients,
-            'cc': cc,
-            'subject': subject,
-            'attachments': attachments
-        }
-
     def load_eml_files(self):
         file_paths, _ = QFileDialog.getOpenFileNames(self, "Open EML Files", "", "EML Files (*.eml)")
         if not file_paths:
@@ -292,28 +224,10 @@ class EmailLogWidget(QWidget):
         self._loading = True
 
         try:
-            total_loaded = 0
-            total_duplicates = 0
-            failed_files = []
-
-            existing_keys = set()
-            for record in self.records:
-                key = f"{record['email_datetime']}|{record['sender']}|{record['subject']}"
-                existing_keys.add(key)
-
-            for file_path in file_paths:
-                try:
-                    record = self.parse_eml_file(file_path)
-                    if record:
-                        key = f"{record['email_datetime']}|{record['sender']}|{record['subject']}"
-                        if key in existing_keys:
-                            total_duplicates += 1
-                        else:
-                            existing_keys.add(key)
-                            self.records.append(record)
-                            total_loaded += 1
-                except Exception as e:
-                    failed_files.append(f"{os.path.basename(file_path)}: {str(e)}")
+            existing_keys = {email_record_key(record) for record in self.records}
+            new_records, total_duplicates, failed_files = import_eml_files(file_paths, existing_keys)
+            self.records.extend(new_records)
+            total_loaded = len(new_records)
 
         finally:
             self._loading = False
@@ -1,29 +1,74 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QMessageBox, QLabel, QGroupBox, QTableWidget, QTableWidgetItem,
-    QSplitter, QFrame
+    QMessageBox, QLabel, QGroupBox, QTableView,
+    QSplitter, QFrame, QFileDialog
 )
 from PySide6.QtCore import Qt
 from datetime import date
 from core.models import BillingEntry
-from core.queries import BillingQueries, CaseQueries, PersonQueries, PaymentQueries, CasePersonQueries
+from core.queries import BillingQueries, CaseQueries, PersonQueries, PaymentQueries, CasePersonQueries, QuerySet
 from core.utils import format_matter_display
+from core.ledes import export_ledes
+from core.snapshot import snapshot_key, load_snapshot_values
 from gui.dialogs.billing_dialog import BillingDialog
 from gui.dialogs.payment_dialog import PaymentDialog
+from gui.dialogs.ledes_export_dialog import LedesExportDialog
 from gui.widgets.styled_combo_box import StyledComboBox
 from gui.widgets.base_table_widget import get_selected_row_id, configure_billing_table
+from gui.widgets.table_model import PAGE_SIZE, fetch_pages
+from gui.query_runner import QueryRunner
 from gui.utils import show_table_context_menu, format_currency_balance, load_combo_with_items
 
 
+def format_dollars(cents) -> str:
+    return f"${(cents or 0) / 100:.2f}"
+
+
+def load_matter_billing(queries, case_id: int, min_rows: int = 0) -> dict:
+    first_page, payments, billing_totals, payment_totals = queries.call_many([
+        ("billing", "get_page_by_case", (case_id, None, PAGE_SIZE)),
+        ("payments", "get_by_case", (case_id,)),
+        ("billing", "get_case_totals", (case_id,)),
+        ("payments", "get_case_payment_totals", (case_id,)),
+    ])
+    entries, has_more = fetch_pages(
+        lambda after, limit: queries.billing.get_page_by_case(case_id, after, limit), min_rows,
+        first_page=first_page
+    )
+    return {
+        'case_id': case_id,
+        'entries': entries,
+        'has_more': has_more,
+        'payments': payments,
+        'billing_totals': billing_totals,
+        'payment_totals': payment_totals,
+    }
+
+
+def export_ledes_file(queries, file_path: str, options: dict) -> int:
+    return export_ledes(file_path, queries.billing, **options)
+
+
+def duplicate_billing_entry(queries, entry_id: int):
+    entry = queries.billing.get_by_id(entry_id)
+    if entry:
+        queries.billing.create(BillingEntry(
+            case_id=entry.case_id, entry_date=date.today(),
+            hours=entry.hours, is_expense=entry.is_expense,
+            amount_cents=entry.amount_cents, description=entry.description
+        ))
+
+
 class MatterBillingWidget(QWidget):
 
     BILLING_HEADERS = ["ID", "Date", "Type", "Hours", "Amount", "Description"]
     PAYMENT_HEADERS = ["ID", "Date", "Fees", "Expenses", "Total", "Description"]
+    CENTERED_COLUMNS = {col: Qt.AlignCenter for col in (1, 2, 3, 4)}
 
     def __init__(self, billing_queries: BillingQueries, payment_queries: PaymentQueries,
                  case_queries: CaseQueries, person_queries: PersonQueries,
                  case_person_queries: CasePersonQueries, get_show_closed_callback=None,
-                 app_settings=None):
+                 app_settings=None, snapshot=None, query_runner=None):
         super().__init__()
         self.billing_queries = billing_queries
         self.payment_queries = payment_queries
@@ -32,12 +77,14 @@ class MatterBillingWidget(QWidget):
         self.case_person_queries = case_person_queries
         self.get_show_closed = get_show_closed_callback or (lambda: True)
         self.app_settings = app_settings
+        self.snapshot = snapshot
+        self.query_runner = query_runner or QueryRunner(queries=QuerySet(case_queries.db))
         self.selected_client_id = None
         self.selected_matter = None
         self.billing_rate_cents = 0
         self.setup_ui()
-        self.load_matters_combo()
-        self.update_grand_totals()
+        if not self.apply_snapshot():
+            self.refresh()
 
     def _create_balance_display(self, layout, label_text, is_large=False):
         layout.addWidget(QLabel(f"{label_text}:"))
@@ -50,7 +97,7 @@ class MatterBillingWidget(QWidget):
         return value_label
 
     def _create_table_group(self, title, headers, add_text, add_callback,
-                            edit_callback, context_callback):
+                            edit_callback, context_callback, display_formatters):
         group = QGroupBox(title)
         layout = QVBoxLayout(group)
 
@@ -62,13 +109,14 @@ class MatterBillingWidget(QWidget):
         btn_layout.addStretch()
         layout.addLayout(btn_layout)
 
-        table = QTableWidget()
-        configure_billing_table(table, headers)
+        table = QTableView()
+        model = configure_billing_table(table, headers, display_formatters=display_formatters,
+                                        alignments=self.CENTERED_COLUMNS)
         table.doubleClicked.connect(edit_callback)
         table.customContextMenuRequested.connect(context_callback)
         layout.addWidget(table)
 
-        return group, table, add_btn
+        return group, table, model, add_btn
 
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -91,6 +139,9 @@ class MatterBillingWidget(QWidget):
         selection_layout.addSpacing(10)
         self.grand_total_label = self._create_balance_display(selection_layout, "Total")
         selection_layout.addStretch()
+        self.export_ledes_btn = QPushButton("Export LEDES...")
+        self.export_ledes_btn.clicked.connect(self.export_ledes)
+        selection_layout.addWidget(self.export_ledes_btn)
         layout.addLayout(selection_layout)
 
         self.info_frame = QFrame()
@@ -116,15 +167,17 @@ class MatterBillingWidget(QWidget):
 
         self.splitter = QSplitter(Qt.Vertical)
 
-        billing_group, self.billing_table, self.add_billing_btn = self._create_table_group(
+        billing_group, self.billing_table, self.billing_model, self.add_billing_btn = self._create_table_group(
             "Billing Entries", self.BILLING_HEADERS, "Add Entry",
-            self.add_billing_entry, self.edit_billing_entry, self.show_billing_context_menu
+            self.add_billing_entry, self.edit_billing_entry, self.show_billing_context_menu,
+            {3: lambda hours: "--" if hours is None else f"{hours:.1f}", 4: format_dollars}
         )
         self.splitter.addWidget(billing_group)
 
-        payment_group, self.payment_table, self.add_payment_btn = self._create_table_group(
+        payment_group, self.payment_table, self.payment_model, self.add_payment_btn = self._create_table_group(
             "Payments", self.PAYMENT_HEADERS, "Add Payment",
-            self.add_payment, self.edit_payment, self.show_payment_context_menu
+            self.add_payment, self.edit_payment, self.show_payment_context_menu,
+            {2: format_dollars, 3: format_dollars, 4: format_dollars}
         )
         self.splitter.addWidget(payment_group)
 
@@ -137,6 +190,35 @@ class MatterBillingWidget(QWidget):
         if self.app_settings:
             self.app_settings.save_splitter_state("billing_widget", self.splitter)
 
+    def export_ledes(self):
+        dialog = LedesExportDialog(self, matter=self.selected_matter, app_settings=self.app_settings)
+        if not dialog.exec():
+            return
+        dialog.save_settings()
+        options = dialog.get_options()
+
+        default_filename = f"LEDES_{options['case_id'] or 'all'}_{date.today():%Y%m%d}.txt"
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Save LEDES File", default_filename, "LEDES Files (*.txt);;All Files (*)"
+        )
+        if not file_path:
+            return
+
+        self.export_ledes_btn.setEnabled(False)
+        self.query_runner.run(
+            "billing.ledes_export", export_ledes_file, file_path, options,
+            on_result=lambda count: self.on_ledes_exported(count, file_path),
+            on_error=self.on_ledes_export_failed
+        )
+
+    def on_ledes_exported(self, count: int, file_path: str):
+        self.export_ledes_btn.setEnabled(True)
+        QMessageBox.information(self, "Success", f"Exported {count} line items to:\n{file_path}")
+
+    def on_ledes_export_failed(self, error: Exception):
+        self.export_ledes_btn.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Failed to export LEDES file:\n{str(error)}")
+
     def show_billing_context_menu(self, position):
         entry_id = self.get_selected_billing_id()
         if not entry_id:
@@ -164,21 +246,21 @@ class MatterBillingWidget(QWidget):
 
     def duplicate_billing_entry(self):
         entry_id = self.get_selected_billing_id()
-        if not entry_id:
-            return
-        entry = self.billing_queries.get_by_id(entry_id)
-        if entry:
-            new_entry = BillingEntry(
-                case_id=entry.case_id, entry_date=date.today(),
-                hours=entry.hours, is_expense=entry.is_expense,
-                amount_cents=entry.amount_cents, description=entry.description
-            )
-            self.billing_queries.create(new_entry)
-            self._refresh_after_change()
-
-    def load_matters_combo(self):
+        if entry_id:
+            self._write_then_refresh("billing.create", lambda queries: duplicate_billing_entry(queries, entry_id))
+
+    def apply_snapshot(self) -> bool:
+        if self.snapshot is None:
+            return False
         include_closed = self.get_show_closed()
-        matters = self.case_queries.get_all_with_client(include_closed=include_closed)
+        matters = self.snapshot.get(snapshot_key("cases", include_closed))
+        totals = self.snapshot.get(snapshot_key("grand_totals", include_closed))
+        if matters is None or totals is None:
+            return False
+        self.show_matters(matters, totals)
+        return True
+
+    def load_matters_combo(self, matters: list):
         load_combo_with_items(
             self.matter_combo, matters,
             lambda m: (format_matter_display(m, include_client=True), m),
@@ -189,23 +271,23 @@ class MatterBillingWidget(QWidget):
         self.add_billing_btn.setEnabled(enabled)
         self.add_payment_btn.setEnabled(enabled)
 
-    def _calculate_all_balances(self):
+    def _load_snapshot_keys(self, request_key: str, names: list, on_values):
         include_closed = self.get_show_closed()
-        matters = self.case_queries.get_all_with_client(include_closed=include_closed)
-        total_fees, total_expenses = 0, 0
+        keys = [snapshot_key(name, include_closed) for name in names]
+
+        def on_result(result):
+            data_version, values = result
+            if self.snapshot is not None:
+                self.snapshot.record_values(data_version, values)
+            on_values(*(values[key] for key in keys))
 
-        for matter in matters:
-            case_id = matter.get('id')
-            if case_id:
-                bt = self.billing_queries.get_case_totals(case_id)
-                pt = self.payment_queries.get_case_payment_totals(case_id)
-                total_fees += (pt.get("total_fee_payments_cents", 0) - bt.get("total_time_cents", 0))
-                total_expenses += (pt.get("total_expense_payments_cents", 0) - bt.get("total_expense_cents", 0))
+        self.query_runner.run(request_key, load_snapshot_values, keys, on_result=on_result)
 
-        return total_fees, total_expenses
+    def refresh_grand_totals(self):
+        self._load_snapshot_keys("billing.grand_totals", ["grand_totals"], self.update_grand_totals)
 
-    def update_grand_totals(self):
-        fees, expenses = self._calculate_all_balances()
+    def update_grand_totals(self, totals: dict):
+        fees, expenses = totals["fee_balance_cents"], totals["expense_balance_cents"]
         for label, value in [(self.grand_fees_label, fees), 
                              (self.grand_expenses_label, expenses),
                              (self.grand_total_label, fees + expenses)]:
@@ -224,8 +306,10 @@ class MatterBillingWidget(QWidget):
             for label in [self.fee_balance_label, self.expense_balance_label, self.total_balance_label]:
                 label.setText("--")
                 label.setStyleSheet("font-weight: bold;")
-            self.billing_table.setRowCount(0)
-            self.payment_table.setRowCount(0)
+            self.query_runner.cancel("billing.matter")
+            self.set_matter_loading(False)
+            self.billing_model.clear()
+            self.payment_model.clear()
             self.update_button_states(False)
             return
 
@@ -241,17 +325,41 @@ class MatterBillingWidget(QWidget):
         self.rate_label.setText(f"Rate: ${self.billing_rate_cents / 100:.2f}/hr")
 
         self.update_button_states(True)
-        self.load_billing_entries()
-        self.load_payments()
-        self.update_matter_totals()
+        self.load_matter_data(keep_loaded=False)
 
-    def update_matter_totals(self):
+    def set_matter_loading(self, loading: bool):
+        self.billing_table.setEnabled(not loading)
+        self.payment_table.setEnabled(not loading)
+        if loading:
+            for label in [self.fee_balance_label, self.expense_balance_label, self.total_balance_label]:
+                label.setText("Loading...")
+
+    def load_matter_data(self, keep_loaded: bool = True):
         if not self.selected_matter:
             return
+        if not keep_loaded:
+            self.billing_model.clear()
+            self.payment_model.clear()
+        self.set_matter_loading(True)
+        self.query_runner.run(
+            "billing.matter", load_matter_billing, self.selected_matter["id"],
+            self.billing_model.rowCount(), on_result=self.on_matter_data_loaded
+        )
 
-        bt = self.billing_queries.get_case_totals(self.selected_matter["id"])
-        pt = self.payment_queries.get_case_payment_totals(self.selected_matter["id"])
+    def on_matter_data_loaded(self, data: dict):
+        if not self.selected_matter or self.selected_matter["id"] != data['case_id']:
+            return
+        self.set_matter_loading(False)
+        case_id = data['case_id']
+        self.billing_model.show_pages(
+            data['entries'], data['has_more'],
+            lambda after, limit: self.billing_queries.get_page_by_case(case_id, after, limit),
+            self.billing_row_values, query_runner=self.query_runner
+        )
+        self.payment_model.sync([self.payment_row_values(payment) for payment in data['payments']])
+        self.update_matter_totals(data['billing_totals'], data['payment_totals'])
 
+    def update_matter_totals(self, bt: dict, pt: dict):
         fee_balance = pt.get("total_fee_payments_cents", 0) - bt.get("total_time_cents", 0)
         expense_balance = pt.get("total_expense_payments_cents", 0) - bt.get("total_expense_cents", 0)
 
@@ -262,71 +370,21 @@ class MatterBillingWidget(QWidget):
             label.setText(text)
             label.setStyleSheet(style)
 
-    def _populate_billing_row(self, row, entry):
-        is_expense = entry.get("is_expense", 0)
-        hours = entry.get("hours") or 0
-        rate = (entry.get("billing_rate_cents") or self.billing_rate_cents) / 100.0
-
-        if is_expense:
-            amount = (entry.get("amount_cents") or 0) / 100.0
-            entry_type, hours_display = "Expense", "--"
+    def billing_row_values(self, entry: dict) -> list:
+        if entry.get("is_expense", 0):
+            entry_type, hours, amount_cents = "Expense", None, entry.get("amount_cents") or 0
         else:
-            amount = hours * rate
-            entry_type, hours_display = "Time", f"{hours:.1f}"
-
-        items = [
-            (str(entry["id"]), None),
-            (str(entry.get("entry_date")), Qt.AlignCenter),
-            (entry_type, Qt.AlignCenter),
-            (hours_display, Qt.AlignCenter),
-            (f"${amount:.2f}", Qt.AlignCenter),
-            (entry.get("description") or "", None)
-        ]
-        for col, (text, alignment) in enumerate(items):
-            item = QTableWidgetItem(text)
-            if alignment:
-                item.setTextAlignment(alignment)
-            self.billing_table.setItem(row, col, item)
+            hours = entry.get("hours") or 0
+            rate_cents = entry.get("billing_rate_cents") or self.billing_rate_cents
+            entry_type, amount_cents = "Time", hours * rate_cents
+        return [entry["id"], str(entry.get("entry_date")), entry_type, hours, amount_cents,
+                entry.get("description") or ""]
 
-    def load_billing_entries(self):
-        if not self.selected_matter:
-            return
-        entries = self.billing_queries.get_by_case(self.selected_matter["id"])
-        self.billing_table.setSortingEnabled(False)
-        self.billing_table.setRowCount(len(entries))
-        for row, entry in enumerate(entries):
-            self._populate_billing_row(row, entry)
-        self.billing_table.setSortingEnabled(True)
-        self.billing_table.resizeRowsToContents()
-
-    def _populate_payment_row(self, row, payment):
+    def payment_row_values(self, payment: dict) -> list:
         fee_cents = payment.get("amount_cents") or 0
         expense_cents = payment.get("expense_amount_cents") or 0
-        
-        items = [
-            (str(payment["id"]), None),
-            (str(payment["payment_date"]), Qt.AlignCenter),
-            (f"${fee_cents / 100:.2f}", Qt.AlignCenter),
-            (f"${expense_cents / 100:.2f}", Qt.AlignCenter),
-            (f"${(fee_cents + expense_cents) / 100:.2f}", Qt.AlignCenter),
-            (payment.get("notes") or "", None)
-        ]
-        for col, (text, alignment) in enumerate(items):
-            item = QTableWidgetItem(text)
-            if alignment:
-                item.setTextAlignment(alignment)
-            self.payment_table.setItem(row, col, item)
-
-    def load_payments(self):
-        if not self.selected_matter:
-            return
-        payments = self.payment_queries.get_by_case(self.selected_matter["id"])
-        self.payment_table.setSortingEnabled(False)
-        self.payment_table.setRowCount(len(payments))
-        for row, payment in enumerate(payments):
-            self._populate_payment_row(row, payment)
-        self.payment_table.setSortingEnabled(True)
-        self.payment_table.resizeRowsToContents()
+        return [payment["id"], str(payment["payment_date"]), fee_cents, expense_cents,
+                fee_cents + expense_cents, payment.get("notes") or ""]
 
     def get_selected_billing_id(self):
         return get_selected_row_id(self.billing_table)
@@ -335,10 +393,8 @@ class MatterBillingWidget(QWidget):
         return get_selected_row_id(self.payment_table)
 
     def _refresh_after_change(self):
-        self.load_billing_entries()
-        self.load_payments()
-        self.update_matter_totals()
-        self.update_grand_totals()
+        self.load_matter_data()
+        self.refresh_grand_totals()
 
     def add_billing_entry(self):
         if not self.selected_matter:
@@ -346,23 +402,24 @@ class MatterBillingWidget(QWidget):
         dialog = BillingDialog(self, self.case_queries, case_id=self.selected_matter["id"],
                                billing_rate_cents=self.billing_rate_cents)
         if dialog.exec():
-            self.billing_queries.create(dialog.get_entry())
-            self._refresh_after_change()
+            entry = dialog.get_entry()
+            self._write_then_refresh("billing.create", lambda queries: queries.billing.create(entry))
 
     def edit_billing_entry(self):
         entry_id = self.get_selected_billing_id()
-        if not entry_id:
-            return
-        entry = self.billing_queries.get_by_id(entry_id)
-        if entry:
+        if entry_id:
+            self.query_runner.run("billing.edit", lambda queries: queries.billing.get_by_id(entry_id),
+                                  on_result=lambda entry: self.show_billing_dialog(entry_id, entry))
+
+    def show_billing_dialog(self, entry_id: int, entry):
+        if entry and self.selected_matter:
             dialog = BillingDialog(self, self.case_queries, entry=entry,
                                    case_id=self.selected_matter["id"],
                                    billing_rate_cents=self.billing_rate_cents)
             if dialog.exec():
                 updated = dialog.get_entry()
                 updated.id = entry_id
-                self.billing_queries.update(updated)
-                self._refresh_after_change()
+                self._write_then_refresh("billing.update", lambda queries: queries.billing.update(updated))
 
     def delete_billing_entry(self):
         entry_id = self.get_selected_billing_id()
@@ -370,8 +427,7 @@ class MatterBillingWidget(QWidget):
             self, "Confirm Delete", "Are you sure you want to delete this billing entry?",
             QMessageBox.Yes | QMessageBox.No
         ) == QMessageBox.Yes:
-            self.billing_queries.delete(entry_id)
-            self._refresh_after_change()
+            self._write_then_refresh("billing.delete", lambda queries: queries.billing.delete(entry_id))
 
     def add_payment(self):
         if not self.selected_matter or not self.selected_client_id:
@@ -380,23 +436,24 @@ class MatterBillingWidget(QWidget):
                                client_id=self.selected_client_id,
                                case_id=self.selected_matter["id"])
         if dialog.exec():
-            self.payment_queries.create(dialog.get_payment())
-            self._refresh_after_change()
+            payment = dialog.get_payment()
+            self._write_then_refresh("payments.create", lambda queries: queries.payments.create(payment))
 
     def edit_payment(self):
         payment_id = self.get_selected_payment_id()
-        if not payment_id:
-            return
-        payment = self.payment_queries.get_by_id(payment_id)
-        if payment:
+        if payment_id:
+            self.query_runner.run("payments.edit", lambda queries: queries.payments.get_by_id(payment_id),
+                                  on_result=lambda payment: self.show_payment_dialog(payment_id, payment))
+
+    def show_payment_dialog(self, payment_id: int, payment):
+        if payment and self.selected_matter:
             dialog = PaymentDialog(self, self.person_queries, self.case_queries,
                                    payment=payment, client_id=self.selected_client_id,
                                    case_id=self.selected_matter["id"])
             if dialog.exec():
                 updated = dialog.get_payment()
                 updated.id = payment_id
-                self.payment_queries.update(updated)
-                self._refresh_after_change()
+                self._write_then_refresh("payments.update", lambda queries: queries.payments.update(updated))
 
     def delete_payment(self):
         payment_id = self.get_selected_payment_id()
@@ -404,13 +461,18 @@ class MatterBillingWidget(QWidget):
             self, "Confirm Delete", "Are you sure you want to delete this payment?",
             QMessageBox.Yes | QMessageBox.No
         ) == QMessageBox.Yes:
-            self.payment_queries.delete(payment_id)
-            self._refresh_after_change()
+            self._write_then_refresh("payments.delete", lambda queries: queries.payments.delete(payment_id))
+
+    def _write_then_refresh(self, key: str, fn):
+        self.query_runner.write(key, fn, on_result=lambda _: self._refresh_after_change())
 
     def refresh(self):
+        self._load_snapshot_keys("billing.matters", ["cases", "grand_totals"], self.show_matters)
+
+    def show_matters(self, matters: list, totals: dict):
         current_id = self.selected_matter["id"] if self.selected_matter else None
-        self.load_matters_combo()
-        self.update_grand_totals()
+        self.load_matters_combo(matters)
+        self.update_grand_totals(totals)
         if current_id:
             for i in range(self.matter_combo.count()):
                 matter = self.matter_combo.itemData(i)
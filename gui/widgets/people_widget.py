@@ -4,10 +4,22 @@ from PySide6.QtWidgets import (
     QGroupBox, QSplitter
 )
 from PySide6.QtCore import Qt
-from core.queries import PersonQueries, CaseQueries, CasePersonQueries
+from core.queries import PersonQueries, CaseQueries, CasePersonQueries, QuerySet
 from core.models import ROLE_DISPLAY_NAMES
 from gui.dialogs.person_dialog import PersonDialog
 from gui.widgets.base_table_widget import BaseTableWidget, configure_standard_table
+from gui.widgets.table_model import PAGE_SIZE, fetch_pages
+from gui.query_runner import QueryRunner
+
+
+def load_people(queries, min_rows: int = 0) -> tuple:
+    first_page, count = queries.call_many([("people", "get_page", (None, PAGE_SIZE)), ("people", "count")])
+    items, has_more = fetch_pages(queries.people.get_page, min_rows, first_page=first_page)
+    return items, has_more, count
+
+
+def load_person_cases(queries, person_id: int) -> tuple:
+    return person_id, queries.cases.get_cases_for_person(person_id)
 
 
 class PeopleWidget(BaseTableWidget):
@@ -15,11 +27,12 @@ class PeopleWidget(BaseTableWidget):
     case_headers = ["Case Number", "Case Name", "Role(s)", "Client"]
 
     def __init__(self, person_queries: PersonQueries, case_queries: CaseQueries,
-                 case_person_queries: CasePersonQueries):
+                 case_person_queries: CasePersonQueries, query_runner=None):
         super().__init__()
         self.person_queries = person_queries
         self.case_queries = case_queries
         self.case_person_queries = case_person_queries
+        self.query_runner = query_runner or QueryRunner(queries=QuerySet(person_queries.db))
         self.setup_ui()
         self.refresh()
 
@@ -37,7 +50,7 @@ class PeopleWidget(BaseTableWidget):
         list_layout.addLayout(self.create_button_row())
 
         self.table = self.create_table()
-        self.table.itemSelectionChanged.connect(self.on_person_selected)
+        self.table.selectionModel().selectionChanged.connect(self.on_person_selected)
         list_layout.addWidget(self.table)
 
         self.count_label = QLabel()
@@ -82,11 +95,18 @@ class PeopleWidget(BaseTableWidget):
         if person_id:
             self.load_person_cases(person_id)
         else:
+            self.query_runner.cancel("people.cases")
             self.cases_table.setRowCount(0)
             self.cases_count_label.setText("Select a person to view their cases")
 
     def load_person_cases(self, person_id: int):
-        cases = self.case_queries.get_cases_for_person(person_id)
+        self.cases_count_label.setText("Loading cases...")
+        self.query_runner.run("people.cases", load_person_cases, person_id, on_result=self.on_person_cases_loaded)
+
+    def on_person_cases_loaded(self, result: tuple):
+        person_id, cases = result
+        if person_id != self.get_selected_id():
+            return
 
         self.cases_table.setRowCount(len(cases))
 
@@ -108,15 +128,22 @@ class PeopleWidget(BaseTableWidget):
             self.cases_count_label.setText("Not involved in any cases")
 
     def refresh(self):
-        people = self.person_queries.get_all()
-        self.populate_table(people)
+        self.count_label.setText("Loading people...")
+        self.query_runner.run(
+            "people.list", load_people, self.table_model.rowCount(), on_result=self.on_people_loaded
+        )
+
+    def on_people_loaded(self, result: tuple):
+        items, has_more, total = result
+        self.populate_table_pages(items, has_more, self.person_queries.get_page, total,
+                                  query_runner=self.query_runner)
 
     def add_item(self):
         dialog = PersonDialog(self, self.person_queries)
         if dialog.exec():
             person = dialog.get_person()
-            self.person_queries.create(person)
-            self.refresh()
+            self.query_runner.write("people.create", lambda queries: queries.people.create(person),
+                                    on_result=lambda _: self.refresh())
 
     def edit_item(self):
         person_id = self.get_selected_id()
@@ -129,8 +156,8 @@ class PeopleWidget(BaseTableWidget):
             if dialog.exec():
                 updated_person = dialog.get_person()
                 updated_person.id = person_id
-                self.person_queries.update(updated_person)
-                self.refresh()
+                self.query_runner.write("people.update", lambda queries: queries.people.update(updated_person),
+                                        on_result=lambda _: self.refresh())
 
     def delete_item(self):
         person_id = self.get_selected_id()
@@ -152,7 +179,7 @@ class PeopleWidget(BaseTableWidget):
             confirmed = self.confirm_delete(f"Are you sure you want to delete '{person_name}'?")
 
         if confirmed:
-            self.person_queries.delete(person_id)
             self.cases_table.setRowCount(0)
             self.cases_count_label.setText("Select a person to view their cases")
-            self.refresh()
\ No newline at end of file
+            self.query_runner.write("people.delete", lambda queries: queries.people.delete(person_id),
+                                    on_result=lambda _: self.refresh())
\ No newline at end of file
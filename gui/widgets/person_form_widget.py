@@ -2,7 +2,7 @@ from PySide6.QtWidgets import (
     QWidget, QFormLayout, QLineEdit, QTextEdit, QGroupBox, QVBoxLayout
 )
 from core.models import Person
-from core.validators import validate_required_field, validate_multi_email_field, validate_multi_phone_field
+from gui.validators import validate_required_field, validate_multi_email_field, validate_multi_phone_field
 
 
 class PersonFormWidget(QWidget):
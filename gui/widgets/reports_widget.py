@@ -1,5 +1,3 @@
-import os
-import sys
 from datetime import date
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
@@ -8,35 +6,29 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QColor, QBrush
-
-try:
-    from docx import Document
-    from docx.shared import Inches, Pt
-    from docx.enum.text import WD_ALIGN_PARAGRAPH
-    from docx.enum.table import WD_TABLE_ALIGNMENT, WD_CELL_VERTICAL_ALIGNMENT
-    from docx.oxml.ns import qn
-    from docx.oxml import OxmlElement
-    HAS_DOCX = True
-except ImportError:
-    HAS_DOCX = False
+from core.reports import (
+    HAS_DOCX, REPORT_HEADERS, REPORT_TYPES, NUMERIC_COLUMN_START, generate_report_data,
+    calculate_report_totals, report_row_values, report_balance_cents, report_title,
+    report_filename, write_report_csv, build_report_document
+)
+from core.queries import QuerySet
+from core.tracing import tracer
+from core.utils import get_image_path
+from gui.query_runner import QueryRunner
 
 
-def get_image_path():
-    if getattr(sys, 'frozen', False):
-        return os.path.join(os.path.dirname(sys.executable), "law_image.jpg")
-    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "law_image.jpg")
+def load_report(queries, report_type: str, year: int = None, month: int = None,
+                include_closed: bool = True) -> tuple:
+    return generate_report_data(queries.reports, report_type, year, month, include_closed)
 
 
 class ReportsWidget(QWidget):
-    HEADERS = [
-        "Matter", "Client", "Status", "Hours", "Fees Billed", 
-        "Expenses Billed", "Total Billed", "Fee Payments", 
-        "Expense Payments", "Total Payments", "Balance"
-    ]
+    HEADERS = REPORT_HEADERS
 
-    def __init__(self, report_queries, get_show_closed_callback=None):
+    def __init__(self, report_queries, get_show_closed_callback=None, query_runner=None):
         super().__init__()
         self.report_queries = report_queries
+        self.query_runner = query_runner or QueryRunner(queries=QuerySet(report_queries.db))
         self.get_show_closed = get_show_closed_callback or (lambda: True)
         self.image_path = get_image_path()
         self.current_data = []
@@ -50,8 +42,8 @@ class ReportsWidget(QWidget):
 
         controls_layout.addWidget(QLabel("Report Type:"))
         self.report_type_combo = QComboBox()
-        self.report_type_combo.addItem("Monthly Billing Summary", "monthly")
-        self.report_type_combo.addItem("All-Time Summary", "all_time")
+        for key, label in REPORT_TYPES.items():
+            self.report_type_combo.addItem(label, key)
         self.report_type_combo.currentIndexChanged.connect(self.on_report_type_changed)
         controls_layout.addWidget(self.report_type_combo)
 
@@ -150,74 +142,42 @@ class ReportsWidget(QWidget):
         self.year_combo.setEnabled(is_monthly)
 
     def generate_report(self):
-        report_type = self.report_type_combo.currentData()
-        include_closed = self.include_closed_checkbox.isChecked()
-
-        if report_type == "monthly":
-            year = self.year_combo.currentData()
-            month = self.month_combo.currentData()
-            self.current_data = self.report_queries.get_monthly_billing_summary(year, month, include_closed)
-            totals = self.report_queries.get_period_totals(year, month, include_closed)
-        else:
-            self.current_data = self.report_queries.get_all_matters_summary(include_closed)
-            totals = self._calculate_totals(self.current_data)
-
-        self.populate_table(self.current_data)
-        self.update_totals(totals)
-
-    def _calculate_totals(self, data: list) -> dict:
-        totals = {
-            'total_hours': 0,
-            'total_fees_cents': 0,
-            'total_expenses_cents': 0,
-            'total_fee_payments_cents': 0,
-            'total_expense_payments_cents': 0,
-            'matter_count': len(data)
-        }
+        self.generate_btn.setEnabled(False)
+        self.generate_btn.setText("Generating...")
+        self.query_runner.run(
+            "reports.generate", load_report,
+            self.report_type_combo.currentData(),
+            self.year_combo.currentData(),
+            self.month_combo.currentData(),
+            self.include_closed_checkbox.isChecked(),
+            on_result=self.on_report_loaded,
+            on_error=self.on_report_failed
+        )
 
-        for row in data:
-            totals['total_hours'] += row.get('total_hours') or 0
-            totals['total_fees_cents'] += row.get('total_fees_cents') or 0
-            totals['total_expenses_cents'] += row.get('total_expenses_cents') or 0
-            totals['total_fee_payments_cents'] += row.get('total_fee_payments_cents') or 0
-            totals['total_expense_payments_cents'] += row.get('total_expense_payments_cents') or 0
+    def _reset_generate_button(self):
+        self.generate_btn.setEnabled(True)
+        self.generate_btn.setText("Generate Report")
 
-        totals['total_billed_cents'] = totals['total_fees_cents'] + totals['total_expenses_cents']
-        totals['total_payments_cents'] = totals['total_fee_payments_cents'] + totals['total_expense_payments_cents']
+    def on_report_failed(self, error: Exception):
+        self._reset_generate_button()
+        QMessageBox.critical(self, "Error", f"Failed to generate report:\n{str(error)}")
 
-        return totals
+    def on_report_loaded(self, result: tuple):
+        self._reset_generate_button()
+        self.current_data, totals = result
+        with tracer.span("reports.populate_table", "model", rows=len(self.current_data)):
+            self.populate_table(self.current_data)
+        self.update_totals(totals)
 
     def populate_table(self, data: list):
         self.table.setSortingEnabled(False)
         self.table.setRowCount(len(data))
 
         for row_idx, row in enumerate(data):
-            total_hours = row.get('total_hours') or 0
-            fees_cents = row.get('total_fees_cents') or 0
-            expenses_cents = row.get('total_expenses_cents') or 0
-            total_billed_cents = fees_cents + expenses_cents
-            fee_payments_cents = row.get('total_fee_payments_cents') or 0
-            expense_payments_cents = row.get('total_expense_payments_cents') or 0
-            total_payments_cents = fee_payments_cents + expense_payments_cents
-            balance_cents = total_payments_cents - total_billed_cents
-
-            values = [
-                row.get('case_name') or '',
-                row.get('client_name') or 'No Client',
-                row.get('status') or 'Open',
-                f"{total_hours:.1f}",
-                f"${fees_cents / 100:.2f}",
-                f"${expenses_cents / 100:.2f}",
-                f"${total_billed_cents / 100:.2f}",
-                f"${fee_payments_cents / 100:.2f}",
-                f"${expense_payments_cents / 100:.2f}",
-                f"${total_payments_cents / 100:.2f}",
-                f"${balance_cents / 100:.2f}"
-            ]
-
-            for col_idx, value in enumerate(values):
+            balance_cents = report_balance_cents(row)
+            for col_idx, value in enumerate(report_row_values(row)):
                 item = QTableWidgetItem(value)
-                if col_idx >= 3:
+                if col_idx >= NUMERIC_COLUMN_START:
                     item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
                 if col_idx == 10:
                     if balance_cents < 0:
@@ -249,43 +209,36 @@ class ReportsWidget(QWidget):
         self.balance_label.setText(balance_text)
 
     def get_report_title(self) -> str:
-        report_type = self.report_type_combo.currentData()
-        if report_type == "monthly":
-            year = self.year_combo.currentData()
-            month = self.month_combo.currentData()
-            month_name = date(year, month, 1).strftime("%B %Y")
-            return f"Monthly Billing Summary - {month_name}"
-        else:
-            return "All-Time Billing Summary"
+        return report_title(
+            self.report_type_combo.currentData(),
+            self.year_combo.currentData(),
+            self.month_combo.currentData()
+        )
+
+    def _table_rows(self) -> list:
+        rows = []
+        for row_idx in range(self.table.rowCount()):
+            row_data = []
+            for col_idx in range(self.table.columnCount()):
+                item = self.table.item(row_idx, col_idx)
+                row_data.append(item.text() if item else "")
+            rows.append(row_data)
+        return rows
 
     def export_to_csv(self):
         if not self.current_data:
             QMessageBox.warning(self, "Warning", "Please generate a report first.")
             return
 
-        report_title = self.get_report_title().replace(" ", "_").replace("-", "")
-        default_filename = f"{report_title}.csv"
-
         file_path, _ = QFileDialog.getSaveFileName(
-            self, "Save CSV", default_filename, "CSV Files (*.csv)"
+            self, "Save CSV", report_filename(self.get_report_title(), "csv"), "CSV Files (*.csv)"
         )
 
         if not file_path:
             return
 
         try:
-            import csv
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(self.HEADERS)
-
-                for row_idx in range(self.table.rowCount()):
-                    row_data = []
-                    for col_idx in range(self.table.columnCount()):
-                        item = self.table.item(row_idx, col_idx)
-                        row_data.append(item.text() if item else "")
-                    writer.writerow(row_data)
-
+            write_report_csv(file_path, self._table_rows())
             QMessageBox.information(self, "Success", f"Report exported to:\n{file_path}")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to export CSV:\n{str(e)}")
@@ -299,122 +252,25 @@ class ReportsWidget(QWidget):
             QMessageBox.warning(self, "Warning", "Please generate a report first.")
             return
 
-        report_title = self.get_report_title()
-        default_filename = f"{report_title.replace(' ', '_').replace('-', '')}.docx"
-
+        title = self.get_report_title()
         file_path, _ = QFileDialog.getSaveFileName(
-            self, "Save Word Document", default_filename, "Word Documents (*.docx)"
+            self, "Save Word Document", report_filename(title, "docx"), "Word Documents (*.docx)"
         )
 
         if not file_path:
             return
 
         try:
-            doc = Document()
-            self._setup_document_style(doc)
-            self._add_header(doc)
-
-            title_para = doc.add_paragraph()
-            title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            title_run = title_para.add_run(report_title)
-            title_run.bold = True
-            title_run.font.size = Pt(16)
-
-            date_para = doc.add_paragraph()
-            date_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            date_para.add_run(f"Generated: {date.today().strftime('%B %d, %Y')}")
-
-            doc.add_paragraph()
-
-            table = doc.add_table(rows=1, cols=len(self.HEADERS))
-            table.style = 'Table Grid'
-            table.alignment = WD_TABLE_ALIGNMENT.CENTER
-
-            header_row = table.rows[0]
-            for i, header in enumerate(self.HEADERS):
-                cell = header_row.cells[i]
-                cell.text = header
-                cell.paragraphs[0].runs[0].bold = True
-                cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-            for row_idx in range(self.table.rowCount()):
-                row_cells = table.add_row().cells
-                for col_idx in range(self.table.columnCount()):
-                    item = self.table.item(row_idx, col_idx)
-                    text = item.text() if item else ""
-                    row_cells[col_idx].text = text
-                    if col_idx >= 3:
-                        row_cells[col_idx].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.RIGHT
-
-            doc.add_paragraph()
-
-            totals = self._calculate_totals(self.current_data)
-            summary_para = doc.add_paragraph()
-            summary_para.add_run("Summary: ").bold = True
-            summary_para.add_run(
-                f"Matters: {totals['matter_count']} | "
-                f"Hours: {totals['total_hours']:.1f} | "
-                f"Total Billed: ${totals['total_billed_cents'] / 100:.2f} | "
-                f"Total Payments: ${totals['total_payments_cents'] / 100:.2f} | "
-                f"Net Balance: ${(totals['total_payments_cents'] - totals['total_billed_cents']) / 100:.2f}"
-            )
-
-            doc.save(file_path)
+            with tracer.span("docx.build_report", "docx", rows=len(self.current_data)):
+                doc = build_report_document(
+                    title, self._table_rows(), calculate_report_totals(self.current_data), self.image_path
+                )
+            with tracer.span("docx.save", "docx", path=file_path):
+                doc.save(file_path)
             QMessageBox.information(self, "Success", f"Report exported to:\n{file_path}")
 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to export Word document:\n{str(e)}")
 
-    def _setup_document_style(self, doc):
-        style = doc.styles['Normal']
-        style.font.name = 'Arial'
-        style.font.size = Pt(9)
-        style.paragraph_format.space_before = Pt(0)
-        style.paragraph_format.space_after = Pt(0)
-
-    def _set_cell_border(self, cell):
-        tc = cell._tc
-        tcPr = tc.get_or_add_tcPr()
-        tcBorders = OxmlElement('w:tcBorders')
-        for border_name in ['top', 'left', 'bottom', 'right']:
-            border = OxmlElement(f'w:{border_name}')
-            border.set(qn('w:val'), 'nil')
-            tcBorders.append(border)
-        tcPr.append(tcBorders)
-
-    def _add_header(self, doc):
-        section = doc.sections[0]
-        section.different_first_page_header_footer = True
-        header = section.first_page_header
-        header_table = header.add_table(rows=1, cols=2, width=Inches(6.5))
-        header_table.autofit = False
-        left_cell = header_table.rows[0].cells[0]
-        right_cell = header_table.rows[0].cells[1]
-        self._set_cell_border(left_cell)
-        self._set_cell_border(right_cell)
-        left_cell.width = Inches(3.25)
-        right_cell.width = Inches(3.25)
-
-        if os.path.exists(self.image_path):
-            left_para = left_cell.paragraphs[0]
-            left_para.paragraph_format.space_before = Pt(0)
-            left_para.paragraph_format.space_after = Pt(0)
-            left_run = left_para.add_run()
-            left_run.add_picture(self.image_path, width=Inches(2.5))
-
-        right_cell.vertical_alignment = WD_CELL_VERTICAL_ALIGNMENT.CENTER
-        right_para = right_cell.paragraphs[0]
-        right_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        right_para.paragraph_format.space_before = Pt(0)
-        right_para.paragraph_format.space_after = Pt(0)
-        phone_run = right_para.add_run("404-556-7057")
-        phone_run.font.size = Pt(10)
-        right_para.add_run("\n")
-        email_run = right_para.add_run("bbc@chintellalaw.com")
-        email_run.font.size = Pt(10)
-        right_para.add_run("\n")
-        web_run = right_para.add_run("www.chintellalaw.com")
-        web_run.font.size = Pt(10)
-
     def refresh(self):
-        pass
\ No newline at end of file
+        pass
@@ -0,0 +1,280 @@
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from typing import Any, Callable, Dict, List, Optional
+from core.queries import PAGE_SIZE
+from core.tracing import tracer
+
+# data() runs for every role of every cell, and comparing against PySide enum members costs far
+# more than comparing plain ints, so the roles it answers are resolved once here.
+DISPLAY_ROLE = int(Qt.DisplayRole)
+TOOLTIP_ROLE = int(Qt.ToolTipRole)
+ALIGNMENT_ROLE = int(Qt.TextAlignmentRole)
+FOREGROUND_ROLE = int(Qt.ForegroundRole)
+SORT_ROLE = int(Qt.UserRole)
+
+
+def sort_key(value):
+    if value is None:
+        return (0, 0)
+    if isinstance(value, str):
+        return (2, value.casefold())
+    return (1, value)
+
+
+def contiguous_ranges(rows: List[int]):
+    ranges = []
+    for row in sorted(rows):
+        if ranges and ranges[-1][1] == row - 1:
+            ranges[-1][1] = row
+        else:
+            ranges.append([row, row])
+    return ranges
+
+
+def fetch_pages(fetch_page: Callable[[Any, int], list], min_rows: int = 0, page_size: int = PAGE_SIZE,
+                first_page: Optional[list] = None) -> tuple:
+    # first_page lets a loader fetch page one together with its other queries in a single batch.
+    items = list(first_page or [])
+    has_more = first_page is None or len(first_page) == page_size
+    while has_more and (not items or len(items) < min_rows):
+        page = fetch_page(items[-1] if items else None, page_size)
+        items.extend(page)
+        has_more = len(page) == page_size
+    return items, has_more
+
+
+def fetch_remaining_pages(queries, fetch_page: Callable[[Any, int], list], last_item,
+                          page_size: int = PAGE_SIZE) -> list:
+    items, has_more = [], True
+    while has_more:
+        page = fetch_page(items[-1] if items else last_item, page_size)
+        items.extend(page)
+        has_more = len(page) == page_size
+    return items
+
+
+class ColumnarTableModel(QAbstractTableModel):
+    def __init__(self, headers: list, id_column: int = 0,
+                 display_formatters: Optional[Dict[int, Callable[[Any], str]]] = None,
+                 alignments: Optional[Dict[int, int]] = None,
+                 row_foreground: Optional[Callable[[list], Any]] = None,
+                 parent=None):
+        super().__init__(parent)
+        self.headers = list(headers)
+        self.id_column = id_column
+        self.display_formatters = display_formatters or {}
+        self.alignments = alignments or {}
+        self.row_foreground = row_foreground
+        self.sort_column = None
+        self.sort_order = Qt.AscendingOrder
+        self._columns = [[] for _ in self.headers]
+        self._row_by_id = {}
+        self._fetch_page = None
+        self._row_formatter = None
+        self._page_size = PAGE_SIZE
+        self._last_item = None
+        self._has_more = False
+        self._query_runner = None
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._columns[self.id_column])
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=DISPLAY_ROLE):
+        if role != DISPLAY_ROLE:
+            return None
+        if orientation == Qt.Vertical:
+            return section + 1
+        return self.headers[section] if 0 <= section < len(self.headers) else None
+
+    def display_text(self, row: int, column: int) -> str:
+        value = self._columns[column][row]
+        formatter = self.display_formatters.get(column)
+        if formatter:
+            return formatter(value)
+        return str(value) if value is not None else ""
+
+    def data(self, index, role=DISPLAY_ROLE):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == DISPLAY_ROLE:
+            return self.display_text(row, column)
+        if role == TOOLTIP_ROLE:
+            return self.display_text(row, column) or None
+        if role == SORT_ROLE:
+            return self._columns[column][row]
+        if role == ALIGNMENT_ROLE:
+            return self.alignments.get(column)
+        if role == FOREGROUND_ROLE and self.row_foreground:
+            return self.row_foreground(self.row_values(row))
+        return None
+
+    def row_values(self, row: int) -> list:
+        return [column[row] for column in self._columns]
+
+    def row_for_id(self, row_id) -> int:
+        return self._row_by_id.get(row_id, -1)
+
+    def id_at(self, row: int):
+        return self._columns[self.id_column][row]
+
+    def _rebuild_index(self):
+        self._row_by_id = {row_id: row for row, row_id in enumerate(self._columns[self.id_column])}
+
+    def insert_rows(self, rows: List[list]):
+        if not rows:
+            return
+        first = self.rowCount()
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for column_index, column in enumerate(self._columns):
+            column.extend(values[column_index] for values in rows)
+        for offset, values in enumerate(rows):
+            self._row_by_id[values[self.id_column]] = first + offset
+        self.endInsertRows()
+
+    def update_row(self, values: list) -> bool:
+        row = self.row_for_id(values[self.id_column])
+        if row < 0:
+            return False
+        changed = [c for c, column in enumerate(self._columns) if column[row] != values[c]]
+        if not changed:
+            return False
+        for c in changed:
+            self._columns[c][row] = values[c]
+        self.dataChanged.emit(self.index(row, min(changed)), self.index(row, max(changed)))
+        return True
+
+    def remove_ids(self, row_ids) -> int:
+        rows = [self._row_by_id[row_id] for row_id in row_ids if row_id in self._row_by_id]
+        for first, last in reversed(contiguous_ranges(rows)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for column in self._columns:
+                del column[first:last + 1]
+            self.endRemoveRows()
+        if rows:
+            self._rebuild_index()
+        return len(rows)
+
+    def sync(self, rows: List[list]):
+        incoming = {values[self.id_column]: values for values in rows}
+        self.remove_ids([row_id for row_id in self._row_by_id if row_id not in incoming])
+
+        updated = False
+        new_rows = []
+        for row_id, values in incoming.items():
+            if row_id in self._row_by_id:
+                updated = self.update_row(values) or updated
+            else:
+                new_rows.append(values)
+        self.insert_rows(new_rows)
+
+        if self.sort_column is not None:
+            if updated or new_rows:
+                self.sort(self.sort_column, self.sort_order)
+        elif list(self._row_by_id) != list(incoming):
+            self._permute([self._row_by_id[row_id] for row_id in incoming])
+
+    def load_pages(self, fetch_page: Callable[[Any, int], list], row_formatter: Callable[[Any], list],
+                   min_rows: int = 0, page_size: int = PAGE_SIZE):
+        items, has_more = fetch_pages(fetch_page, min_rows, page_size)
+        self.show_pages(items, has_more, fetch_page, row_formatter, page_size)
+
+    def show_pages(self, items: list, has_more: bool, fetch_page: Callable[[Any, int], list],
+                   row_formatter: Callable[[Any], list], page_size: int = PAGE_SIZE, query_runner=None):
+        # With a query runner, sorting loads the pages not fetched yet in the background.
+        self._fetch_page, self._row_formatter, self._page_size = fetch_page, row_formatter, page_size
+        self._query_runner = query_runner
+        self._last_item = items[-1] if items else None
+        self._has_more = has_more
+        with tracer.span("model.show_pages", "model", rows=len(items)):
+            self.sync([row_formatter(item) for item in items])
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._fetch_page is not None and self._has_more
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        with tracer.span("model.fetch_more", "model", page_size=self._page_size):
+            self._fetch_more()
+
+    def _fetch_more(self):
+        page = self._fetch_page(self._last_item, self._page_size)
+        self._has_more = len(page) == self._page_size
+        self._add_page(page)
+
+    def _add_page(self, page: list):
+        if page:
+            self._last_item = page[-1]
+        rows = {}
+        for item in page:
+            values = self._row_formatter(item)
+            if values[self.id_column] not in self._row_by_id:
+                rows[values[self.id_column]] = values
+        self.insert_rows(list(rows.values()))
+        if self.sort_column is not None:
+            self.sort(self.sort_column, self.sort_order)
+
+    def fetch_all(self):
+        while self.canFetchMore():
+            self.fetchMore()
+
+    def load_remaining(self, column: int, order):
+        fetch_page = self._fetch_page
+        self._query_runner.run(
+            f"model.remaining.{id(self)}", fetch_remaining_pages, fetch_page, self._last_item, self._page_size,
+            on_result=lambda page: self.on_remaining_loaded(fetch_page, page, column, order)
+        )
+
+    def on_remaining_loaded(self, fetch_page, page: list, column: int, order):
+        if fetch_page is not self._fetch_page or not self._has_more:
+            return
+        self._has_more = False
+        with tracer.span("model.fetch_remaining", "model", rows=len(page)):
+            self._add_page(page)
+        self.sort(column, order)
+
+    def clear(self):
+        self._fetch_page = None
+        self._has_more = False
+        if self.rowCount():
+            self.beginResetModel()
+            self._columns = [[] for _ in self.headers]
+            self._row_by_id = {}
+            self.endResetModel()
+
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        if not 0 <= column < len(self._columns):
+            self.sort_column = None
+            return
+        if self.canFetchMore():
+            self.sort_column = None
+            if self._query_runner is not None:
+                self.load_remaining(column, order)
+                return
+            self.fetch_all()
+        self.sort_column, self.sort_order = column, order
+        if self.rowCount() < 2:
+            return
+        keys = self._columns[column]
+        with tracer.span("model.sort", "model", rows=self.rowCount(), column=column):
+            self._permute(sorted(range(self.rowCount()), key=lambda r: sort_key(keys[r]),
+                                 reverse=order == Qt.DescendingOrder))
+
+    def _permute(self, permutation: List[int]):
+        self.layoutAboutToBeChanged.emit()
+        row_count = len(permutation)
+        new_positions = [0] * row_count
+        for new_row, old_row in enumerate(permutation):
+            new_positions[old_row] = new_row
+        self._columns = [[values[r] for r in permutation] for values in self._columns]
+        self._rebuild_index()
+
+        persistent = self.persistentIndexList()
+        self.changePersistentIndexList(
+            persistent,
+            [self.index(new_positions[index.row()], index.column()) for index in persistent]
+        )
+        self.layoutChanged.emit()
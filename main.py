@@ -1,42 +1,36 @@
+from core.startup import startup_timeline
 import sys
 import os
-import shutil
-from datetime import datetime
-from pathlib import Path
+import argparse
+import multiprocessing
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import QTimer
 import concurrent.futures
+from core.backup import auto_backup
+from core.utils import get_app_path, get_default_db_path
 from gui.main_window import MainWindow
 
-
-def get_app_path():
-    if getattr(sys, 'frozen', False):
-        return os.path.dirname(sys.executable)
-    else:
-        return os.path.dirname(os.path.abspath(__file__))
-
-
-def auto_backup(db_path, keep_count=5):
-    if not os.path.exists(db_path):
-        return
-    
-    backup_dir = Path(db_path).parent / "backups"
-    backup_dir.mkdir(exist_ok=True)
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_path = backup_dir / f"law_billing_backup_{timestamp}.db"
-    shutil.copy2(db_path, backup_path)
-    
-    backups = sorted(backup_dir.glob("law_billing_backup_*.db"), reverse=True)
-    for old_backup in backups[keep_count:]:
-        old_backup.unlink()
+startup_timeline.mark("modules imported")
 
 
 def main():
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="Law Firm Billing System")
+    parser.add_argument("--server", help="connect to a billing API server instead of the local database "
+                                                     "(sends $LAW_BILLING_API_TOKEN if set)")
+    parser.add_argument("--diagnostics", action="store_true", help="show the Diagnostics tab")
+    args, qt_args = parser.parse_known_args()
+
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setStyle("Fusion")
+    startup_timeline.mark("application created")
+
+    if args.server:
+        window = MainWindow(server_url=args.server)
+        window.show()
+        startup_timeline.mark("main window shown")
+        sys.exit(app.exec())
 
-    db_path = os.path.join(get_app_path(), "law_billing.db")
+    db_path = get_default_db_path()
 
     executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
     future = executor.submit(auto_backup, db_path)
@@ -47,15 +41,18 @@ def main():
             return
 
         executor.shutdown(wait=False)
+        startup_timeline.mark("backup finished")
 
-        window = MainWindow(db_path=db_path)
+        window = MainWindow(db_path=db_path, diagnostics=args.diagnostics)
         window.show()
+        startup_timeline.mark("main window shown")
 
     QTimer.singleShot(0, start_main_window_when_ready)
     sys.exit(app.exec())
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     try:
         main()
     except Exception as e: